@@ -1,6 +1,22 @@
 """Math engine package"""
 from .derivatives import DerivativeEngine, derive_polynomial
-from .parser import ExpressionParser
-from .evaluator import ExpressionEvaluator
+from .parser import ExpressionParser, parse_expression
+from .evaluator import ExpressionEvaluator, CompiledExpression
+from .sampling import AdaptiveSampler
+from .tiles import TileSampler
+from .polynomial import horner, Polynomial
+from .parallel import ParallelEvaluator
+from .autodiff import Dual, compile_dual
+from .dag import ExpressionDAG
+from .simplify import Simplifier
+from .series import PowerSeries, compile_series
+from .roots import RootFinder
+from .integration import Integrator, IntegrationResult
+from .numeric_diff import complex_step, central_difference
 
-__all__ = ['DerivativeEngine', 'derive_polynomial', 'ExpressionParser', 'ExpressionEvaluator']
+__all__ = ['DerivativeEngine', 'derive_polynomial', 'ExpressionParser', 'ExpressionEvaluator',
+           'CompiledExpression', 'parse_expression', 'AdaptiveSampler', 'TileSampler', 'horner',
+           'Polynomial', 'ParallelEvaluator', 'Dual', 'compile_dual',
+           'ExpressionDAG', 'Simplifier', 'PowerSeries', 'compile_series',
+           'RootFinder', 'Integrator', 'IntegrationResult',
+           'complex_step', 'central_difference']
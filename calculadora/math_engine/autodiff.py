@@ -0,0 +1,137 @@
+"""
+Diferenciación automática en modo directo (números duales)
+Calcula f(x) y f'(x) sobre arrays de NumPy en una sola pasada por el árbol
+"""
+
+import math
+import numpy as np
+from typing import Callable
+
+from .nodes import Node
+from .compiler import NUMPY_FUNCTIONS, build_function, degree_functions
+from .numeric_diff import central_difference
+
+
+class Dual:
+    """Número dual value + deriv·ε con ε² = 0 (value y deriv son arrays)"""
+    
+    __slots__ = ('value', 'deriv')
+    
+    # Hace que NumPy delegue en los métodos reflejados (np.float64 * Dual)
+    __array_ufunc__ = None
+    
+    def __init__(self, value, deriv):
+        self.value = value
+        self.deriv = deriv
+    
+    def __add__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value + other.value, self.deriv + other.deriv)
+        return Dual(self.value + other, self.deriv)
+    
+    __radd__ = __add__
+    
+    def __sub__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value - other.value, self.deriv - other.deriv)
+        return Dual(self.value - other, self.deriv)
+    
+    def __rsub__(self, other):
+        return Dual(other - self.value, -self.deriv)
+    
+    def __mul__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value * other.value,
+                        self.deriv * other.value + self.value * other.deriv)
+        return Dual(self.value * other, self.deriv * other)
+    
+    __rmul__ = __mul__
+    
+    def __truediv__(self, other):
+        if isinstance(other, Dual):
+            value = self.value / other.value
+            return Dual(value, (self.deriv - value * other.deriv) / other.value)
+        return Dual(self.value / other, self.deriv / other)
+    
+    def __rtruediv__(self, other):
+        value = other / self.value
+        return Dual(value, -value * self.deriv / self.value)
+    
+    def __pow__(self, other):
+        if isinstance(other, Dual):
+            # (f^g)' = f^g·(g'·ln f + g·f'/f)
+            value = self.value ** other.value
+            general = value * (other.deriv * np.log(self.value)
+                               + other.value * self.deriv / self.value)
+            # Si g no varía, n·f^(n-1)·f' también vale para f < 0
+            constant = other.value * self.value ** (other.value - 1) * self.deriv
+            return Dual(value, np.where(other.deriv == 0, constant, general))
+        
+        if other == 0:
+            return Dual(self.value ** 0, self.deriv * 0)
+        return Dual(self.value ** other, other * self.value ** (other - 1) * self.deriv)
+    
+    def __rpow__(self, other):
+        value = other ** self.value
+        return Dual(value, value * np.log(other) * self.deriv)
+    
+    def __mod__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value % other.value,
+                        self.deriv - other.deriv * np.floor(self.value / other.value))
+        return Dual(self.value % other, self.deriv)
+    
+    def __rmod__(self, other):
+        return Dual(other % self.value, -self.deriv * np.floor(other / self.value))
+    
+    def __neg__(self):
+        return Dual(-self.value, -self.deriv)
+    
+    def __pos__(self):
+        return self
+
+
+def _lift(func: Callable, derivative: Callable) -> Callable:
+    """Extiende una función de NumPy a duales por la regla de la cadena"""
+    def dual_func(u):
+        if isinstance(u, Dual):
+            return Dual(func(u.value), derivative(u.value) * u.deriv)
+        return func(u)
+    return dual_func
+
+
+def _factorial_derivative(v):
+    """Derivada numérica de Γ(v+1) (no hay digamma sin SciPy)"""
+    return central_difference(NUMPY_FUNCTIONS["factorial"], v)
+
+
+# Funciones sobre duales: (f, f')
+DUAL_FUNCTIONS = {
+    "sin": _lift(np.sin, np.cos),
+    "cos": _lift(np.cos, lambda v: -np.sin(v)),
+    "tan": _lift(np.tan, lambda v: 1 / np.cos(v) ** 2),
+    "asin": _lift(np.arcsin, lambda v: 1 / np.sqrt(1 - v ** 2)),
+    "acos": _lift(np.arccos, lambda v: -1 / np.sqrt(1 - v ** 2)),
+    "atan": _lift(np.arctan, lambda v: 1 / (1 + v ** 2)),
+    "sqrt": _lift(np.sqrt, lambda v: 0.5 / np.sqrt(v)),
+    "cbrt": _lift(np.cbrt, lambda v: 1 / (3 * np.cbrt(v) ** 2)),
+    "abs": _lift(np.abs, np.sign),
+    "exp": _lift(np.exp, np.exp),
+    "log": _lift(np.log10, lambda v: 1 / (v * math.log(10))),
+    "ln": _lift(np.log, lambda v: 1 / v),
+    "factorial": _lift(NUMPY_FUNCTIONS["factorial"], _factorial_derivative)
+}
+
+
+def compile_dual(node: Node, angle_mode: str = 'rad') -> Callable:
+    """
+    Compila un árbol a una función que opera sobre duales
+    
+    Returns:
+        Función f(Dual) -> Dual (o un número si la expresión es constante)
+    """
+    funcs = DUAL_FUNCTIONS
+    if angle_mode == 'deg':
+        funcs = degree_functions(funcs, lambda v: v * (math.pi / 180),
+                                 lambda v: v * (180 / math.pi))
+    return build_function(node, funcs)
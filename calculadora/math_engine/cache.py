@@ -0,0 +1,97 @@
+"""
+Caché LRU acotada para objetos compilados del motor matemático
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Caché LRU de tamaño fijo con contadores de aciertos, fallos y desalojos
+    
+    Es segura entre hilos: la interfaz calcula en hilos de trabajo y las
+    cachés del tokenizador y del parser son compartidas.
+    """
+    
+    def __init__(self, maxsize: int = 128):
+        if maxsize < 1:
+            raise ValueError("El tamaño de la caché debe ser al menos 1")
+        
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Obtiene un valor y lo marca como el más reciente"""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key: Hashable, value: Any):
+        """Guarda un valor, desalojando el menos usado si la caché está llena"""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+            self._data[key] = value
+            
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+    
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """
+        Elimina entradas de la caché
+        
+        Args:
+            predicate: Función que recibe la clave y decide si se elimina
+                       (si es None se vacía toda la caché)
+        
+        Returns:
+            Cantidad de entradas eliminadas
+        """
+        with self._lock:
+            if predicate is None:
+                removed = len(self._data)
+                self._data.clear()
+                return removed
+            
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+    
+    def clear(self):
+        """Vacía la caché y reinicia los contadores"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """Retorna las estadísticas de uso de la caché"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._data),
+            'maxsize': self.maxsize
+        }
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+    
+    def __len__(self) -> int:
+        return len(self._data)
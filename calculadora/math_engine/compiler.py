@@ -0,0 +1,228 @@
+"""
+Compilador de árboles de expresiones
+Traduce el árbol una sola vez a funciones de Python (escalar y NumPy)
+"""
+
+import math
+import operator
+import numpy as np
+from functools import reduce
+from typing import Callable, Dict
+
+from .nodes import (Node, Number, Variable, Constant, UnaryOp, BinaryOp, FunctionCall,
+                    PRECEDENCE, UNARY_PRECEDENCE, ATOM_PRECEDENCE, fold)
+
+
+def _cbrt(v):
+    return math.copysign(abs(v) ** (1 / 3), v)
+
+
+def _factorial(v):
+    if v == int(v) and v >= 0:
+        return math.factorial(int(v))
+    return math.gamma(v + 1)
+
+
+def _safe_gamma(v):
+    try:
+        return math.gamma(v + 1)
+    except (ValueError, OverflowError):
+        return math.nan
+
+
+def _sum(terms):
+    """Suma de izquierda a derecha, como a + b + c"""
+    return reduce(operator.add, terms)
+
+
+def _prod(factors):
+    """Producto de izquierda a derecha, como a*b*c"""
+    return reduce(operator.mul, factors)
+
+
+_factorial_array = np.vectorize(_safe_gamma, otypes=[float])
+
+
+# Funciones para la evaluación escalar
+MATH_FUNCTIONS = {
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "asin": math.asin,
+    "acos": math.acos,
+    "atan": math.atan,
+    "sqrt": math.sqrt,
+    "cbrt": _cbrt,
+    "abs": abs,
+    "exp": math.exp,
+    "log": math.log10,
+    "ln": math.log,
+    "factorial": _factorial
+}
+
+# Funciones para la evaluación vectorizada (NumPy)
+NUMPY_FUNCTIONS = {
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "asin": np.arcsin,
+    "acos": np.arccos,
+    "atan": np.arctan,
+    "sqrt": np.sqrt,
+    "cbrt": np.cbrt,
+    "abs": np.abs,
+    "exp": np.exp,
+    "log": np.log10,
+    "ln": np.log,
+    "factorial": _factorial_array
+}
+
+
+def degree_functions(funcs: Dict[str, Callable], radians, degrees) -> Dict[str, Callable]:
+    """Envuelve las funciones trigonométricas para trabajar en grados"""
+    sin, cos, tan = funcs["sin"], funcs["cos"], funcs["tan"]
+    asin, acos, atan = funcs["asin"], funcs["acos"], funcs["atan"]
+    funcs = dict(funcs)
+    funcs["sin"] = lambda v: sin(radians(v))
+    funcs["cos"] = lambda v: cos(radians(v))
+    funcs["tan"] = lambda v: tan(radians(v))
+    funcs["asin"] = lambda v: degrees(asin(v))
+    funcs["acos"] = lambda v: degrees(acos(v))
+    funcs["atan"] = lambda v: degrees(atan(v))
+    return funcs
+
+
+# Cadenas de sumas o productos más largas que esto se emiten como _sum((...)) y
+# _prod((...)): el compilador de Python anida una llamada por cada operador
+CHAIN_LIMIT = 64
+
+
+class _Source:
+    """
+    Código de un subárbol y su precedencia en Python
+    
+    Las cadenas de + - y de * guardan sus términos en una lista enlazada y el
+    texto se arma una sola vez, al usarlas como operando de otro operador.
+    """
+    
+    __slots__ = ('text', 'prec', 'chain', 'terms', 'count')
+    
+    def __init__(self, text: str = None, prec: int = ATOM_PRECEDENCE,
+                 chain: str = None, terms: tuple = None, count: int = 0):
+        self.text = text
+        self.prec = prec
+        self.chain = chain
+        self.terms = terms
+        self.count = count
+
+
+def _text(part: _Source) -> str:
+    if part.text is None:
+        part.text = _join(part)
+    return part.text
+
+
+def _wrap(part: _Source, min_prec: int) -> str:
+    """Texto del operando, entre paréntesis si su precedencia es menor a min_prec"""
+    text = _text(part)
+    return text if part.prec >= min_prec else f"({text})"
+
+
+def _join(part: _Source) -> str:
+    """Texto de una cadena: infija si es corta, como tupla si es larga"""
+    terms = []
+    link = part.terms
+    while link is not None:
+        link, op, term = link
+        terms.append((op, term))
+    terms.reverse()
+    
+    if part.count > CHAIN_LIMIT:
+        # a - b se emite como a + (-b), que da exactamente el mismo resultado
+        items = [_text(term) if op != '-' else f"-{_wrap(term, UNARY_PRECEDENCE)}"
+                 for op, term in terms]
+        name = '_sum' if part.chain == '+' else '_prod'
+        return f"{name}(({', '.join(items)},))"
+    
+    # El primer término admite la misma precedencia; los demás deben superarla
+    prec = PRECEDENCE[part.chain]
+    pieces = [_wrap(terms[0][1], prec)]
+    pieces += [f" {op} {_wrap(term, prec + 1)}" for op, term in terms[1:]]
+    return ''.join(pieces)
+
+
+def _source(node: Node, parts: list) -> _Source:
+    """Código de un nodo a partir del de sus hijos (ver fold)"""
+    if isinstance(node, Number):
+        text = repr(node.value)
+        # -0.0 también lleva signo: (-0.0)**x no es -(0.0**x)
+        return _Source(text, UNARY_PRECEDENCE if text.startswith('-') else ATOM_PRECEDENCE)
+    if isinstance(node, Variable):
+        return _Source('x')
+    if isinstance(node, Constant):
+        return _Source(repr(node.value))
+    if isinstance(node, UnaryOp):
+        if node.op == '-':
+            return _Source(f"-{_wrap(parts[0], UNARY_PRECEDENCE)}", UNARY_PRECEDENCE)
+        return _Source(f"_factorial({_text(parts[0])})")
+    if isinstance(node, BinaryOp):
+        left, right = parts
+        chain = '+' if node.op in ('+', '-') else node.op
+        if chain in ('+', '*'):
+            if left.chain == chain:
+                terms, count = left.terms, left.count
+            else:
+                terms, count = (None, None, left), 1
+            return _Source(prec=PRECEDENCE[chain], chain=chain,
+                           terms=(terms, node.op, right), count=count + 1)
+        if node.op == '^':
+            # ** es asociativo a derecha y liga más que el signo de su base
+            return _Source(f"{_wrap(left, ATOM_PRECEDENCE)} ** {_wrap(right, UNARY_PRECEDENCE)}",
+                           PRECEDENCE['^'])
+        return _Source(f"{_wrap(left, PRECEDENCE[node.op])} {node.op} "
+                       f"{_wrap(right, PRECEDENCE[node.op] + 1)}", PRECEDENCE[node.op])
+    if isinstance(node, FunctionCall):
+        return _Source(f"_{node.name}({_text(parts[0])})")
+    raise TypeError(f"Nodo no soportado: {type(node).__name__}")
+
+
+def to_python_source(node: Node) -> str:
+    """Genera el código Python equivalente a un árbol (nombres con prefijo '_')"""
+    return _text(fold(node, _source))
+
+
+def compile_tree(node: Node, angle_mode: str = 'rad', vectorized: bool = False) -> Callable:
+    """
+    Compila un árbol a una función f(x)
+    
+    Args:
+        node: Raíz del árbol
+        angle_mode: 'deg' o 'rad' para las funciones trigonométricas
+        vectorized: Si es True usa NumPy (f acepta arrays)
+    
+    Returns:
+        Función de Python compilada una sola vez
+    """
+    funcs = NUMPY_FUNCTIONS if vectorized else MATH_FUNCTIONS
+    if angle_mode == 'deg':
+        if vectorized:
+            funcs = degree_functions(funcs, np.radians, np.degrees)
+        else:
+            funcs = degree_functions(funcs, math.radians, math.degrees)
+    
+    return build_function(node, funcs)
+
+
+def build_function(node: Node, funcs: Dict[str, Callable]) -> Callable:
+    """Genera la función f(x) de un árbol usando la tabla de funciones dada"""
+    namespace = {f"_{name}": func for name, func in funcs.items()}
+    namespace["_sum"] = _sum
+    namespace["_prod"] = _prod
+    namespace["__builtins__"] = {}
+    
+    source = f"lambda x: {to_python_source(node)}"
+    try:
+        return eval(compile(source, '<expresión>', 'eval'), namespace)
+    except (SyntaxError, RecursionError, MemoryError):
+        raise ValueError("Error al evaluar la expresión: "
+                         "la expresión es demasiado larga o anidada para compilarla")
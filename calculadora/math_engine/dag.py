@@ -0,0 +1,76 @@
+"""
+DAG de expresiones con nodos compartidos (hash-consing)
+Cada subexpresión distinta existe una sola vez; dos nodos iguales son el mismo objeto
+"""
+
+from typing import Dict
+
+from .nodes import Node, Number, Variable, Constant, UnaryOp, BinaryOp, FunctionCall, fold
+
+
+class ExpressionDAG:
+    """Tabla de nodos únicos: construye e interna nodos inmutables"""
+    
+    def __init__(self):
+        # Clave: tipo, operador e identidad de los hijos (ya internados)
+        self._table: Dict[tuple, Node] = {}
+    
+    def number(self, value: float) -> Node:
+        value = float(value)
+        if value == 0:
+            value = 0.0  # -0.0 y 0.0 son el mismo nodo
+        return self._get(('num', value), lambda: Number(value))
+    
+    def variable(self, name: str = 'x') -> Node:
+        return self._get(('var', name), lambda: Variable(name))
+    
+    def constant(self, name: str) -> Node:
+        return self._get(('const', name), lambda: Constant(name))
+    
+    def unary(self, op: str, operand: Node) -> Node:
+        return self._get(('unary', op, id(operand)), lambda: UnaryOp(op, operand))
+    
+    def binary(self, op: str, left: Node, right: Node) -> Node:
+        return self._get(('binary', op, id(left), id(right)),
+                         lambda: BinaryOp(op, left, right))
+    
+    def call(self, name: str, arg: Node) -> Node:
+        return self._get(('call', name, id(arg)), lambda: FunctionCall(name, arg))
+    
+    def intern(self, node: Node) -> Node:
+        """
+        Retorna el nodo canónico equivalente a un árbol cualquiera
+        
+        Recorre cada objeto una sola vez, así que también es lineal sobre
+        árboles que ya comparten subexpresiones.
+        """
+        return fold(node, self._rebuild)
+    
+    def clear(self):
+        """Vacía la tabla (los nodos ya entregados siguen siendo válidos)"""
+        self._table.clear()
+    
+    def __len__(self) -> int:
+        return len(self._table)
+    
+    def _rebuild(self, node: Node, children: list) -> Node:
+        if isinstance(node, Number):
+            return self.number(node.value)
+        if isinstance(node, Variable):
+            return self.variable(node.name)
+        if isinstance(node, Constant):
+            return self.constant(node.name)
+        if isinstance(node, UnaryOp):
+            return self.unary(node.op, children[0])
+        if isinstance(node, BinaryOp):
+            return self.binary(node.op, children[0], children[1])
+        if isinstance(node, FunctionCall):
+            return self.call(node.name, children[0])
+        raise TypeError(f"Nodo no soportado: {type(node).__name__}")
+    
+    def _get(self, key: tuple, build) -> Node:
+        node = self._table.get(key)
+        if node is None:
+            node = build()
+            self._table[key] = node
+        return node
@@ -3,16 +3,39 @@ Motor de derivadas simbólicas
 Implementa reglas de derivación para diferentes tipos de funciones
 """
 
-import re
-import math
-from typing import Dict, Tuple, Optional
+from typing import Callable, Dict, List
+
+from .nodes import Node, Number, Variable, Constant, UnaryOp, BinaryOp, FunctionCall
+from .dag import ExpressionDAG
+from .simplify import Simplifier
+from .cache import LRUCache
+from .polynomial import Polynomial
+from .parser import parse_expression
+from .evaluator import normalize_expression
 
 
 class DerivativeEngine:
     """Motor de derivadas que implementa reglas de derivación"""
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 128, max_nodes: int = 100_000):
+        """
+        Args:
+            cache_size: Derivadas completas que se recuerdan por expresión
+            max_nodes: Tamaño del DAG a partir del cual se vacían el DAG y la
+                       memoria de subexpresiones antes de la siguiente derivada
+        """
         self.variable = 'x'
+        self.dag = ExpressionDAG()
+        self.simplifier = Simplifier(self.dag)
+        # Las derivadas sucesivas van sobre un denominador común: sin eso cada
+        # orden anida las fracciones del anterior y el tamaño crece exponencialmente
+        self.tower_simplifier = Simplifier(self.dag, together=True)
+        self.cache = LRUCache(cache_size)
+        # Torres de derivadas [f, f', f'', ...] ya simplificadas, por expresión
+        self.towers = LRUCache(cache_size)
+        self.max_nodes = max_nodes
+        # Derivada de cada nodo del DAG ya derivado (se comparte entre llamadas)
+        self._derivatives: Dict[Node, Node] = {}
     
     def derive(self, expression: str) -> str:
         """
@@ -20,235 +43,326 @@ class DerivativeEngine:
         
         Args:
             expression: Expresión a derivar (ej: "x^2 + sin(x)")
-            
+        
         Returns:
             Derivada de la expresión
         """
-        expression = expression.strip().replace(' ', '')
-        
         try:
-            result = self._derive_expression(expression)
-            return self._simplify(result)
+            key = normalize_expression(expression)
+            result = self.cache.get(key)
+            if result is None:
+                derivative = self.derive_tree(parse_expression(expression))
+                result = str(self.simplifier.simplify(derivative))
+                self.cache.put(key, result)
         except Exception as e:
             raise ValueError(f"No se pudo derivar la expresión: {str(e)}")
-    
-    def _derive_expression(self, expr: str) -> str:
-        """Deriva una expresión completa"""
-        # Manejar suma y resta
-        if '+' in expr or '-' in expr:
-            return self._derive_sum(expr)
         
-        # Manejar producto
-        if '*' in expr and not self._is_inside_function(expr, '*'):
-            return self._derive_product(expr)
+        return result
+    
+    def derive_n(self, expression: str, n: int) -> List[str]:
+        """
+        Calcula las derivadas de una expresión hasta el orden n
         
-        # Manejar cociente
-        if '/' in expr and not self._is_inside_function(expr, '/'):
-            return self._derive_quotient(expr)
+        Args:
+            expression: Expresión a derivar
+            n: Orden máximo
         
-        # Manejar término simple
-        return self._derive_term(expr)
-    
-    def _derive_sum(self, expr: str) -> str:
-        """Deriva una suma/resta (regla de la suma)"""
-        terms = self._split_terms(expr)
-        derived_terms = [self._derive_expression(term) for term in terms]
-        return ' + '.join(derived_terms)
+        Returns:
+            Lista [f, f', f'', ..., f^(n)] (n + 1 expresiones)
+        """
+        return [str(node) for node in self.derivative_tower(expression, n)]
     
-    def _derive_product(self, expr: str) -> str:
-        """Deriva un producto (regla del producto): (f*g)' = f'*g + f*g'"""
-        parts = expr.split('*', 1)
-        if len(parts) != 2:
-            return self._derive_term(expr)
+    def derivative_tower(self, expression: str, n: int) -> List[Node]:
+        """
+        Árboles simplificados [f, f', ..., f^(n)]
         
-        f, g = parts
-        f_prime = self._derive_expression(f)
-        g_prime = self._derive_expression(g)
+        Cada orden se deriva del árbol simplificado del anterior y la torre
+        queda en caché: pedir un orden mayor solo calcula los que faltan.
+        """
+        if n < 0:
+            raise ValueError("El orden de la derivada no puede ser negativo")
         
-        return f"({f_prime})*({g}) + ({f})*({g_prime})"
+        try:
+            key = normalize_expression(expression)
+            tower = self.towers.get(key)
+            if tower is None:
+                tower = [self.simplifier.simplify(parse_expression(expression))]
+            while len(tower) <= n:
+                # f' queda igual que en derive(); desde f'' se usa el denominador común
+                simplifier = self.simplifier if len(tower) == 1 else self.tower_simplifier
+                tower.append(simplifier.simplify(self.derive_tree(tower[-1])))
+        except Exception as e:
+            raise ValueError(f"No se pudo derivar la expresión: {str(e)}")
+        
+        self.towers.put(key, tower)
+        return tower[:n + 1]
     
-    def _derive_quotient(self, expr: str) -> str:
-        """Deriva un cociente (regla del cociente): (f/g)' = (f'*g - f*g')/g^2"""
-        parts = expr.split('/', 1)
-        if len(parts) != 2:
-            return self._derive_term(expr)
+    def derive_tree(self, node: Node) -> Node:
+        """
+        Deriva un árbol de expresión
+        
+        El árbol se interna en el DAG y cada subexpresión distinta se deriva
+        una sola vez, así que el costo es lineal en el tamaño del DAG. Las
+        derivadas de subexpresiones se recuerdan para las llamadas siguientes.
         
-        f, g = parts
-        f_prime = self._derive_expression(f)
-        g_prime = self._derive_expression(g)
+        Returns:
+            Nodo (interno al DAG) de la derivada
+        """
+        if len(self.dag) > self.max_nodes:
+            self.clear()
+        
+        root = self.dag.intern(node)
+        derivatives = self._derivatives
+        stack = [root]
+        
+        # Recorrido en postorden sin recursión (las sumas largas son muy profundas)
+        while stack:
+            current = stack[-1]
+            if current in derivatives:
+                stack.pop()
+                continue
+            pending = [c for c in current.children if c not in derivatives]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            derivatives[current] = self._derive_node(current, derivatives.__getitem__)
         
-        return f"(({f_prime})*({g}) - ({f})*({g_prime}))/(({g})^2)"
+        return derivatives[root]
     
-    def _derive_term(self, term: str) -> str:
-        """Deriva un término individual"""
-        # Constante
-        if self.variable not in term:
-            return "0"
+    def clear(self):
+        """Vacía el DAG y la memoria de subexpresiones (la caché de resultados se conserva)"""
+        self.dag.clear()
+        self._derivatives.clear()
+    
+    def stats(self) -> dict:
+        """Estadísticas de la caché de resultados y tamaño de la memoria interna"""
+        stats = self.cache.stats()
+        stats['nodes'] = len(self.dag)
+        stats['memoized'] = len(self._derivatives)
+        stats['towers'] = len(self.towers)
+        return stats
+    
+    def _derive_node(self, node: Node, d: Callable[[Node], Node]) -> Node:
+        """
+        Aplica la regla de derivación de un nodo; d(hijo) da la derivada del hijo
         
-        # Funciones trigonométricas
-        if term.startswith('sin('):
-            inner = self._extract_function_arg(term, 'sin')
-            inner_prime = self._derive_expression(inner)
-            return f"cos({inner})*({inner_prime})"
+        Un hijo es constante si su derivada es 0 (has_variable() recorrería
+        el subárbol entero, y en un DAG eso es exponencial)
+        """
+        if isinstance(node, (Number, Constant)):
+            return self._num(0)
         
-        if term.startswith('cos('):
-            inner = self._extract_function_arg(term, 'cos')
-            inner_prime = self._derive_expression(inner)
-            return f"-sin({inner})*({inner_prime})"
+        if isinstance(node, Variable):
+            return self._num(1)
         
-        if term.startswith('tan('):
-            inner = self._extract_function_arg(term, 'tan')
-            inner_prime = self._derive_expression(inner)
-            return f"(1/(cos({inner})^2))*({inner_prime})"
+        if isinstance(node, UnaryOp):
+            if node.op == '-':
+                return self._neg(d(node.operand))
+            if _is_number(d(node.operand), 0):
+                return self._num(0)
+            raise ValueError("El factorial de una expresión con x no tiene derivada simbólica")
         
-        # Funciones exponenciales
-        if term.startswith('exp(') or term.startswith('e^'):
-            if term.startswith('exp('):
-                inner = self._extract_function_arg(term, 'exp')
-            else:
-                inner = term[2:].strip('()')
-            inner_prime = self._derive_expression(inner)
-            return f"exp({inner})*({inner_prime})"
+        if isinstance(node, FunctionCall):
+            return self._mul(self._function_derivative(node), d(node.arg))
         
-        # Logaritmo natural
-        if term.startswith('ln('):
-            inner = self._extract_function_arg(term, 'ln')
-            inner_prime = self._derive_expression(inner)
-            return f"(1/({inner}))*({inner_prime})"
+        f, g = node.left, node.right
+        if node.op == '+':
+            return self._add(d(f), d(g))
         
-        if term.startswith('log('):
-            inner = self._extract_function_arg(term, 'log')
-            inner_prime = self._derive_expression(inner)
-            return f"(1/(({inner})*ln(10)))*({inner_prime})"
+        if node.op == '-':
+            return self._sub(d(f), d(g))
         
-        # Raíz cuadrada
-        if term.startswith('sqrt('):
-            inner = self._extract_function_arg(term, 'sqrt')
-            inner_prime = self._derive_expression(inner)
-            return f"(1/(2*sqrt({inner})))*({inner_prime})"
+        if node.op == '*':
+            # (f*g)' = f'*g + f*g'
+            return self._add(self._mul(d(f), g), self._mul(f, d(g)))
         
-        # Potencia
-        if '^' in term:
-            base, exponent = term.split('^', 1)
-            
-            # x^n (potencia simple)
-            if base == self.variable and self.variable not in exponent:
-                try:
-                    n = float(exponent)
-                    if n == 0:
-                        return "0"
-                    elif n == 1:
-                        return "1"
-                    else:
-                        return f"{n}*{self.variable}^{n-1}"
-                except:
-                    # Exponente simbólico
-                    return f"({exponent})*{self.variable}^({exponent}-1)"
-            
-            # f(x)^n
-            elif self.variable in base and self.variable not in exponent:
-                base_prime = self._derive_expression(base)
-                return f"{exponent}*({base})^({exponent}-1)*({base_prime})"
-            
-            # a^f(x)
-            elif self.variable not in base and self.variable in exponent:
-                exp_prime = self._derive_expression(exponent)
-                return f"({base})^({exponent})*ln({base})*({exp_prime})"
-            
-            # f(x)^g(x)
-            else:
-                # Usar logaritmos: (f^g)' = f^g * (g'*ln(f) + g*f'/f)
-                f_prime = self._derive_expression(base)
-                g_prime = self._derive_expression(exponent)
-                return f"({base})^({exponent})*(({g_prime})*ln({base})+({exponent})*({f_prime})/({base}))"
+        if node.op == '/':
+            if _is_number(d(g), 0):
+                return self._div(d(f), g)
+            return self._quotient(d(f), f, g, d)
         
-        # Variable simple
-        if term == self.variable:
-            return "1"
+        if node.op == '%':
+            if not _is_number(d(g), 0):
+                raise ValueError("El resto con divisor variable no tiene derivada simbólica")
+            return d(f)
         
-        # Coeficiente * variable
-        match = re.match(r'([+-]?\d*\.?\d*)' + self.variable, term)
-        if match:
-            coef = match.group(1)
-            if coef in ['', '+']:
-                return "1"
-            elif coef == '-':
-                return "-1"
-            else:
-                return coef
+        # Potencias
+        if _is_number(d(g), 0):
+            # (f^n)' = n*f^(n-1)*f'
+            exponent = self._sub(g, self._num(1))
+            return self._mul(self._mul(g, self._pow(f, exponent)), d(f))
         
-        return "0"
+        if _is_number(d(f), 0):
+            # (a^g)' = a^g*ln(a)*g'
+            return self._mul(self._mul(node, self._call('ln', f)), d(g))
+        
+        # (f^g)' = f^g * (g'*ln(f) + g*f'/f)
+        inner = self._add(self._mul(d(g), self._call('ln', f)),
+                          self._div(self._mul(g, d(f)), f))
+        return self._mul(node, inner)
     
-    def _split_terms(self, expr: str) -> list:
-        """Divide una expresión en términos (respetando paréntesis)"""
-        terms = []
-        current_term = ""
-        paren_depth = 0
+    def _quotient(self, df: Node, f: Node, g: Node, d: Callable[[Node], Node]) -> Node:
+        """
+        (f/g)' sobre el denominador que ya había
         
-        for i, char in enumerate(expr):
-            if char == '(':
-                paren_depth += 1
-                current_term += char
-            elif char == ')':
-                paren_depth -= 1
-                current_term += char
-            elif char in ['+', '-'] and paren_depth == 0 and i > 0:
-                terms.append(current_term)
-                current_term = char if char == '-' else ""
+        Con g = c*b1^k1*b2^k2*... la derivada es
+        (f'*b1*b2*... - f*(k1*b1'*b2*... + k2*b1*b2'*... + ...))/(c*b1^(k1+1)*b2^(k2+1)*...):
+        cada orden sube en uno los exponentes en lugar de elevar g al cuadrado.
+        """
+        constant = []
+        powers = []
+        for factor in _factors(g):
+            if isinstance(factor, BinaryOp) and factor.op == '^' and isinstance(factor.right, Number):
+                base, exponent = factor.left, factor.right.value
             else:
-                current_term += char
+                base, exponent = factor, 1.0
+            if _is_number(d(base), 0):
+                constant.append(factor)
+            else:
+                powers.append((base, exponent))
         
-        if current_term:
-            terms.append(current_term)
+        bases = [base for base, _ in powers]
+        terms = self._num(0)
+        for i, (base, exponent) in enumerate(powers):
+            term = self._mul(self._num(exponent), d(base))
+            for other in bases[:i] + bases[i + 1:]:
+                term = self._mul(term, other)
+            terms = self._add(terms, term)
         
-        return [t for t in terms if t and t not in ['+', '-']]
-    
-    def _extract_function_arg(self, expr: str, func_name: str) -> str:
-        """Extrae el argumento de una función"""
-        start = expr.index('(') + 1
-        paren_count = 1
-        end = start
+        numerator = df
+        for base in bases:
+            numerator = self._mul(numerator, base)
+        numerator = self._sub(numerator, self._mul(f, terms))
         
-        for i in range(start, len(expr)):
-            if expr[i] == '(':
-                paren_count += 1
-            elif expr[i] == ')':
-                paren_count -= 1
-                if paren_count == 0:
-                    end = i
-                    break
+        denominator = self._num(1)
+        for factor in constant:
+            denominator = self._mul(denominator, factor)
+        for base, exponent in powers:
+            denominator = self._mul(denominator, self._pow(base, self._num(exponent + 1)))
+        return self._div(numerator, denominator)
+    
+    def _function_derivative(self, node: FunctionCall) -> Node:
+        """Derivada exterior f'(u) de una función aplicada a u"""
+        u = node.arg
+        name = node.name
+        one = self._num(1)
         
-        return expr[start:end]
+        if name == 'sin':
+            return self._call('cos', u)
+        if name == 'cos':
+            return self._neg(self._call('sin', u))
+        if name == 'tan':
+            return self._div(one, self._pow(self._call('cos', u), self._num(2)))
+        if name == 'asin':
+            return self._div(one, self._call('sqrt', self._sub(one, self._pow(u, self._num(2)))))
+        if name == 'acos':
+            return self._neg(self._div(one, self._call('sqrt',
+                                                      self._sub(one, self._pow(u, self._num(2))))))
+        if name == 'atan':
+            return self._div(one, self._add(one, self._pow(u, self._num(2))))
+        if name == 'sqrt':
+            # Se reutiliza el propio nodo sqrt(u)
+            return self._div(one, self._mul(self._num(2), node))
+        if name == 'cbrt':
+            return self._div(one, self._mul(self._num(3), self._pow(node, self._num(2))))
+        if name == 'abs':
+            return self._div(u, node)
+        if name == 'exp':
+            return node
+        if name == 'ln':
+            return self._div(one, u)
+        if name == 'log':
+            return self._div(one, self._mul(u, self._call('ln', self._num(10))))
+        raise ValueError(f"No hay regla de derivación para {name}")
     
-    def _is_inside_function(self, expr: str, char: str) -> bool:
-        """Verifica si un carácter está dentro de una función"""
-        paren_depth = 0
-        for c in expr:
-            if c == '(':
-                paren_depth += 1
-            elif c == ')':
-                paren_depth -= 1
-            elif c == char and paren_depth > 0:
-                return True
-        return False
+    # Constructores con las simplificaciones triviales (0 y 1, números)
     
-    def _simplify(self, expr: str) -> str:
-        """Simplifica una expresión derivada"""
-        # Simplificaciones básicas
-        expr = expr.replace('+ -', '- ')
-        expr = expr.replace('- -', '+ ')
-        expr = expr.replace('*1 ', '')
-        expr = expr.replace(' *1', '')
-        expr = expr.replace('(1)*', '')
-        expr = expr.replace('*(1)', '')
-        expr = expr.replace(' + 0', '')
-        expr = expr.replace('0 + ', '')
-        expr = expr.replace(' - 0', '')
-        
-        # Limpiar paréntesis innecesarios en algunos casos
-        expr = re.sub(r'\(([^()]+)\)\*\(([^()]+)\)', r'\1*\2', expr)
-        
-        return expr
+    def _num(self, value: float) -> Node:
+        return self.dag.number(value)
+    
+    def _call(self, name: str, arg: Node) -> Node:
+        return self.dag.call(name, arg)
+    
+    def _neg(self, a: Node) -> Node:
+        if isinstance(a, Number):
+            return self._num(-a.value)
+        if isinstance(a, UnaryOp) and a.op == '-':
+            return a.operand
+        return self.dag.unary('-', a)
+    
+    def _add(self, a: Node, b: Node) -> Node:
+        if _is_number(a, 0):
+            return b
+        if _is_number(b, 0):
+            return a
+        if isinstance(a, Number) and isinstance(b, Number):
+            return self._num(a.value + b.value)
+        if isinstance(b, UnaryOp) and b.op == '-':
+            return self.dag.binary('-', a, b.operand)
+        return self.dag.binary('+', a, b)
+    
+    def _sub(self, a: Node, b: Node) -> Node:
+        if _is_number(b, 0):
+            return a
+        if _is_number(a, 0):
+            return self._neg(b)
+        if isinstance(a, Number) and isinstance(b, Number):
+            return self._num(a.value - b.value)
+        if isinstance(b, UnaryOp) and b.op == '-':
+            return self.dag.binary('+', a, b.operand)
+        return self.dag.binary('-', a, b)
+    
+    def _mul(self, a: Node, b: Node) -> Node:
+        if _is_number(a, 0) or _is_number(b, 0):
+            return self._num(0)
+        if _is_number(a, 1):
+            return b
+        if _is_number(b, 1):
+            return a
+        if isinstance(a, Number) and isinstance(b, Number):
+            return self._num(a.value * b.value)
+        # Los factores numéricos van adelante: 2*x en lugar de x*2
+        if isinstance(b, Number):
+            a, b = b, a
+        if (isinstance(a, Number) and isinstance(b, BinaryOp) and b.op == '*'
+                and isinstance(b.left, Number)):
+            return self._mul(self._num(a.value * b.left.value), b.right)
+        return self.dag.binary('*', a, b)
+    
+    def _div(self, a: Node, b: Node) -> Node:
+        if _is_number(a, 0):
+            return self._num(0)
+        if _is_number(b, 1):
+            return a
+        return self.dag.binary('/', a, b)
+    
+    def _pow(self, a: Node, b: Node) -> Node:
+        if _is_number(b, 0):
+            return self._num(1)
+        if _is_number(b, 1):
+            return a
+        if isinstance(a, Number) and isinstance(b, Number) and a.value > 0:
+            return self._num(a.value ** b.value)
+        return self.dag.binary('^', a, b)
+
+
+def _is_number(node: Node, value: float) -> bool:
+    return isinstance(node, Number) and node.value == value
+
+
+def _factors(node: Node) -> List[Node]:
+    """Factores de una cadena de productos a*b*c"""
+    factors = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, BinaryOp) and current.op == '*':
+            stack.append(current.right)
+            stack.append(current.left)
+        else:
+            factors.append(current)
+    return factors
 
 
 def derive_polynomial(coefficients: list) -> list:
@@ -257,15 +371,8 @@ def derive_polynomial(coefficients: list) -> list:
     
     Args:
         coefficients: Lista de coeficientes [c0, c1, c2, ...] donde ci es el coef de x^i
-        
+    
     Returns:
         Lista de coeficientes de la derivada
     """
-    if len(coefficients) <= 1:
-        return [0]
-    
-    derivative = []
-    for i in range(1, len(coefficients)):
-        derivative.append(coefficients[i] * i)
-    
-    return derivative
+    return Polynomial(coefficients).derivative().coefficients()
@@ -2,16 +2,240 @@
 Evaluador de expresiones matemáticas
 """
 
-import math
 import numpy as np
-from typing import Union, List
+from typing import List, Callable, Iterator, Tuple
+
+from .cache import LRUCache
+from .compiler import compile_tree
+from .parser import parse_expression
+from .tokenizer import canonical_text
+from .polynomial import horner, polynomial_coefficients, derivative_matrix, shift_polynomial
+from .autodiff import Dual, compile_dual
+from .series import PowerSeries, compile_series
+from .numeric_diff import is_analytic, complex_step, central_difference
+
+
+def normalize_expression(expression: str) -> str:
+    """Normaliza el texto de una expresión (clave de la caché)"""
+    return canonical_text(expression)
+
+
+def _real_array(values, shape) -> np.ndarray:
+    """
+    Copia real de values con la forma dada
+    
+    Las potencias de base negativa dan complejos (p. ej. (-8)^(1/3)): las
+    entradas con parte imaginaria quedan fuera del dominio real y valen NaN.
+    """
+    values = np.broadcast_to(values, shape)
+    if not np.iscomplexobj(values):
+        return np.array(values, dtype=float)
+    result = np.array(values.real, dtype=float)
+    result[values.imag != 0] = np.nan
+    return result
+
+
+class CompiledExpression:
+    """Expresión compilada una sola vez, evaluable en escalares o en arrays"""
+    
+    def __init__(self, expression: str, angle_mode: str = 'deg'):
+        self.expression = expression
+        self.angle_mode = angle_mode
+        
+        try:
+            self.tree = parse_expression(expression)
+        except ValueError as e:
+            raise ValueError(f"Error al evaluar la expresión: {str(e)}")
+        
+        self.has_variable = self.tree.has_variable()
+        # Camino rápido: los polinomios expandidos se evalúan con Horner
+        self.coefficients = polynomial_coefficients(self.tree)
+        # Se compila cada forma la primera vez que se usa
+        self._scalar = None
+        self._vector = None
+        self._dual = None
+        self._series = None
+        self._numeric = None
+    
+    def __call__(self, x_value: float = None) -> float:
+        """Evalúa la expresión en un punto"""
+        if x_value is None and self.has_variable:
+            raise ValueError("Error al evaluar la expresión: falta el valor de x")
+        if self._scalar is None:
+            self._scalar = compile_tree(self.tree, self.angle_mode)
+        try:
+            result = self._scalar(x_value)
+        except Exception as e:
+            raise ValueError(f"Error al evaluar la expresión: {str(e)}")
+        
+        # Un resultado complejo está fuera del dominio real, como en el camino vectorial
+        if np.iscomplexobj(result):
+            if result.imag != 0:
+                raise ValueError("Error al evaluar la expresión: math domain error")
+            result = result.real
+        return result
+    
+    def evaluate_array(self, x_values: np.ndarray) -> np.ndarray:
+        """
+        Evalúa la expresión sobre todo un array en una pasada
+        
+        Los errores de dominio (log(-1), 1/0, ...) producen NaN
+        """
+        x_values = np.asarray(x_values, dtype=float)
+        if self.coefficients is None and self._vector is None:
+            self._vector = compile_tree(self.tree, self.angle_mode, vectorized=True)
+        try:
+            with np.errstate(all='ignore'):
+                if self.coefficients is not None:
+                    y_values = horner(self.coefficients, x_values)
+                else:
+                    y_values = self._vector(x_values)
+            y_values = _real_array(y_values, x_values.shape)
+        except (TypeError, ValueError, ArithmeticError):
+            return np.full(x_values.shape, np.nan)
+        
+        y_values[~np.isfinite(y_values)] = np.nan
+        return y_values
+    
+    def evaluate_with_derivative(self, x_values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evalúa f y f' en una sola pasada (diferenciación automática)
+        
+        Returns:
+            (y_values, dy_values), con NaN donde f o f' no están definidas
+        """
+        x_values = np.asarray(x_values, dtype=float)
+        try:
+            with np.errstate(all='ignore'):
+                if self.coefficients is not None:
+                    y_values, dy_values = horner(derivative_matrix(self.coefficients, 1), x_values)
+                else:
+                    if self._dual is None:
+                        self._dual = compile_dual(self.tree, self.angle_mode)
+                    result = self._dual(Dual(x_values, np.ones_like(x_values)))
+                    if isinstance(result, Dual):
+                        y_values, dy_values = result.value, result.deriv
+                    else:
+                        y_values, dy_values = result, 0.0
+            y_values = _real_array(y_values, x_values.shape)
+            dy_values = _real_array(dy_values, x_values.shape)
+        except (TypeError, ValueError, ArithmeticError):
+            # Sin regla dual para algún nodo: derivada numérica
+            return self.evaluate_array(x_values), self.numeric_derivative(x_values)
+        
+        y_values[~np.isfinite(y_values)] = np.nan
+        dy_values[~np.isfinite(dy_values) | np.isnan(y_values)] = np.nan
+        return y_values, dy_values
+    
+    def numeric_derivative(self, x_values: np.ndarray) -> np.ndarray:
+        """
+        f'(x) numérica, sin pasar por la derivada simbólica
+        
+        Usa el paso complejo si la expresión es analítica (una evaluación) y
+        diferencias centrales con Richardson si no (abs, factorial, resto).
+        
+        Returns:
+            Array de f'(x), con NaN donde f no está definida
+        """
+        x_values = np.asarray(x_values, dtype=float)
+        if not self.has_variable:
+            return np.zeros(x_values.shape)
+        
+        if self._numeric is None:
+            if is_analytic(self.tree):
+                self._numeric = complex_step(self.tree, self.angle_mode)
+            else:
+                self._numeric = lambda x: central_difference(self.evaluate_array, x)
+        try:
+            with np.errstate(all='ignore'):
+                dy_values = np.array(np.broadcast_to(self._numeric(x_values), x_values.shape),
+                                     dtype=float)
+        except (TypeError, ValueError, ArithmeticError):
+            return np.full(x_values.shape, np.nan)
+        
+        # La extensión compleja existe fuera del dominio real (sqrt(-1)): se descarta
+        dy_values[~np.isfinite(dy_values) | np.isnan(self.evaluate_array(x_values))] = np.nan
+        return dy_values
+    
+    def taylor_coefficients(self, order: int, center: float = 0.0) -> List[float]:
+        """
+        Polinomio de Taylor de orden order alrededor de center
+        
+        Returns:
+            Coeficientes [c0, c1, ...] de las potencias de x (formato de derive_polynomial);
+            NaN si la función no es desarrollable en center
+        """
+        if order < 0:
+            raise ValueError("El orden de la serie no puede ser negativo")
+        
+        if self._series is None:
+            self._series = compile_series(self.tree, self.angle_mode)
+        try:
+            with np.errstate(all='ignore'):
+                result = self._series(PowerSeries.variable(center, order))
+        except (TypeError, ValueError, ArithmeticError) as e:
+            raise ValueError(f"No se pudo desarrollar la serie: {str(e)}")
+        
+        if isinstance(result, PowerSeries):
+            centered = result.coefs
+        else:
+            centered = np.zeros(order + 1)
+            centered[0] = result
+        return shift_polynomial(centered, center).tolist()
 
 
 class ExpressionEvaluator:
     """Evaluador de expresiones matemáticas"""
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 128):
         self.angle_mode = 'deg'  # 'deg' o 'rad'
+        self.cache = LRUCache(cache_size)
+    
+    def compile(self, expression: str) -> CompiledExpression:
+        """
+        Compila una expresión, reutilizando la caché si ya fue compilada
+        
+        Args:
+            expression: Expresión a compilar
+        
+        Returns:
+            Expresión compilada para el modo angular actual
+        """
+        # Una sola lectura: set_angle_mode puede correr en otro hilo
+        mode = self.angle_mode
+        try:
+            key = (normalize_expression(expression), mode)
+        except ValueError as e:
+            raise ValueError(f"Error al evaluar la expresión: {str(e)}")
+        
+        compiled = self.cache.get(key)
+        if compiled is None:
+            # Se parsea el texto original para que los errores den su posición
+            compiled = CompiledExpression(expression, mode)
+            self.cache.put(key, compiled)
+        return compiled
+    
+    def set_angle_mode(self, angle_mode: str):
+        """Cambia el modo angular e invalida lo compilado para el modo anterior"""
+        if angle_mode == self.angle_mode:
+            return
+        previous = self.angle_mode
+        self.angle_mode = angle_mode
+        self.invalidate(previous)
+    
+    def invalidate(self, angle_mode: str = None) -> int:
+        """
+        Invalida expresiones compiladas
+        
+        Args:
+            angle_mode: Solo invalida las compiladas en ese modo (None = todas)
+        
+        Returns:
+            Cantidad de entradas eliminadas
+        """
+        if angle_mode is None:
+            return self.cache.invalidate()
+        return self.cache.invalidate(lambda key: key[1] == angle_mode)
     
     def evaluate(self, expression: str, x_value: float = None) -> float:
         """
@@ -20,43 +244,11 @@ class ExpressionEvaluator:
         Args:
             expression: Expresión a evaluar
             x_value: Valor de x (si la expresión contiene x)
-            
+        
         Returns:
             Resultado de la evaluación
         """
-        try:
-            # Preparar expresión
-            expr = expression.replace('^', '**')
-            expr = expr.replace('×', '*')
-            
-            # Reemplazar funciones
-            expr = self._replace_functions(expr)
-            
-            # Reemplazar x si se proporciona
-            if x_value is not None:
-                expr = expr.replace('x', str(x_value))
-            
-            # Evaluar
-            result = eval(expr, {"__builtins__": {}}, {
-                "math": math,
-                "sin": math.sin,
-                "cos": math.cos,
-                "tan": math.tan,
-                "asin": math.asin,
-                "acos": math.acos,
-                "atan": math.atan,
-                "sqrt": math.sqrt,
-                "exp": math.exp,
-                "log": math.log10,
-                "ln": math.log,
-                "pi": math.pi,
-                "e": math.e
-            })
-            
-            return result
-            
-        except Exception as e:
-            raise ValueError(f"Error al evaluar la expresión: {str(e)}")
+        return self.compile(expression)(x_value)
     
     def evaluate_polynomial(self, coefficients: List[float], x_value: float) -> float:
         """
@@ -65,14 +257,38 @@ class ExpressionEvaluator:
         Args:
             coefficients: Coeficientes del polinomio [c0, c1, c2, ...]
             x_value: Valor de x
-            
+        
         Returns:
             Valor del polinomio en x
         """
-        result = 0
-        for i, coef in enumerate(coefficients):
-            result += coef * (x_value ** i)
-        return result
+        return float(horner(coefficients, x_value))
+    
+    def taylor(self, expression: str, order: int, center: float = 0.0) -> List[float]:
+        """
+        Coeficientes del polinomio de Taylor de una expresión
+        
+        Args:
+            expression: Expresión a desarrollar
+            order: Orden del polinomio
+            center: Punto de desarrollo
+        
+        Returns:
+            Coeficientes [c0, c1, ...] de las potencias de x
+        """
+        return self.compile(expression).taylor_coefficients(order, center)
+    
+    def evaluate_polynomials(self, coefficients, x_values: np.ndarray) -> np.ndarray:
+        """
+        Evalúa varios polinomios sobre la misma grilla en una sola llamada
+        
+        Args:
+            coefficients: Matriz con un polinomio por fila [[c0, c1, ...], ...]
+            x_values: Array de valores de x
+        
+        Returns:
+            Matriz con una fila de valores por polinomio
+        """
+        return horner(coefficients, x_values)
     
     def evaluate_range(self, expression: str, x_min: float, x_max: float, 
                       num_points: int = 500) -> tuple:
@@ -83,25 +299,51 @@ class ExpressionEvaluator:
             (x_values, y_values)
         """
         x_values = np.linspace(x_min, x_max, num_points)
-        y_values = []
-        
-        for x in x_values:
-            try:
-                y = self.evaluate(expression, x)
-                y_values.append(y)
-            except:
-                y_values.append(np.nan)
-        
-        return x_values, np.array(y_values)
-    
-    def _replace_functions(self, expr: str) -> str:
-        """Reemplaza nombres de funciones para evaluación"""
-        # Funciones trigonométricas con conversión de ángulos
-        if self.angle_mode == 'deg':
-            expr = expr.replace('sin(', 'math.sin(math.radians(')
-            expr = expr.replace('cos(', 'math.cos(math.radians(')
-            expr = expr.replace('tan(', 'math.tan(math.radians(')
-            # Añadir paréntesis de cierre
-            expr = expr.replace('radians(', 'radians(') + ')' * expr.count('radians(')
-        
-        return expr
+        return x_values, self.compile(expression).evaluate_array(x_values)
+    
+    def iter_range(self, expression: str, x_min: float, x_max: float,
+                   num_points: int = 500, chunk_size: int = 65536,
+                   dtype=np.float64) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Evalúa una expresión en un rango por bloques de tamaño fijo
+        
+        Los puntos son los mismos que np.linspace(x_min, x_max, num_points),
+        pero nunca se materializa el array completo: la memoria usada depende
+        solo de chunk_size.
+        
+        Args:
+            expression: Expresión a evaluar
+            x_min, x_max: Extremos del rango
+            num_points: Cantidad total de puntos
+            chunk_size: Puntos por bloque
+            dtype: Tipo de los arrays entregados (ej: np.float32)
+        
+        Returns:
+            Iterador de bloques (x_chunk, y_chunk)
+        """
+        if chunk_size < 1:
+            raise ValueError("El tamaño de bloque debe ser al menos 1")
+        
+        # Compilar ahora para que los errores aparezcan antes de iterar
+        compiled = self.compile(expression)
+        step = (x_max - x_min) / (num_points - 1) if num_points > 1 else 0.0
+        
+        def chunks():
+            for start in range(0, num_points, chunk_size):
+                stop = min(start + chunk_size, num_points)
+                x_chunk = x_min + step * np.arange(start, stop, dtype=np.float64)
+                if stop == num_points and num_points > 1:
+                    x_chunk[-1] = x_max
+                y_chunk = compiled.evaluate_array(x_chunk)
+                yield x_chunk.astype(dtype, copy=False), y_chunk.astype(dtype, copy=False)
+        
+        return chunks()
+    
+    def compile_vectorized(self, expression: str) -> Callable[[np.ndarray], np.ndarray]:
+        """
+        Compila una expresión una sola vez en una función vectorizada
+        
+        Returns:
+            Función f(x_values) que evalúa todo el array en una pasada
+        """
+        return self.compile(expression).evaluate_array
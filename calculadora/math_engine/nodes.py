@@ -0,0 +1,291 @@
+"""
+Árbol de expresiones matemáticas
+Nodos tipados producidos por el parser y consumidos por el compilador
+"""
+
+import math
+from typing import Any, Callable, Tuple
+
+
+# Funciones de una variable reconocidas por el parser
+FUNCTIONS = ('sin', 'cos', 'tan', 'asin', 'acos', 'atan',
+             'sqrt', 'cbrt', 'abs', 'exp', 'log', 'ln')
+
+# Constantes con nombre
+CONSTANTS = {
+    'pi': math.pi,
+    'e': math.e
+}
+
+# Precedencias (de menor a mayor) usadas por el parser y al imprimir
+PRECEDENCE = {
+    '+': 1,
+    '-': 1,
+    '*': 2,
+    '/': 2,
+    '%': 2,
+    '^': 4
+}
+UNARY_PRECEDENCE = 3
+ATOM_PRECEDENCE = 6
+
+
+def format_number(value: float) -> str:
+    """Formatea un número sin decimales innecesarios (2.0 -> 2)"""
+    if math.isfinite(value) and value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class Node:
+    """Nodo base del árbol de expresiones"""
+    
+    # El hash se calcula al construir el nodo, con los hijos ya hasheados: los
+    # nodos son inmutables y así nunca se recorre el subárbol (ni en un DAG con
+    # subárboles compartidos, ni en una suma de miles de términos)
+    __slots__ = ('_hash',)
+    precedence = ATOM_PRECEDENCE
+    
+    @property
+    def children(self) -> Tuple['Node', ...]:
+        return ()
+    
+    def _key(self) -> tuple:
+        raise NotImplementedError
+    
+    def has_variable(self) -> bool:
+        """Indica si la variable x aparece en el subárbol"""
+        seen = set()
+        stack = [self]
+        while stack:
+            current = stack.pop()
+            if isinstance(current, Variable):
+                return True
+            if id(current) not in seen:
+                seen.add(id(current))
+                stack.extend(current.children)
+        return False
+    
+    def _set_hash(self):
+        self._hash = hash((type(self).__name__, self._key()))
+    
+    def __eq__(self, other) -> bool:
+        """Igualdad estructural, comparando los subárboles sin recursión"""
+        if not isinstance(other, Node):
+            return NotImplemented
+        stack = [(self, other)]
+        while stack:
+            a, b = stack.pop()
+            if a is b:
+                continue
+            if type(a) is not type(b) or a._hash != b._hash:
+                return False
+            for x, y in zip(a._key(), b._key()):
+                if isinstance(x, Node):
+                    stack.append((x, y))
+                elif x != y:
+                    return False
+        return True
+    
+    def __hash__(self) -> int:
+        return self._hash
+    
+    def __str__(self) -> str:
+        return fold(self, lambda node, parts: node._format(*parts))
+    
+    def _format(self, *parts: str) -> str:
+        """Texto del nodo a partir del texto de sus hijos"""
+        raise NotImplementedError
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({str(self)!r})"
+
+
+def fold(node: Node, visit: Callable[[Node, list], Any]) -> Any:
+    """
+    Combina un árbol de abajo hacia arriba sin recursión
+    
+    Args:
+        node: Raíz del árbol
+        visit: Recibe cada nodo y la lista de resultados de sus hijos
+    
+    Returns:
+        Resultado de visit sobre la raíz. Cada objeto se visita una sola vez,
+        así que es lineal también sobre DAGs con subárboles compartidos
+    """
+    done = {}
+    stack = [node]
+    
+    while stack:
+        current = stack[-1]
+        if id(current) in done:
+            stack.pop()
+            continue
+        pending = [c for c in current.children if id(c) not in done]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        done[id(current)] = visit(current, [done[id(c)] for c in current.children])
+    
+    return done[id(node)]
+
+
+class Number(Node):
+    """Literal numérico"""
+    
+    __slots__ = ('value',)
+    
+    def __init__(self, value: float):
+        self.value = float(value)
+        self._set_hash()
+    
+    @property
+    def precedence(self) -> int:
+        return UNARY_PRECEDENCE if self.value < 0 else ATOM_PRECEDENCE
+    
+    def _key(self) -> tuple:
+        return (self.value,)
+    
+    def _format(self) -> str:
+        return format_number(self.value)
+
+
+class Variable(Node):
+    """La variable independiente x"""
+    
+    __slots__ = ('name',)
+    
+    def __init__(self, name: str = 'x'):
+        self.name = name
+        self._set_hash()
+    
+    def has_variable(self) -> bool:
+        return True
+    
+    def _key(self) -> tuple:
+        return (self.name,)
+    
+    def _format(self) -> str:
+        return self.name
+
+
+class Constant(Node):
+    """Constante con nombre (pi, e)"""
+    
+    __slots__ = ('name',)
+    
+    def __init__(self, name: str):
+        if name not in CONSTANTS:
+            raise ValueError(f"Constante desconocida: {name}")
+        self.name = name
+        self._set_hash()
+    
+    @property
+    def value(self) -> float:
+        return CONSTANTS[self.name]
+    
+    def _key(self) -> tuple:
+        return (self.name,)
+    
+    def _format(self) -> str:
+        return self.name
+
+
+class UnaryOp(Node):
+    """Operador unario: negación ('-') o factorial ('!')"""
+    
+    __slots__ = ('op', 'operand')
+    
+    def __init__(self, op: str, operand: Node):
+        if op not in ('-', '!'):
+            raise ValueError(f"Operador unario desconocido: {op}")
+        self.op = op
+        self.operand = operand
+        self._set_hash()
+    
+    @property
+    def precedence(self) -> int:
+        return UNARY_PRECEDENCE if self.op == '-' else ATOM_PRECEDENCE
+    
+    @property
+    def children(self) -> Tuple[Node, ...]:
+        return (self.operand,)
+    
+    def _key(self) -> tuple:
+        return (self.op, self.operand)
+    
+    def _format(self, inner: str) -> str:
+        if self.op == '-':
+            if self.operand.precedence <= UNARY_PRECEDENCE:
+                inner = f"({inner})"
+            return f"-{inner}"
+        
+        if self.operand.precedence < ATOM_PRECEDENCE:
+            inner = f"({inner})"
+        return f"{inner}!"
+
+
+class BinaryOp(Node):
+    """Operador binario: + - * / % ^"""
+    
+    __slots__ = ('op', 'left', 'right')
+    
+    def __init__(self, op: str, left: Node, right: Node):
+        if op not in PRECEDENCE:
+            raise ValueError(f"Operador desconocido: {op}")
+        self.op = op
+        self.left = left
+        self.right = right
+        self._set_hash()
+    
+    @property
+    def precedence(self) -> int:
+        return PRECEDENCE[self.op]
+    
+    @property
+    def children(self) -> Tuple[Node, ...]:
+        return (self.left, self.right)
+    
+    def _key(self) -> tuple:
+        return (self.op, self.left, self.right)
+    
+    def _format(self, left: str, right: str) -> str:
+        prec = self.precedence
+        
+        # '^' es asociativo a derecha; el resto a izquierda
+        if self.left.precedence < prec or (self.op == '^' and self.left.precedence == prec):
+            left = f"({left})"
+        
+        right_prec = self.right.precedence
+        same_assoc = (isinstance(self.right, BinaryOp) and self.right.op == self.op
+                      and self.op in ('+', '*', '^'))
+        if right_prec < prec or (right_prec == prec and not same_assoc):
+            right = f"({right})"
+        
+        if self.op in ('+', '-'):
+            return f"{left} {self.op} {right}"
+        return f"{left}{self.op}{right}"
+
+
+class FunctionCall(Node):
+    """Llamada a una función de una variable (sin, ln, sqrt, ...)"""
+    
+    __slots__ = ('name', 'arg')
+    
+    def __init__(self, name: str, arg: Node):
+        if name not in FUNCTIONS:
+            raise ValueError(f"Función desconocida: {name}")
+        self.name = name
+        self.arg = arg
+        self._set_hash()
+    
+    @property
+    def children(self) -> Tuple[Node, ...]:
+        return (self.arg,)
+    
+    def _key(self) -> tuple:
+        return (self.name, self.arg)
+    
+    def _format(self, arg: str) -> str:
+        return f"{self.name}({arg})"
@@ -0,0 +1,142 @@
+"""
+Evaluación en paralelo con un pool de procesos
+Los resultados viajan por memoria compartida en lugar de serializarse
+"""
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Sequence, Tuple
+
+from .evaluator import ExpressionEvaluator
+
+
+# Evaluador propio de cada proceso (conserva su caché entre tareas)
+_worker_evaluator = None
+
+
+def _get_worker_evaluator(angle_mode: str) -> ExpressionEvaluator:
+    global _worker_evaluator
+    if _worker_evaluator is None:
+        _worker_evaluator = ExpressionEvaluator()
+    _worker_evaluator.set_angle_mode(angle_mode)
+    return _worker_evaluator
+
+
+def _evaluate_shard(expression: str, angle_mode: str, x_name: str, y_name: str,
+                    rows: int, num_points: int, row: int, start: int, stop: int):
+    """Tarea del worker: evalúa x[start:stop] y escribe en la fila row de y"""
+    x_shm = shared_memory.SharedMemory(name=x_name)
+    y_shm = shared_memory.SharedMemory(name=y_name)
+    x_values = y_values = None
+    try:
+        x_values = np.ndarray((num_points,), dtype=np.float64, buffer=x_shm.buf)
+        y_values = np.ndarray((rows, num_points), dtype=np.float64, buffer=y_shm.buf)
+        compiled = _get_worker_evaluator(angle_mode).compile(expression)
+        y_values[row, start:stop] = compiled.evaluate_array(x_values[start:stop])
+    finally:
+        # Soltar las vistas antes de cerrar los buffers
+        del x_values, y_values
+        x_shm.close()
+        y_shm.close()
+
+
+class ParallelEvaluator:
+    """Reparte evaluaciones grandes entre todos los núcleos"""
+    
+    def __init__(self, evaluator: ExpressionEvaluator = None, max_workers: int = None,
+                 min_shard_size: int = 100_000):
+        """
+        Args:
+            evaluator: Evaluador del que se toma el modo angular (y el camino serie)
+            max_workers: Procesos del pool (por defecto, todos los núcleos)
+            min_shard_size: Puntos mínimos por tarea; por debajo no conviene paralelizar
+        """
+        self.evaluator = evaluator or ExpressionEvaluator()
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_shard_size = min_shard_size
+        self._executor = None
+    
+    def evaluate_range(self, expression: str, x_min: float, x_max: float,
+                       num_points: int = 500) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Igual que ExpressionEvaluator.evaluate_range, repartiendo el rango
+        
+        Returns:
+            (x_values, y_values), idénticos a los del camino serie
+        """
+        shards = min(self.max_workers, num_points // self.min_shard_size)
+        if shards < 2:
+            return self.evaluator.evaluate_range(expression, x_min, x_max, num_points)
+        
+        # Validar en este proceso para reportar errores de sintaxis enseguida
+        expression = self.evaluator.compile(expression).expression
+        
+        bounds = np.linspace(0, num_points, shards + 1).astype(int)
+        tasks = [(expression, 0, bounds[i], bounds[i + 1]) for i in range(shards)]
+        x_values, y_values = self._run(np.linspace(x_min, x_max, num_points), 1, tasks)
+        return x_values, y_values[0]
+    
+    def evaluate_many(self, expressions: Sequence[str], x_values: np.ndarray) -> np.ndarray:
+        """
+        Evalúa una lista de expresiones sobre la misma grilla
+        
+        Returns:
+            Matriz con una fila por expresión
+        """
+        x_values = np.asarray(x_values, dtype=np.float64)
+        compiled = [self.evaluator.compile(expr) for expr in expressions]
+        
+        if len(expressions) < 2 or self.max_workers < 2:
+            return np.array([c.evaluate_array(x_values) for c in compiled]).reshape(
+                len(expressions), len(x_values))
+        
+        tasks = [(c.expression, row, 0, len(x_values)) for row, c in enumerate(compiled)]
+        return self._run(x_values, len(expressions), tasks)[1]
+    
+    def _run(self, x_values: np.ndarray, rows: int, tasks: List[tuple]):
+        """Ejecuta las tareas sobre buffers compartidos y copia el resultado"""
+        num_points = len(x_values)
+        x_shm = shared_memory.SharedMemory(create=True, size=max(x_values.nbytes, 1))
+        y_shm = shared_memory.SharedMemory(create=True, size=max(rows * num_points * 8, 1))
+        x_shared = y_shared = None
+        try:
+            x_shared = np.ndarray(x_values.shape, dtype=np.float64, buffer=x_shm.buf)
+            x_shared[:] = x_values
+            y_shared = np.ndarray((rows, num_points), dtype=np.float64, buffer=y_shm.buf)
+            
+            executor = self._get_executor()
+            futures = [
+                executor.submit(_evaluate_shard, expression, self.evaluator.angle_mode,
+                                x_shm.name, y_shm.name, rows, num_points, row, start, stop)
+                for expression, row, start, stop in tasks
+            ]
+            for future in futures:
+                future.result()
+            
+            return np.array(x_shared), np.array(y_shared)
+        finally:
+            # Soltar las vistas antes de cerrar los buffers
+            del x_shared, y_shared
+            x_shm.close()
+            x_shm.unlink()
+            y_shm.close()
+            y_shm.unlink()
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+    
+    def close(self):
+        """Cierra el pool de procesos"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -3,7 +3,154 @@ Parser de expresiones matemáticas
 """
 
 import re
-from typing import List, Tuple
+from typing import List, Sequence, TextIO, Tuple, Union
+
+from .nodes import (Node, Number, Variable, Constant, UnaryOp, BinaryOp,
+                    FunctionCall, FUNCTIONS, CONSTANTS, PRECEDENCE, UNARY_PRECEDENCE)
+from .tokenizer import (Token, tokenize, canonical_text,
+                        NUMBER, NAME, OP, LPAREN, RPAREN, END)
+from .cache import LRUCache
+from .polynomial import Polynomial
+
+
+# Árboles ya parseados por texto (los nodos son inmutables y se comparten)
+_TREES = LRUCache(256)
+
+# Un término de polinomio: signo, coeficiente y x^n opcionales (3x^2, -x, 2.5, 1e-3x)
+_POLY_TERM = re.compile(r"""
+    \s*(?P<sign>[+-])?\s*
+    (?P<coef>(?:\d+\.?\d*|\.\d+)(?:e[+-]?\d+)?)?\s*\*?\s*
+    (?P<x>x(?:\s*(?:\^|\*\*)\s*(?P<degree>\d+))?)?\s*
+""", re.VERBOSE)
+
+# Tamaño de los bloques leídos al parsear un polinomio desde un archivo
+_POLY_CHUNK = 1 << 16
+
+
+def parse_expression(text: str) -> Node:
+    """
+    Parsea una expresión y retorna su árbol tipado
+    
+    Args:
+        text: Expresión (ej: "3x^2 + sin(2x)")
+        
+    Returns:
+        Raíz del árbol de la expresión
+    """
+    tree = _TREES.get(text)
+    if tree is None:
+        if not text.strip():
+            raise ValueError("La expresión está vacía")
+        try:
+            tree = _PrecedenceParser(tokenize(text)).parse()
+        except RecursionError:
+            raise ValueError("La expresión tiene demasiados niveles de anidamiento")
+        _TREES.put(text, tree)
+    return tree
+
+
+class _PrecedenceParser:
+    """Parser por precedencia de operadores (precedence climbing)"""
+    
+    def __init__(self, tokens: Sequence[Token]):
+        self.tokens = tokens
+        self.pos = 0
+    
+    def parse(self) -> Node:
+        node = self._binary(1)
+        token = self._peek()
+        if token.kind != END:
+            raise self._error(token, f"Símbolo inesperado '{token.value}'")
+        return node
+    
+    def _peek(self) -> Token:
+        return self.tokens[self.pos]
+    
+    def _advance(self) -> Token:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+    
+    def _error(self, token: Token, message: str) -> ValueError:
+        if token.kind == END:
+            return ValueError(f"{message}: fin inesperado de la expresión")
+        return ValueError(f"{message} en la posición {token.position + 1}")
+    
+    def _binary(self, min_prec: int) -> Node:
+        """Parsea operadores binarios con precedencia >= min_prec"""
+        left = self._unary()
+        
+        while True:
+            token = self._peek()
+            if token.kind == OP and token.value in PRECEDENCE:
+                op = token.value
+            elif token.kind in (NUMBER, NAME, LPAREN):
+                # Multiplicación implícita: 2x, 3(x+1), x sin(x)
+                op = '*'
+            else:
+                break
+            
+            prec = PRECEDENCE[op]
+            if prec < min_prec:
+                break
+            if token.kind == OP:
+                self._advance()
+            
+            # '^' es asociativo a derecha
+            next_min = prec if op == '^' else prec + 1
+            right = self._binary(next_min)
+            left = BinaryOp(op, left, right)
+        
+        return left
+    
+    def _unary(self) -> Node:
+        """Parsea signos unarios (-x^2 es -(x^2))"""
+        token = self._peek()
+        if token.kind == OP and token.value in ('+', '-'):
+            self._advance()
+            operand = self._binary(UNARY_PRECEDENCE + 1)
+            return UnaryOp('-', operand) if token.value == '-' else operand
+        return self._postfix()
+    
+    def _postfix(self) -> Node:
+        """Parsea un primario seguido de factoriales"""
+        node = self._primary()
+        while self._peek().kind == OP and self._peek().value == '!':
+            self._advance()
+            node = UnaryOp('!', node)
+        return node
+    
+    def _primary(self) -> Node:
+        token = self._advance()
+        
+        if token.kind == NUMBER:
+            return Number(float(token.value))
+        
+        if token.kind == NAME:
+            if token.value in FUNCTIONS:
+                if self._peek().kind != LPAREN:
+                    raise self._error(self._peek(), f"Se esperaba '(' después de {token.value}")
+                self._advance()
+                arg = self._binary(1)
+                self._expect_rparen(token)
+                return FunctionCall(token.value, arg)
+            if token.value in CONSTANTS:
+                return Constant(token.value)
+            return Variable(token.value)
+        
+        if token.kind == LPAREN:
+            node = self._binary(1)
+            self._expect_rparen(token)
+            return node
+        
+        raise self._error(token, "Expresión incompleta" if token.kind == END
+                          else f"Símbolo inesperado '{token.value}'")
+    
+    def _expect_rparen(self, opening: Token):
+        token = self._peek()
+        if token.kind != RPAREN:
+            raise self._error(token, f"Falta ')' para '(' de la posición {opening.position + 1}")
+        self._advance()
 
 
 class ExpressionParser:
@@ -12,74 +159,36 @@ class ExpressionParser:
     def __init__(self):
         self.variable = 'x'
     
-    def parse_polynomial(self, poly_str: str) -> List[float]:
+    def parse(self, expr: str) -> Node:
+        """Parsea una expresión general y retorna su árbol"""
+        return parse_expression(expr)
+    
+    def parse_polynomial(self, source: Union[str, TextIO]) -> Polynomial:
         """
-        Parsea un string de polinomio y retorna coeficientes
+        Parsea un polinomio en una sola pasada
         
         Args:
-            poly_str: String del polinomio (ej: "3x^2 + 2x - 5")
+            source: Texto del polinomio (ej: "3x^2 + 2x - 5") o un archivo de
+                    texto, que se lee por bloques
             
         Returns:
-            Lista de coeficientes [c0, c1, c2, ...] donde ci es el coef de x^i
+            Polynomial con los términos (disperso si el grado es alto y hay pocos términos);
+            los grados repetidos se suman
         """
+        degrees, values = [], []
+        scanner = _PolynomialScanner(degrees, values)
         try:
-            poly_str = poly_str.replace(' ', '').lower()
-            
-            # Encontrar el grado máximo
-            max_degree = 0
-            matches = re.findall(r'x\^(\d+)', poly_str)
-            if matches:
-                max_degree = max(int(m) for m in matches)
-            if 'x' in poly_str and max_degree == 0:
-                max_degree = 1
-            
-            # Inicializar coeficientes
-            coefficients = [0.0] * (max_degree + 1)
-            
-            # Añadir + al inicio si no hay signo
-            if poly_str[0] not in ['+', '-']:
-                poly_str = '+' + poly_str
-            
-            # Encontrar todos los términos
-            terms = re.findall(r'[+-][^+-]+', poly_str)
-            
-            for term in terms:
-                term = term.strip()
-                
-                # Término con x^n
-                match = re.match(r'([+-]?\d*\.?\d*)x\^(\d+)', term)
-                if match:
-                    coef = match.group(1)
-                    if coef in ['', '+']:
-                        coef = 1
-                    elif coef == '-':
-                        coef = -1
-                    else:
-                        coef = float(coef)
-                    degree = int(match.group(2))
-                    coefficients[degree] = coef
-                    continue
-                
-                # Término con x (grado 1)
-                match = re.match(r'([+-]?\d*\.?\d*)x', term)
-                if match:
-                    coef = match.group(1)
-                    if coef in ['', '+']:
-                        coef = 1
-                    elif coef == '-':
-                        coef = -1
-                    else:
-                        coef = float(coef)
-                    coefficients[1] = coef
-                    continue
-                
-                # Término constante
-                match = re.match(r'([+-]?\d+\.?\d*)', term)
-                if match:
-                    coef = float(match.group(1))
-                    coefficients[0] = coef
-            
-            return coefficients
+            if isinstance(source, str):
+                scanner.feed(source, final=True)
+            else:
+                while True:
+                    chunk = source.read(_POLY_CHUNK)
+                    scanner.feed(chunk, final=not chunk)
+                    if not chunk:
+                        break
+            if not degrees:
+                raise ValueError("el polinomio está vacío")
+            return Polynomial.from_arrays(degrees, values)
             
         except Exception as e:
             raise ValueError(f"No se pudo parsear el polinomio: {str(e)}")
@@ -89,21 +198,64 @@ class ExpressionParser:
         Valida una expresión matemática
         
         Returns:
-            (es_valida, mensaje_error)
+            (es_valida, mensaje_error) con la posición del primer error
         """
-        # Verificar paréntesis balanceados
-        if expr.count('(') != expr.count(')'):
-            return False, "Paréntesis no balanceados"
-        
-        # Verificar caracteres válidos
-        valid_chars = set('0123456789+-*/^().xsincogtanlexpqr ')
-        if not all(c in valid_chars for c in expr.lower()):
-            return False, "Caracteres inválidos en la expresión"
-        
+        try:
+            parse_expression(expr)
+        except ValueError as e:
+            return False, str(e)
         return True, ""
     
     def normalize_expression(self, expr: str) -> str:
         """Normaliza una expresión para procesamiento"""
-        expr = expr.replace(' ', '')
-        expr = expr.replace('**', '^')
-        return expr
+        return canonical_text(expr)
+
+
+class _PolynomialScanner:
+    """Recorre el texto de un polinomio por bloques y acumula (grado, coef)"""
+    
+    def __init__(self, degrees: List[int], values: List[float]):
+        self.degrees = degrees
+        self.values = values
+        self.pending = ''
+        # Posición en el texto completo del inicio de pending (para los errores)
+        self.offset = 0
+    
+    def feed(self, chunk: str, final: bool = False):
+        """Procesa los términos completos; el último queda pendiente si no es final"""
+        text = self.pending + chunk.lower()
+        end = len(text) if final else _last_term_start(text)
+        self._scan(text, end)
+        self.pending = text[end:]
+        self.offset += end
+    
+    def _scan(self, text: str, end: int):
+        degrees, values = self.degrees, self.values
+        pos = 0
+        while pos < end:
+            match = _POLY_TERM.match(text, pos, end)
+            sign, coef, x = match.group('sign', 'coef', 'x')
+            if match.end() == pos or (coef is None and x is None):
+                raise ValueError(f"término inválido en la posición {self.offset + pos + 1}")
+            if sign is None and (degrees or pos > 0):
+                raise ValueError(f"falta un signo en la posición {self.offset + pos + 1}")
+            
+            value = float(coef) if coef is not None else 1.0
+            values.append(-value if sign == '-' else value)
+            if x is None:
+                degrees.append(0)
+            else:
+                degree = match.group('degree')
+                degrees.append(int(degree) if degree is not None else 1)
+            pos = match.end()
+
+
+def _last_term_start(text: str) -> int:
+    """Posición del último signo que separa términos (no el de un exponente 1e-3)"""
+    cut = len(text)
+    while True:
+        cut = max(text.rfind('+', 0, cut), text.rfind('-', 0, cut))
+        if cut <= 0:
+            return 0
+        if not text[:cut].rstrip().endswith('e'):
+            return cut
@@ -0,0 +1,586 @@
+"""
+Polinomios: evaluación por el esquema de Horner sobre arrays de NumPy y
+álgebra de polinomios en forma densa o dispersa
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .nodes import Node, Number, Variable, Constant, UnaryOp, BinaryOp
+
+
+# Grado máximo que se acepta al detectar polinomios en un árbol
+MAX_TREE_DEGREE = 1000
+
+# Forma dispersa: grado mínimo y densidad (términos / (grado + 1)) máxima
+SPARSE_MIN_DEGREE = 64
+SPARSE_DENSITY = 0.1
+
+# Largo del factor más corto a partir del cual se multiplica por FFT
+FFT_THRESHOLD = 128
+
+# Máximo de productos término a término al multiplicar en forma dispersa
+_MAX_SPARSE_PRODUCTS = 1 << 22
+
+# Grado máximo de la matriz compañera (sin las raíces en 0 y una vez reducido
+# por el mcd de los exponentes)
+MAX_ROOTS_DEGREE = 2000
+
+
+def horner(coefficients, x_values):
+    """
+    Evalúa uno o varios polinomios con el esquema de Horner
+    
+    Args:
+        coefficients: Coeficientes [c0, c1, c2, ...] (1-D) o una matriz con
+                      un polinomio por fila (2-D) para evaluarlos juntos
+        x_values: Escalar o array de valores de x
+    
+    Returns:
+        Array de forma coefficients.shape[:-1] + x_values.shape
+    """
+    coefs = np.asarray(coefficients, dtype=float)
+    x = np.asarray(x_values, dtype=float)
+    
+    if coefs.shape[-1] == 0:
+        return np.zeros(coefs.shape[:-1] + x.shape)
+    
+    # Eje de coeficientes primero y ejes extra para difundir contra x
+    coefs = np.moveaxis(coefs, -1, 0)
+    coefs = coefs.reshape(coefs.shape + (1,) * x.ndim)
+    
+    result = coefs[-1] * np.ones(x.shape)
+    for coef in coefs[-2::-1]:
+        result = result * x + coef
+    return result
+
+
+def stack_coefficients(*polynomials: Sequence[float]) -> np.ndarray:
+    """Apila listas de coeficientes de distinto grado en una matriz (rellena con 0)"""
+    width = max((len(p) for p in polynomials), default=0)
+    matrix = np.zeros((len(polynomials), max(width, 1)))
+    for row, poly in enumerate(polynomials):
+        matrix[row, :len(poly)] = poly
+    return matrix
+
+
+def derivative_matrix(coefficients: Sequence[float], order: int) -> np.ndarray:
+    """
+    Construye la matriz [f, f', f'', ..., f^(order)] de un polinomio
+    
+    Returns:
+        Matriz de (order + 1) filas, lista para evaluarse con horner()
+    """
+    coefs = np.asarray(coefficients, dtype=float)
+    n = len(coefs)
+    matrix = np.zeros((order + 1, max(n, 1)))
+    matrix[0, :n] = coefs
+    
+    factors = np.ones(n)
+    for k in range(1, min(order, n - 1) + 1):
+        # c_j^(k) = c_{j+k} * (j+k)! / j!
+        factors = factors[1:] * np.arange(1, n - k + 1)
+        matrix[k, :n - k] = coefs[k:] * factors
+    return matrix
+
+
+def shift_polynomial(coefficients: Sequence[float], center: float) -> np.ndarray:
+    """
+    Convierte Σ c_k·(x - center)^k en coeficientes de potencias de x
+    
+    Returns:
+        Coeficientes [d0, d1, ...] con Σ d_i·x^i igual al polinomio dado
+    """
+    coefs = np.asarray(coefficients, dtype=float)
+    result = np.zeros(len(coefs))
+    # Horner sobre polinomios: result = result·(x - center) + c_k
+    for k, coef in enumerate(coefs[::-1]):
+        shifted = np.zeros(len(coefs))
+        shifted[1:k + 1] = result[:k]
+        shifted[:k] -= center * result[:k]
+        shifted[0] += coef
+        result = shifted
+    return result
+
+
+def polynomial_coefficients(node: Node) -> Optional[List[float]]:
+    """
+    Extrae los coeficientes si el árbol es una suma de monomios (3x^2 + 2x - 5)
+    
+    Solo se aceptan polinomios ya expandidos; (x+1)^2 retorna None para no
+    perder precisión al expandir.
+    
+    Returns:
+        Coeficientes [c0, c1, ...] o None si no es un polinomio expandido
+    """
+    terms = {}
+    stack = [(node, 1.0)]
+    
+    while stack:
+        current, sign = stack.pop()
+        if isinstance(current, BinaryOp) and current.op in ('+', '-'):
+            stack.append((current.left, sign))
+            stack.append((current.right, sign if current.op == '+' else -sign))
+            continue
+        if isinstance(current, UnaryOp) and current.op == '-':
+            stack.append((current.operand, -sign))
+            continue
+        
+        monomial = _monomial(current)
+        if monomial is None:
+            return None
+        coef, degree = monomial
+        terms[degree] = terms.get(degree, 0.0) + sign * coef
+    
+    degree = max(terms)
+    coefficients = [0.0] * (degree + 1)
+    for d, coef in terms.items():
+        coefficients[d] = coef
+    return coefficients
+
+
+def _numeric_value(node: Node) -> Optional[float]:
+    """Valor de un literal o constante (con signo opcional)"""
+    if isinstance(node, (Number, Constant)):
+        return node.value
+    if isinstance(node, UnaryOp) and node.op == '-':
+        value = _numeric_value(node.operand)
+        return None if value is None else -value
+    return None
+
+
+def _monomial(node: Node) -> Optional[Tuple[float, int]]:
+    """Retorna (coeficiente, grado) si el nodo es c, x, x^n o c*x^n"""
+    value = _numeric_value(node)
+    if value is not None:
+        return value, 0
+    
+    if isinstance(node, Variable):
+        return 1.0, 1
+    
+    if isinstance(node, BinaryOp) and node.op == '^' and isinstance(node.left, Variable):
+        exponent = _numeric_value(node.right)
+        if (exponent is None or exponent < 0 or exponent != int(exponent)
+                or exponent > MAX_TREE_DEGREE):
+            return None
+        return 1.0, int(exponent)
+    
+    if isinstance(node, BinaryOp) and node.op == '*':
+        for numeric, other in ((node.left, node.right), (node.right, node.left)):
+            value = _numeric_value(numeric)
+            if value is not None:
+                inner = _monomial(other)
+                if inner is None:
+                    return None
+                return value * inner[0], inner[1]
+    
+    return None
+
+
+class Polynomial:
+    """
+    Polinomio de coeficientes reales
+    
+    Se guarda denso (array de coeficientes) o disperso (grados y valores de
+    los términos no nulos) según su densidad: x^100000 + 1 ocupa dos términos.
+    Las instancias son inmutables.
+    """
+    
+    __slots__ = ('_dense', '_degrees', '_values')
+    
+    def __init__(self, coefficients: Sequence[float] = ()):
+        """
+        Args:
+            coefficients: Coeficientes [c0, c1, c2, ...] donde ci es el coef de x^i
+        """
+        coefs = np.array(coefficients, dtype=float).ravel()
+        degrees = np.nonzero(coefs)[0]
+        self._store(degrees, coefs[degrees], coefs)
+    
+    @classmethod
+    def from_terms(cls, terms: Dict[int, float]) -> 'Polynomial':
+        """Construye el polinomio Σ coef·x^grado desde un diccionario {grado: coef}"""
+        degrees = np.fromiter(terms.keys(), dtype=np.int64, count=len(terms))
+        values = np.fromiter(terms.values(), dtype=float, count=len(terms))
+        return cls.from_arrays(degrees, values)
+    
+    @classmethod
+    def from_arrays(cls, degrees, values) -> 'Polynomial':
+        """
+        Construye Σ values[i]·x^degrees[i] (los grados repetidos se suman)
+        
+        Args:
+            degrees: Grados de los términos, en cualquier orden
+            values: Coeficientes de los términos
+        """
+        degrees = np.asarray(degrees, dtype=np.int64)
+        values = np.asarray(values, dtype=float)
+        if len(degrees) and degrees.min() < 0:
+            raise ValueError("Los grados de un polinomio no pueden ser negativos")
+        return cls._from_sparse(degrees, values)
+    
+    @classmethod
+    def _from_sparse(cls, degrees: np.ndarray, values: np.ndarray) -> 'Polynomial':
+        """Suma los términos de igual grado y elige la representación"""
+        poly = cls.__new__(cls)
+        if len(degrees):
+            degrees, inverse = np.unique(degrees, return_inverse=True)
+            values = np.bincount(inverse, weights=values, minlength=len(degrees))
+            nonzero = values != 0
+            degrees, values = degrees[nonzero], values[nonzero]
+        poly._store(degrees, values)
+        return poly
+    
+    @classmethod
+    def _from_dense(cls, coefs: np.ndarray) -> 'Polynomial':
+        poly = cls.__new__(cls)
+        degrees = np.nonzero(coefs)[0]
+        poly._store(degrees, coefs[degrees], coefs)
+        return poly
+    
+    def _store(self, degrees: np.ndarray, values: np.ndarray, dense: np.ndarray = None):
+        """Guarda la forma dispersa o la densa (sin ceros finales)"""
+        degree = int(degrees[-1]) if len(degrees) else -1
+        if degree >= SPARSE_MIN_DEGREE and len(degrees) < SPARSE_DENSITY * (degree + 1):
+            self._dense = None
+            self._degrees = degrees.astype(np.int64)
+            self._values = values.astype(float)
+            return
+        
+        if dense is None:
+            dense = np.zeros(degree + 1)
+            dense[degrees] = values
+        self._dense = dense[:degree + 1].copy()
+        self._degrees = self._values = None
+    
+    @property
+    def degree(self) -> int:
+        """Grado del polinomio (-1 para el polinomio nulo)"""
+        if self._dense is not None:
+            return len(self._dense) - 1
+        return int(self._degrees[-1]) if len(self._degrees) else -1
+    
+    @property
+    def is_sparse(self) -> bool:
+        return self._dense is None
+    
+    def terms(self) -> List[Tuple[int, float]]:
+        """Términos no nulos [(grado, coef), ...] en orden creciente de grado"""
+        degrees, values = self._sparse()
+        return list(zip(degrees.tolist(), values.tolist()))
+    
+    def coefficients(self) -> List[float]:
+        """Coeficientes densos [c0, c1, ...] ([0.0] para el polinomio nulo)"""
+        dense = self._as_dense()
+        return dense.tolist() if len(dense) else [0.0]
+    
+    def _sparse(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._dense is None:
+            return self._degrees, self._values
+        degrees = np.nonzero(self._dense)[0]
+        return degrees, self._dense[degrees]
+    
+    def _as_dense(self) -> np.ndarray:
+        if self._dense is not None:
+            return self._dense
+        dense = np.zeros(self.degree + 1)
+        dense[self._degrees] = self._values
+        return dense
+    
+    def __call__(self, x_values):
+        """Evalúa el polinomio en un escalar o un array"""
+        if self._dense is not None:
+            return horner(self._dense, x_values)
+        
+        # Horner sobre los términos: result·x^(salto de grado) + coef
+        x = np.asarray(x_values, dtype=float)
+        result = np.zeros(x.shape)
+        previous = None
+        for degree, value in zip(self._degrees[::-1].tolist(), self._values[::-1].tolist()):
+            if previous is not None:
+                result = result * x ** (previous - degree)
+            result = result + value
+            previous = degree
+        if previous:
+            result = result * x ** previous
+        return result
+    
+    # Aritmética
+    
+    @staticmethod
+    def _coerce(other) -> Optional['Polynomial']:
+        if isinstance(other, Polynomial):
+            return other
+        if isinstance(other, (int, float, np.number)):
+            return Polynomial([other])
+        return None
+    
+    def __add__(self, other):
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        if self._dense is not None and other._dense is not None:
+            a, b = self._dense, other._dense
+            if len(a) < len(b):
+                a, b = b, a
+            result = a.copy()
+            result[:len(b)] += b
+            return Polynomial._from_dense(result)
+        
+        (da, va), (db, vb) = self._sparse(), other._sparse()
+        return Polynomial._from_sparse(np.concatenate((da, db)), np.concatenate((va, vb)))
+    
+    __radd__ = __add__
+    
+    def __neg__(self):
+        if self._dense is not None:
+            return Polynomial._from_dense(-self._dense)
+        return Polynomial._from_sparse(self._degrees, -self._values)
+    
+    def __sub__(self, other):
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        return self + (-other)
+    
+    def __rsub__(self, other):
+        return (-self) + other
+    
+    def __mul__(self, other):
+        if isinstance(other, (int, float, np.number)):
+            if self._dense is not None:
+                return Polynomial._from_dense(self._dense * other)
+            return Polynomial._from_sparse(self._degrees, self._values * other)
+        
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        
+        if self._dense is not None and other._dense is not None:
+            return Polynomial._from_dense(_multiply(self._dense, other._dense))
+        
+        (da, va), (db, vb) = self._sparse(), other._sparse()
+        if len(da) * len(db) > _MAX_SPARSE_PRODUCTS:
+            return Polynomial._from_dense(_multiply(self._as_dense(), other._as_dense()))
+        # Todos los productos término a término y suma de los de igual grado
+        degrees = (da[:, None] + db[None, :]).ravel()
+        values = (va[:, None] * vb[None, :]).ravel()
+        return Polynomial._from_sparse(degrees, values)
+    
+    __rmul__ = __mul__
+    
+    def __pow__(self, exponent: int):
+        if exponent != int(exponent) or exponent < 0:
+            raise ValueError("El exponente de un polinomio debe ser un entero no negativo")
+        
+        # Exponenciación por cuadrados
+        result, base, exponent = Polynomial([1.0]), self, int(exponent)
+        while exponent:
+            if exponent & 1:
+                result = result * base
+            exponent >>= 1
+            if exponent:
+                base = base * base
+        return result
+    
+    def __divmod__(self, other):
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        if other.degree < 0:
+            raise ValueError("División por el polinomio nulo")
+        
+        if other.degree == 0:
+            return self * (1.0 / float(other._as_dense()[0])), Polynomial()
+        if self.degree < other.degree:
+            return Polynomial(), self
+        
+        quotient, remainder = _long_division(self._as_dense(), other._as_dense())
+        return Polynomial._from_dense(quotient), Polynomial._from_dense(remainder)
+    
+    def __floordiv__(self, other):
+        return divmod(self, other)[0]
+    
+    def __mod__(self, other):
+        return divmod(self, other)[1]
+    
+    def __eq__(self, other):
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        (da, va), (db, vb) = self._sparse(), other._sparse()
+        return np.array_equal(da, db) and np.array_equal(va, vb)
+    
+    __hash__ = None
+    
+    def __repr__(self):
+        if self._dense is not None:
+            return f"Polynomial({self._dense.tolist()})"
+        return f"Polynomial.from_terms({dict(self.terms())})"
+    
+    # Cálculo
+    
+    def derivative(self) -> 'Polynomial':
+        """Derivada del polinomio"""
+        if self._dense is not None:
+            return Polynomial._from_dense(self._dense[1:] * np.arange(1, len(self._dense)))
+        degrees, values = self._degrees, self._values
+        keep = degrees > 0
+        return Polynomial._from_sparse(degrees[keep] - 1, values[keep] * degrees[keep])
+    
+    def antiderivative(self, constant: float = 0.0) -> 'Polynomial':
+        """Primitiva con término independiente constant"""
+        if self._dense is not None:
+            integral = self._dense / np.arange(1, len(self._dense) + 1)
+            return Polynomial._from_dense(np.concatenate(([constant], integral)))
+        degrees = np.concatenate(([0], self._degrees + 1))
+        values = np.concatenate(([constant], self._values / (self._degrees + 1)))
+        return Polynomial._from_sparse(degrees, values)
+    
+    def roots(self, polish: bool = True) -> np.ndarray:
+        """
+        Todas las raíces (reales y complejas) como autovalores de la matriz compañera
+        
+        Args:
+            polish: Refina todas las raíces a la vez con pasos de Newton
+        
+        Returns:
+            Array complejo con las raíces, repetidas según su multiplicidad
+        """
+        degrees, values = self._sparse()
+        if not len(degrees):
+            raise ValueError("El polinomio nulo no tiene raíces aisladas")
+        
+        # x^k·q(x): las k raíces en 0 salen sin pasar por la matriz
+        zeros = int(degrees[0])
+        gaps = (degrees - zeros).astype(np.int64)
+        if len(gaps) == 1:
+            return np.zeros(zeros, dtype=complex)
+        
+        # q(x) = r(x^step) con step el mcd de los exponentes: la matriz es la de r
+        step = int(np.gcd.reduce(gaps))
+        coefs = np.zeros(gaps[-1] // step + 1)
+        coefs[gaps // step] = values
+        n = len(coefs) - 1
+        if n > MAX_ROOTS_DEGREE:
+            raise ValueError(f"El grado es demasiado alto para calcular las raíces (máximo {MAX_ROOTS_DEGREE})")
+        
+        # Compañera del polinomio mónico: subdiagonal de unos y última columna -c_i/c_n
+        companion = np.zeros((n, n))
+        companion[np.arange(1, n), np.arange(n - 1)] = 1.0
+        companion[:, -1] = -coefs[:-1] / coefs[-1]
+        roots = np.linalg.eigvals(companion).astype(complex)
+        
+        if polish:
+            roots = _polish_roots(coefs, roots)
+        if step > 1:
+            # Cada raíz y de r aporta sus step raíces step-ésimas (y != 0)
+            unity = np.exp(2j * np.pi * np.arange(step) / step)
+            roots = (roots[:, None] ** (1 / step) * unity[None, :]).ravel()
+        return np.concatenate((np.zeros(zeros, dtype=complex), roots))
+    
+    def real_roots(self) -> np.ndarray:
+        """
+        Raíces reales distintas, ordenadas
+        
+        Una raíz cuenta como real si su parte imaginaria es despreciable o si
+        el polinomio se anula en su parte real (las raíces múltiples salen de
+        la matriz con una parte imaginaria del orden de eps^(1/k)).
+        """
+        roots = self.roots()
+        if not len(roots):
+            return roots.real
+        
+        candidates = roots.real
+        degrees, values = self._sparse()
+        with np.errstate(all='ignore'):
+            powers = np.abs(candidates[:, None]) ** degrees[None, :]
+            residual = np.abs(self(candidates))
+            scale = powers @ np.abs(values)
+        real = ((np.abs(roots.imag) <= 1e-8 * (1 + np.abs(candidates)))
+                | (residual <= 1e-10 * scale))
+        
+        real_roots = np.sort(candidates[real])
+        if len(real_roots) < 2:
+            return real_roots
+        # Las raíces múltiples quedan como un grupo de valores casi iguales:
+        # el promedio del grupo es mucho más preciso que cada uno
+        gap = np.diff(real_roots) > 1e-4 * (1 + np.abs(real_roots[1:]))
+        starts = np.nonzero(np.concatenate(([True], gap)))[0]
+        counts = np.diff(np.append(starts, len(real_roots)))
+        return np.add.reduceat(real_roots, starts) / counts
+    
+    def compose(self, inner: 'Polynomial') -> 'Polynomial':
+        """Composición self(inner(x))"""
+        inner = self._coerce(inner)
+        degrees, values = self._sparse()
+        if not len(degrees):
+            return Polynomial()
+        
+        # Horner sobre polinomios, saltando los grados sin término con potencias
+        result = Polynomial([values[-1]])
+        for k in range(len(degrees) - 2, -1, -1):
+            result = result * inner ** int(degrees[k + 1] - degrees[k]) + float(values[k])
+        return result * inner ** int(degrees[0])
+
+
+def _multiply(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Producto de coeficientes densos: convolución directa o por FFT si son largos"""
+    if min(len(a), len(b)) < FFT_THRESHOLD:
+        return np.convolve(a, b)
+    
+    n = len(a) + len(b) - 1
+    size = 1 << (n - 1).bit_length()
+    result = np.fft.irfft(np.fft.rfft(a, size) * np.fft.rfft(b, size), size)[:n]
+    
+    # Con coeficientes enteros chicos el redondeo recupera el producto exacto
+    bound = np.abs(a).max() * np.abs(b).max() * min(len(a), len(b))
+    if bound < 2 ** 40 and _is_integral(a) and _is_integral(b):
+        result = np.rint(result)
+    return result
+
+
+def _is_integral(coefs: np.ndarray) -> bool:
+    return bool(np.all(coefs == np.round(coefs)))
+
+
+def _long_division(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """División larga de coeficientes densos (grado de a >= grado de b >= 1)"""
+    remainder = a.copy()
+    m = len(b)
+    quotient = np.zeros(len(a) - m + 1)
+    lead = b[-1]
+    for k in range(len(quotient) - 1, -1, -1):
+        quotient[k] = remainder[k + m - 1] / lead
+        remainder[k:k + m] -= quotient[k] * b
+    return quotient, remainder[:m - 1]
+
+
+def _polish_roots(coefs: np.ndarray, roots: np.ndarray, iterations: int = 3) -> np.ndarray:
+    """
+    Pasos de Newton sobre todas las raíces a la vez
+    
+    Un paso se acepta si baja |p| y es más corto que la mitad de la distancia
+    a la raíz vecina (así dos raíces no terminan en el mismo punto).
+    """
+    poly = coefs[::-1]
+    derivative = np.polyder(poly)
+    distance = np.abs(roots[:, None] - roots[None, :])
+    np.fill_diagonal(distance, np.inf)
+    reach = distance.min(axis=1) / 2 if len(roots) > 1 else np.full(1, np.inf)
+    # Las raíces múltiples (grupos muy juntos) se dejan como están: Newton
+    # converge mal y rompe la simetría que hace exacto el promedio del grupo
+    reach[reach < 1e-4 * (1 + np.abs(roots))] = 0.0
+    
+    with np.errstate(all='ignore'):
+        value = np.abs(np.polyval(poly, roots))
+        for _ in range(iterations):
+            step = np.polyval(poly, roots) / np.polyval(derivative, roots)
+            candidate = roots - step
+            candidate_value = np.abs(np.polyval(poly, candidate))
+            better = np.isfinite(candidate_value) & (candidate_value < value) & (np.abs(step) < reach)
+            if not better.any():
+                break
+            roots = np.where(better, candidate, roots)
+            value = np.where(better, candidate_value, value)
+    return roots
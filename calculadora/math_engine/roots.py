@@ -0,0 +1,131 @@
+"""
+Búsqueda numérica de raíces f(x) = 0
+Muestrea el intervalo una vez y refina todos los intervalos con cambio de
+signo a la vez, con pasos de Newton protegidos por bisección
+"""
+
+import numpy as np
+
+from .evaluator import ExpressionEvaluator, CompiledExpression
+
+
+class RootFinder:
+    """Encuentra todas las raíces de una expresión en un intervalo"""
+    
+    def __init__(self, evaluator: ExpressionEvaluator = None, samples: int = 2001,
+                 tolerance: float = 1e-12, max_iterations: int = 100):
+        """
+        Args:
+            evaluator: Evaluador del que se toman la caché y el modo angular
+            samples: Puntos de la grilla inicial (separa raíces más cercanas que
+                     (b - a) / samples solo si hay cambio de signo entre ellas)
+            tolerance: Ancho relativo del intervalo al que se da por convergida una raíz
+            max_iterations: Iteraciones máximas del refinamiento
+        """
+        if samples < 2:
+            raise ValueError("Se necesitan al menos 2 puntos de muestreo")
+        
+        self.evaluator = evaluator or ExpressionEvaluator()
+        self.samples = samples
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+    
+    def find_roots(self, expression: str, x_min: float, x_max: float) -> np.ndarray:
+        """
+        Busca las raíces de expression en [x_min, x_max]
+        
+        Returns:
+            Array ordenado con las raíces (vacío si no hay)
+        """
+        compiled = self.evaluator.compile(expression)
+        if not compiled.has_variable:
+            raise ValueError("La ecuación debe contener la variable x")
+        
+        x = np.linspace(x_min, x_max, self.samples)
+        y, dy = compiled.evaluate_with_derivative(x)
+        
+        roots = [x[y == 0]]
+        
+        # Cambios de signo de f: raíces simples (y polos, que se descartan después)
+        with np.errstate(invalid='ignore'):
+            change = np.sign(y[:-1]) * np.sign(y[1:]) < 0
+        index = np.nonzero(change)[0]
+        if len(index):
+            roots.append(self._refine(compiled.evaluate_with_derivative,
+                                      x[index], x[index + 1], y[index]))
+        
+        # Cambios de signo de f' con f chica: raíces dobles (x^2, sin(x)^2)
+        with np.errstate(invalid='ignore'):
+            turn = (np.sign(dy[:-1]) * np.sign(dy[1:]) < 0) & ~change
+        index = np.nonzero(turn)[0]
+        if len(index):
+            second = self._second_derivative(compiled)
+            roots.append(self._refine(second, x[index], x[index + 1], dy[index]))
+        
+        candidates = np.concatenate(roots)
+        return self._accept(compiled, candidates, y)
+    
+    def _refine(self, func, a: np.ndarray, b: np.ndarray, fa: np.ndarray) -> np.ndarray:
+        """
+        Refina todos los intervalos [a, b] con cambio de signo a la vez
+        
+        func(x) retorna (g, g'); se busca g = 0. Cada paso de Newton que cae
+        fuera del intervalo se reemplaza por el punto medio.
+        """
+        a, b, fa = a.copy(), b.copy(), fa.copy()
+        x = (a + b) / 2
+        active = np.ones(len(x), dtype=bool)
+        
+        for _ in range(self.max_iterations):
+            g, dg = func(x[active])
+            xa, aa, ba, fa_a = x[active], a[active], b[active], fa[active]
+            
+            # Achicar el intervalo con el signo del nuevo punto
+            same = np.sign(g) == np.sign(fa_a)
+            aa = np.where(same, xa, aa)
+            fa_a = np.where(same, g, fa_a)
+            ba = np.where(same, ba, xa)
+            
+            with np.errstate(all='ignore'):
+                newton = xa - g / dg
+            inside = np.isfinite(newton) & (newton > aa) & (newton < ba)
+            x_new = np.where(inside, newton, (aa + ba) / 2)
+            
+            done = ((g == 0) | (np.abs(ba - aa) <= self.tolerance * (1 + np.abs(xa)))
+                    | (np.abs(x_new - xa) <= self.tolerance * (1 + np.abs(xa))))
+            x_new = np.where(g == 0, xa, x_new)
+            
+            x[active], a[active], b[active], fa[active] = x_new, aa, ba, fa_a
+            active[np.nonzero(active)[0][done]] = False
+            if not active.any():
+                break
+        
+        return x
+    
+    def _second_derivative(self, compiled: CompiledExpression):
+        """(f', f'') por diferencias centrales sobre la derivada exacta de f"""
+        def func(x):
+            h = 1e-6 * np.maximum(1.0, np.abs(x))
+            dy = compiled.evaluate_with_derivative(x)[1]
+            dy_plus = compiled.evaluate_with_derivative(x + h)[1]
+            dy_minus = compiled.evaluate_with_derivative(x - h)[1]
+            return dy, (dy_plus - dy_minus) / (2 * h)
+        return func
+    
+    def _accept(self, compiled: CompiledExpression, candidates: np.ndarray,
+                y_grid: np.ndarray) -> np.ndarray:
+        """Descarta polos y extremos que no tocan el cero, y une duplicados"""
+        if len(candidates) == 0:
+            return candidates
+        
+        values = compiled.evaluate_array(candidates)
+        finite = y_grid[np.isfinite(y_grid)]
+        scale = np.median(np.abs(finite)) if len(finite) else 1.0
+        # Tolerancia en y: una raíz de verdad queda en el ruido de redondeo
+        limit = 1e-8 * max(scale, 1.0)
+        roots = np.sort(candidates[np.abs(values) <= limit])
+        
+        if len(roots) < 2:
+            return roots
+        gap = np.diff(roots) > 1e-9 * (1 + np.abs(roots[1:]))
+        return roots[np.concatenate(([True], gap))]
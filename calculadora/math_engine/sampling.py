@@ -0,0 +1,170 @@
+"""
+Muestreo adaptativo de curvas para graficación
+Refina donde la curva se dobla o salta y corta la línea en los polos
+"""
+
+import numpy as np
+from typing import Callable, List, Tuple
+
+
+class AdaptiveSampler:
+    """Muestreador adaptativo con presupuesto global de evaluaciones"""
+    
+    def __init__(self, initial_points: int = 65, max_points: int = 1000,
+                 max_depth: int = 12, tolerance: float = 2e-3):
+        """
+        Args:
+            initial_points: Puntos de la grilla uniforme inicial
+            max_points: Presupuesto total de evaluaciones
+            max_depth: Máximo de subdivisiones de un intervalo inicial
+            tolerance: Desvío máximo respecto de la recta, relativo a la escala visible
+        """
+        if initial_points < 3:
+            raise ValueError("Se necesitan al menos 3 puntos iniciales")
+        
+        self.initial_points = initial_points
+        self.max_points = max(max_points, initial_points)
+        self.max_depth = max_depth
+        self.tolerance = tolerance
+        self.evaluations = 0
+        self.y_range = (-1.0, 1.0)
+    
+    def sample(self, func: Callable[[np.ndarray], np.ndarray],
+               x_min: float, x_max: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Muestrea func en [x_min, x_max]
+        
+        Args:
+            func: Función vectorizada (recibe y retorna arrays, NaN fuera del dominio).
+                  Puede retornar varias curvas a la vez (tupla o matriz con una
+                  fila por curva, ej: f y f'); se refinan sobre los mismos x
+            x_min, x_max: Extremos del intervalo
+        
+        Returns:
+            (x_values, y_values) con NaN insertados en las discontinuidades;
+            y_values tiene una fila por curva si func retorna varias.
+            self.y_range queda con el rango visible sugerido (de todas las curvas)
+        """
+        x = np.linspace(x_min, x_max, self.initial_points)
+        first = np.asarray(func(x), dtype=float)
+        single = first.ndim == 1
+        y = np.atleast_2d(first)
+        self.evaluations = len(x)
+        
+        # La escala se mide sobre la grilla uniforme: los puntos refinados
+        # se concentran cerca de los polos y la inflarían
+        views = [visible_range(row) for row in y]
+        self.y_range = (min(low for low, _ in views), max(high for _, high in views))
+        
+        min_width = (x_max - x_min) / (self.initial_points - 1) / 2 ** self.max_depth
+        
+        # Cada ronda evalúa todos los puntos medios nuevos en una sola llamada
+        while self.evaluations < self.max_points:
+            scores = np.max([self._refinement_scores(x, row, view, min_width)
+                             for row, view in zip(y, views)], axis=0)
+            candidates = np.nonzero(scores > 0)[0]
+            if len(candidates) == 0:
+                break
+            
+            budget = self.max_points - self.evaluations
+            if len(candidates) > budget:
+                best = np.argsort(scores[candidates])[::-1][:budget]
+                candidates = np.sort(candidates[best])
+            
+            x_new = (x[candidates] + x[candidates + 1]) / 2
+            y_new = np.atleast_2d(np.asarray(func(x_new), dtype=float))
+            self.evaluations += len(x_new)
+            
+            x = np.insert(x, candidates + 1, x_new)
+            y = np.insert(y, candidates + 1, y_new, axis=1)
+        
+        x, y = self._insert_breaks(x, y, views, min_width)
+        return x, (y[0] if single else y)
+    
+    def _refinement_scores(self, x: np.ndarray, y: np.ndarray, view: Tuple[float, float],
+                           min_width: float) -> np.ndarray:
+        """Puntaje de cada intervalo [x_i, x_i+1]; > 0 significa subdividir"""
+        scores = np.zeros(len(x) - 1)
+        
+        # Lo que queda muy fuera de la vista no necesita detalle
+        low, high = view
+        scale = max(high - low, np.finfo(float).eps)
+        y = np.clip(y, low, high)
+        
+        # Distancia del punto central a la recta entre sus vecinos, en
+        # coordenadas normalizadas (ancho y alto de la vista = 1)
+        u = (x - x[0]) / max(x[-1] - x[0], np.finfo(float).eps)
+        v = y / scale
+        du1, dv1 = u[1:-1] - u[:-2], v[1:-1] - v[:-2]
+        du2, dv2 = u[2:] - u[:-2], v[2:] - v[:-2]
+        with np.errstate(all='ignore'):
+            deviation = np.abs(du2 * dv1 - du1 * dv2) / np.hypot(du2, dv2)
+        deviation = np.where(np.isfinite(deviation), deviation, 0.0)
+        
+        bent = deviation > self.tolerance
+        scores[:-1] = np.where(bent, deviation, scores[:-1])
+        scores[1:] = np.maximum(scores[1:], np.where(bent, deviation, 0.0))
+        
+        # Saltos grandes: se achican al refinar salvo en polos y discontinuidades
+        jump = np.abs(np.diff(v))
+        jump = np.where(np.isfinite(jump), jump, 0.0)
+        scores = np.maximum(scores, np.where(jump > 0.05, jump, 0.0))
+        
+        # Bordes del dominio: un extremo definido y el otro no
+        finite = np.isfinite(y)
+        edge = finite[:-1] != finite[1:]
+        scores[edge] = np.maximum(scores[edge], 1.0)
+        
+        # No subdividir por debajo del ancho mínimo
+        scores[np.diff(x) <= 2 * min_width] = 0.0
+        return scores
+    
+    def _insert_breaks(self, x: np.ndarray, y: np.ndarray, views: List[Tuple[float, float]],
+                       min_width: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Inserta NaN en los saltos que no se resolvieron al refinar (polos)"""
+        if len(x) < 2:
+            return x, y
+        
+        narrow = np.diff(x) <= 4 * min_width
+        with np.errstate(all='ignore'):
+            split = np.array([
+                (np.abs(np.diff(row)) > 0.25 * (high - low))
+                & (np.sign(row[:-1]) != np.sign(row[1:])) & narrow
+                for row, (low, high) in zip(y, views)
+            ])
+        breaks = np.nonzero(split.any(axis=0))[0]
+        
+        if len(breaks) == 0:
+            return x, y
+        
+        # Las curvas que no saltan ahí reciben el punto medio y siguen continuas
+        x_break = (x[breaks] + x[breaks + 1]) / 2
+        y_break = np.where(split[:, breaks], np.nan, (y[:, breaks] + y[:, breaks + 1]) / 2)
+        return (np.insert(x, breaks + 1, x_break),
+                np.insert(y, breaks + 1, y_break, axis=1))
+
+
+def visible_range(y: np.ndarray, margin: float = 0.1) -> Tuple[float, float]:
+    """
+    Rango de y razonable para mostrar, ignorando los picos de los polos
+    
+    Returns:
+        (y_min, y_max) con un margen relativo
+    """
+    finite = y[np.isfinite(y)]
+    if len(finite) == 0:
+        return -1.0, 1.0
+    
+    low, high = np.percentile(finite, [2, 98])
+    spread = high - low
+    # Incluir los extremos reales salvo que se alejen demasiado (polos)
+    if finite.min() >= low - spread:
+        low = finite.min()
+    if finite.max() <= high + spread:
+        high = finite.max()
+    if high - low < 1e-12:
+        low, high = low - 1.0, high + 1.0
+    
+    pad = (high - low) * margin
+    return float(low - pad), float(high + pad)
+
@@ -0,0 +1,250 @@
+"""
+Series de Taylor por aritmética de series de potencias truncadas
+Propaga los coeficientes de (x - a)^k por el árbol compilado en una sola pasada
+"""
+
+import math
+import numpy as np
+from typing import Callable
+
+from .nodes import Node
+from .compiler import build_function, degree_functions
+
+
+class PowerSeries:
+    """Serie c0 + c1·t + ... + cn·t^n truncada en el orden n (t = x - a)"""
+    
+    __slots__ = ('coefs',)
+    
+    # Hace que NumPy delegue en los métodos reflejados
+    __array_ufunc__ = None
+    
+    def __init__(self, coefs):
+        self.coefs = np.asarray(coefs, dtype=float)
+    
+    @classmethod
+    def variable(cls, center: float, order: int) -> 'PowerSeries':
+        """La serie de x alrededor de center: a + t"""
+        coefs = np.zeros(order + 1)
+        coefs[0] = center
+        if order >= 1:
+            coefs[1] = 1.0
+        return cls(coefs)
+    
+    @property
+    def order(self) -> int:
+        return len(self.coefs) - 1
+    
+    def _constant(self, value: float) -> np.ndarray:
+        coefs = np.zeros(len(self.coefs))
+        coefs[0] = value
+        return coefs
+    
+    def _coefs_of(self, other) -> np.ndarray:
+        if isinstance(other, PowerSeries):
+            return other.coefs
+        return self._constant(other)
+    
+    def __add__(self, other):
+        if isinstance(other, PowerSeries):
+            return PowerSeries(self.coefs + other.coefs)
+        return PowerSeries(self.coefs + self._constant(other))
+    
+    __radd__ = __add__
+    
+    def __sub__(self, other):
+        return PowerSeries(self.coefs - self._coefs_of(other))
+    
+    def __rsub__(self, other):
+        return PowerSeries(self._coefs_of(other) - self.coefs)
+    
+    def __mul__(self, other):
+        if isinstance(other, PowerSeries):
+            return PowerSeries(_multiply(self.coefs, other.coefs))
+        return PowerSeries(self.coefs * other)
+    
+    __rmul__ = __mul__
+    
+    def __truediv__(self, other):
+        if isinstance(other, PowerSeries):
+            return PowerSeries(_divide(self.coefs, other.coefs))
+        return PowerSeries(self.coefs / other)
+    
+    def __rtruediv__(self, other):
+        return PowerSeries(_divide(self._constant(other), self.coefs))
+    
+    def __pow__(self, other):
+        if isinstance(other, PowerSeries):
+            # f^g = exp(g·ln f)
+            return series_exp(other * series_ln(self))
+        return PowerSeries(_power(self.coefs, float(other)))
+    
+    def __rpow__(self, other):
+        return series_exp(self * math.log(other))
+    
+    def __mod__(self, other):
+        if isinstance(other, PowerSeries):
+            raise ValueError("El resto con divisor variable no tiene serie de Taylor")
+        coefs = self.coefs.copy()
+        coefs[0] = coefs[0] % other
+        return PowerSeries(coefs)
+    
+    def __rmod__(self, other):
+        raise ValueError("El resto con divisor variable no tiene serie de Taylor")
+    
+    def __neg__(self):
+        return PowerSeries(-self.coefs)
+    
+    def __pos__(self):
+        return self
+
+
+def _multiply(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.convolve(a, b)[:len(a)]
+
+
+def _divide(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """q = a/b: q_k = (a_k - Σ b_j·q_(k-j)) / b_0"""
+    q = np.zeros(len(a))
+    for k in range(len(a)):
+        q[k] = (a[k] - np.dot(b[1:k + 1], q[k - 1::-1] if k else q[:0])) / b[0]
+    return q
+
+
+def _power(a: np.ndarray, r: float) -> np.ndarray:
+    """a^r para un exponente constante"""
+    n = len(a)
+    if a[0] == 0:
+        if r == int(r) and r >= 0:
+            # Potencia entera por multiplicaciones (la serie empieza en t^k)
+            result = np.zeros(n)
+            result[0] = 1.0
+            for _ in range(int(r)):
+                result = _multiply(result, a)
+            return result
+        # Sin desarrollo de Taylor en 0 (sqrt(x) en x = 0)
+        result = np.full(n, np.nan)
+        result[0] = 0.0 if r > 0 else np.inf
+        return result
+    
+    # p_k = Σ ((r+1)·j - k)·a_j·p_(k-j) / (k·a_0)
+    p = np.zeros(n)
+    p[0] = np.power(a[0], r)
+    for k in range(1, n):
+        j = np.arange(1, k + 1)
+        p[k] = np.dot(((r + 1) * j - k) * a[1:k + 1], p[k - 1::-1]) / (k * a[0])
+    return p
+
+
+def _integrate(value: float, integrand: np.ndarray) -> np.ndarray:
+    """Primitiva con valor inicial: r_0 = value, r_k = integrand_(k-1) / k"""
+    result = np.empty(len(integrand))
+    result[0] = value
+    result[1:] = integrand[:-1] / np.arange(1, len(integrand))
+    return result
+
+
+def _derivative(a: np.ndarray) -> np.ndarray:
+    """Serie de la derivada (el último coeficiente queda en 0, no se usa)"""
+    result = np.zeros(len(a))
+    result[:-1] = a[1:] * np.arange(1, len(a))
+    return result
+
+
+def series_exp(u: PowerSeries) -> PowerSeries:
+    a = u.coefs
+    e = np.zeros(len(a))
+    e[0] = np.exp(a[0])
+    for k in range(1, len(a)):
+        j = np.arange(1, k + 1)
+        e[k] = np.dot(j * a[1:k + 1], e[k - 1::-1]) / k
+    return PowerSeries(e)
+
+
+def series_ln(u: PowerSeries) -> PowerSeries:
+    a = u.coefs
+    with np.errstate(all='ignore'):
+        return PowerSeries(_integrate(np.log(a[0]), _divide(_derivative(a), a)))
+
+
+def _sin_cos(u: PowerSeries):
+    a = u.coefs
+    s, c = np.zeros(len(a)), np.zeros(len(a))
+    s[0], c[0] = np.sin(a[0]), np.cos(a[0])
+    for k in range(1, len(a)):
+        j = np.arange(1, k + 1)
+        s[k] = np.dot(j * a[1:k + 1], c[k - 1::-1]) / k
+        c[k] = -np.dot(j * a[1:k + 1], s[k - 1::-1]) / k
+    return PowerSeries(s), PowerSeries(c)
+
+
+def _series_tan(u: PowerSeries) -> PowerSeries:
+    sin, cos = _sin_cos(u)
+    return sin / cos
+
+
+def _inverse_trig(func: Callable, u: PowerSeries, inner: PowerSeries,
+                  sign: float) -> PowerSeries:
+    """func(u) como primitiva de sign·u'·inner (asin, acos, atan)"""
+    integrand = sign * _multiply(_derivative(u.coefs), inner.coefs)
+    return PowerSeries(_integrate(func(u.coefs[0]), integrand))
+
+
+def _lift(scalar: Callable, series: Callable) -> Callable:
+    """Aplica la versión de series si el argumento es una serie"""
+    def func(u):
+        if isinstance(u, PowerSeries):
+            with np.errstate(all='ignore'):
+                return series(u)
+        return scalar(u)
+    return func
+
+
+def _series_abs(u: PowerSeries) -> PowerSeries:
+    if u.coefs[0] == 0:
+        coefs = np.full(len(u.coefs), np.nan)
+        coefs[0] = 0.0
+        return PowerSeries(coefs)
+    return u * np.sign(u.coefs[0])
+
+
+def _series_cbrt(u: PowerSeries) -> PowerSeries:
+    if u.coefs[0] < 0:
+        return -PowerSeries(_power(-u.coefs, 1 / 3))
+    return PowerSeries(_power(u.coefs, 1 / 3))
+
+
+def _series_factorial(u: PowerSeries) -> PowerSeries:
+    raise ValueError("El factorial no tiene serie de Taylor en esta calculadora")
+
+
+# Funciones sobre series truncadas
+SERIES_FUNCTIONS = {
+    "sin": _lift(math.sin, lambda u: _sin_cos(u)[0]),
+    "cos": _lift(math.cos, lambda u: _sin_cos(u)[1]),
+    "tan": _lift(math.tan, _series_tan),
+    "asin": _lift(math.asin, lambda u: _inverse_trig(np.arcsin, u, (1 - u * u) ** -0.5, 1.0)),
+    "acos": _lift(math.acos, lambda u: _inverse_trig(np.arccos, u, (1 - u * u) ** -0.5, -1.0)),
+    "atan": _lift(math.atan, lambda u: _inverse_trig(np.arctan, u, 1 / (1 + u * u), 1.0)),
+    "sqrt": _lift(math.sqrt, lambda u: PowerSeries(_power(u.coefs, 0.5))),
+    "cbrt": _lift(lambda v: math.copysign(abs(v) ** (1 / 3), v), _series_cbrt),
+    "abs": _lift(abs, _series_abs),
+    "exp": _lift(math.exp, series_exp),
+    "log": _lift(math.log10, lambda u: series_ln(u) / math.log(10)),
+    "ln": _lift(math.log, series_ln),
+    "factorial": _lift(lambda v: math.gamma(v + 1), _series_factorial)
+}
+
+
+def compile_series(node: Node, angle_mode: str = 'rad') -> Callable:
+    """
+    Compila un árbol a una función que opera sobre series truncadas
+    
+    Returns:
+        Función f(PowerSeries) -> PowerSeries (o un número si es constante)
+    """
+    funcs = SERIES_FUNCTIONS
+    if angle_mode == 'deg':
+        funcs = degree_functions(funcs, lambda v: v * (math.pi / 180),
+                                 lambda v: v * (180 / math.pi))
+    return build_function(node, funcs)
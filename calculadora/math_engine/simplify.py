@@ -0,0 +1,554 @@
+"""
+Simplificador algebraico de árboles de expresiones
+Lleva las sumas y productos a una forma canónica: pliega constantes, elimina
+neutros, agrupa términos semejantes y junta potencias de la misma base
+"""
+
+import hashlib
+import math
+from typing import Dict, List, Optional, Tuple
+
+from .nodes import Node, Number, Variable, Constant, UnaryOp, BinaryOp, FunctionCall
+from .dag import ExpressionDAG
+
+
+class Simplifier:
+    """Simplificador con presupuesto de esfuerzo (nodos visitados)"""
+    
+    def __init__(self, dag: ExpressionDAG = None, budget: int = 50_000, max_passes: int = 3,
+                 together: bool = False):
+        """
+        Args:
+            dag: DAG donde se internan los resultados (se crea uno si no se da)
+            budget: Máximo de nodos a visitar en total; una expresión más grande
+                    que el presupuesto se devuelve sin cambios
+            max_passes: Pasadas como máximo hasta llegar a un punto fijo
+            together: Si es True las sumas con fracciones se llevan a un
+                      denominador común: 1/x + x -> (x^2 + 1)/x
+        """
+        self.dag = dag or ExpressionDAG()
+        self.budget = budget
+        self.max_passes = max_passes
+        self.together = together
+    
+    def simplify(self, node: Node) -> Node:
+        """
+        Simplifica una expresión
+        
+        Returns:
+            Nodo equivalente en forma canónica (interno al DAG)
+        """
+        node = self.dag.intern(node)
+        spent = 0
+        
+        for _ in range(self.max_passes):
+            size = _dag_size(node)
+            spent += size
+            if spent > self.budget:
+                break
+            
+            self._memo: Dict[Node, Node] = {}
+            self._keys: Dict[Node, tuple] = {}
+            result = self._simplify(node)
+            if result is node:
+                break
+            node = result
+        
+        self._memo = self._keys = None
+        return node
+    
+    def _simplify(self, node: Node) -> Node:
+        result = self._memo.get(node)
+        if result is not None:
+            return result
+        
+        if isinstance(node, (Number, Variable, Constant)):
+            result = node
+        elif _is_sum(node):
+            result = self._simplify_sum(node)
+        elif isinstance(node, BinaryOp) and node.op in ('*', '/'):
+            result = self._simplify_product(node)
+        elif isinstance(node, BinaryOp) and node.op == '^':
+            result = self._simplify_power(node)
+        elif isinstance(node, BinaryOp):
+            result = self._simplify_mod(node)
+        elif isinstance(node, UnaryOp):
+            result = self._simplify_factorial(node)
+        else:
+            result = self._simplify_function(node)
+        
+        self._memo[node] = result
+        return result
+    
+    # Sumas: se recorre toda la cadena de +/- como una suma n-aria
+    
+    def _simplify_sum(self, node: Node) -> Node:
+        terms: Dict[Optional[Node], float] = {}
+        stack = [(node, 1.0)]
+        
+        while stack:
+            current, sign = stack.pop()
+            if isinstance(current, BinaryOp) and current.op in ('+', '-'):
+                stack.append((current.left, sign))
+                stack.append((current.right, sign if current.op == '+' else -sign))
+            elif isinstance(current, UnaryOp) and current.op == '-':
+                stack.append((current.operand, -sign))
+            else:
+                for coef, rest in self._terms(self._simplify(current)):
+                    terms[rest] = terms.get(rest, 0.0) + sign * coef
+        
+        if self.together:
+            return self._together(terms)
+        return self._build_sum(terms)
+    
+    def _together(self, terms: Dict[Optional[Node], float]) -> Node:
+        """Suma sobre el denominador común: a/b^2 + c/b -> (a + b*c)/b^2"""
+        items = [(coef, self._rest_factors(rest)) for rest, coef in terms.items() if coef != 0]
+        common: Dict[Node, float] = {}
+        for _, powers in items:
+            for base, exp in powers.powers.items():
+                if exp < 0:
+                    common[base] = max(common.get(base, 0.0), -exp)
+        if not common:
+            return self._build_sum(terms)
+        
+        numerator: Dict[Optional[Node], float] = {}
+        for coef, powers in items:
+            powers.coef *= coef
+            for base, exp in common.items():
+                powers.add(base, exp)
+            c, rest = self._split_coefficient(self._build_product(powers))
+            numerator[rest] = numerator.get(rest, 0.0) + c
+        
+        factors = _Factors()
+        self._collect(self._build_sum(numerator), 1.0, factors)
+        for base, exp in common.items():
+            factors.add(base, -exp)
+        self._cancel(factors)
+        return self._build_product(factors)
+    
+    def _terms(self, node: Node) -> List[Tuple[float, Optional[Node]]]:
+        """Términos (coeficiente, resto) de una expresión ya simplificada"""
+        terms = []
+        stack = [(node, 1.0)]
+        while stack:
+            current, sign = stack.pop()
+            if isinstance(current, BinaryOp) and current.op in ('+', '-'):
+                stack.append((current.left, sign))
+                stack.append((current.right, sign if current.op == '+' else -sign))
+            elif isinstance(current, UnaryOp) and current.op == '-':
+                stack.append((current.operand, -sign))
+            else:
+                coef, rest = self._split_coefficient(current)
+                if _is_sum(rest):
+                    # 2*(a + b) -> 2*a + 2*b
+                    stack.append((rest, sign * coef))
+                    continue
+                expanded = self._expand(rest)
+                if expanded is None:
+                    terms.append((sign * coef, rest))
+                else:
+                    terms.extend((sign * coef * c, r) for c, r in expanded)
+        return terms
+    
+    def _expand(self, node: Node) -> Optional[List[Tuple[float, Optional[Node]]]]:
+        """
+        Distribuye un producto con sumas entre sus factores: (a + b)*c -> a*c + b*c
+        
+        Sin esto los numeradores de las derivadas sucesivas se anidan y crecen
+        exponencialmente; expandidos, los términos semejantes se juntan. Solo
+        se distribuye el numerador y solo si salen a lo sumo _EXPAND_TERMS términos.
+        
+        Returns:
+            Términos (coeficiente, resto) ya simplificados, o None si no se expande
+        """
+        numerator, denominator = node, None
+        if isinstance(node, BinaryOp) and node.op == '/':
+            numerator, denominator = node.left, node.right
+        if not (isinstance(numerator, BinaryOp) and numerator.op == '*'):
+            return None
+        
+        sums, others = [], []
+        for factor in _chain_factors(numerator):
+            (sums if _is_sum(factor) else others).append(factor)
+        if not sums:
+            return None
+        
+        expanded = [(1.0, others)]
+        for factor in sums:
+            factor_terms = self._terms(factor)
+            if len(expanded) * len(factor_terms) > _EXPAND_TERMS:
+                return None
+            expanded = [(coef * c, rest + ([r] if r is not None else []))
+                        for coef, rest in expanded for c, r in factor_terms]
+        
+        terms = []
+        for coef, rest in expanded:
+            product = self._chain(rest) if rest else self.dag.number(1)
+            if denominator is not None:
+                product = self.dag.binary('/', product, denominator)
+            c, r = self._split_coefficient(self._simplify(product))
+            terms.append((coef * c, r))
+        return terms
+    
+    def _split_coefficient(self, node: Node) -> Tuple[float, Optional[Node]]:
+        """Separa el factor numérico de un término: 2*x/y -> (2, x/y)"""
+        if isinstance(node, Number):
+            return node.value, None
+        if isinstance(node, UnaryOp) and node.op == '-':
+            coef, rest = self._split_coefficient(node.operand)
+            return -coef, rest
+        if isinstance(node, BinaryOp) and node.op == '*' and isinstance(node.left, Number):
+            return node.left.value, node.right
+        if isinstance(node, BinaryOp) and node.op == '/':
+            coef, rest = self._split_coefficient(node.left)
+            if coef != 1:
+                return coef, self.dag.binary('/', rest or self.dag.number(1), node.right)
+        return 1.0, node
+    
+    def _build_sum(self, terms: Dict[Optional[Node], float]) -> Node:
+        items = [(coef, rest) for rest, coef in terms.items() if coef != 0]
+        if not items:
+            return self.dag.number(0)
+        
+        # Potencias de x de mayor a menor, luego el resto y la constante al final
+        items.sort(key=lambda item: self._term_key(item[1]))
+        
+        result = None
+        for coef, rest in items:
+            if result is None:
+                result = self._scale(coef, rest)
+            elif coef < 0:
+                result = self.dag.binary('-', result, self._scale(-coef, rest))
+            else:
+                result = self.dag.binary('+', result, self._scale(coef, rest))
+        return result
+    
+    def _scale(self, coef: float, rest: Optional[Node]) -> Node:
+        """Construye coef*rest"""
+        if rest is None:
+            return self.dag.number(coef)
+        if coef == 1:
+            return rest
+        if isinstance(rest, Number):
+            return self.dag.number(coef * rest.value)
+        if isinstance(rest, BinaryOp) and rest.op == '/':
+            # El signo y el coeficiente van en el numerador: -2*x/y
+            return self.dag.binary('/', self._scale(coef, rest.left), rest.right)
+        if coef == -1:
+            return self.dag.unary('-', rest)
+        return self.dag.binary('*', self.dag.number(coef), rest)
+    
+    def _term_key(self, rest: Optional[Node]) -> tuple:
+        if rest is None:
+            return (1, 0.0, '')
+        return (0, -_leading_degree(rest)) + self._order_key(rest)
+    
+    # Productos: se recorre toda la cadena de * y / juntando exponentes por base
+    
+    def _simplify_product(self, node: Node) -> Node:
+        factors = _Factors()
+        stack = [(node, 1.0)]
+        
+        while stack:
+            current, exponent = stack.pop()
+            if isinstance(current, BinaryOp) and current.op in ('*', '/'):
+                stack.append((current.left, exponent))
+                stack.append((current.right, exponent if current.op == '*' else -exponent))
+            else:
+                self._collect(self._simplify(current), exponent, factors)
+        
+        self._cancel(factors)
+        return self._build_product(factors)
+    
+    def _cancel(self, factors: '_Factors'):
+        """
+        Cancela potencias comunes a todos los términos de una suma del
+        numerador con el denominador: (a*b^2 + c*b)/b^3 -> (a*b + c)/b^2
+        """
+        sums = [base for base, exp in factors.powers.items() if exp == 1 and _is_sum(base)]
+        for total in sums:
+            terms = [(coef, self._rest_factors(rest)) for coef, rest in self._terms(total)]
+            cancelled = False
+            for base, exp in list(factors.powers.items()):
+                if exp >= 0:
+                    continue
+                common = min(min(powers.powers.get(base, 0.0) for _, powers in terms), -exp)
+                if common <= 0 or common != int(common):
+                    continue
+                for _, powers in terms:
+                    powers.add(base, -common)
+                factors.add(base, common)
+                cancelled = True
+            if not cancelled:
+                continue
+            
+            rebuilt: Dict[Optional[Node], float] = {}
+            for coef, powers in terms:
+                powers.coef *= coef
+                c, rest = self._split_coefficient(self._build_product(powers))
+                rebuilt[rest] = rebuilt.get(rest, 0.0) + c
+            del factors.powers[total]
+            self._collect(self._build_sum(rebuilt), 1.0, factors)
+    
+    def _rest_factors(self, rest: Optional[Node]) -> '_Factors':
+        factors = _Factors()
+        if rest is not None:
+            self._collect(rest, 1.0, factors)
+        return factors
+    
+    def _collect(self, node: Node, exponent: float, factors: '_Factors'):
+        """Agrega node^exponent (exponent entero) a los factores"""
+        if isinstance(node, BinaryOp) and node.op in ('*', '/'):
+            self._collect(node.left, exponent, factors)
+            self._collect(node.right, exponent if node.op == '*' else -exponent, factors)
+        elif isinstance(node, UnaryOp) and node.op == '-':
+            factors.coef *= (-1) ** int(exponent)
+            self._collect(node.operand, exponent, factors)
+        elif isinstance(node, Number) and (node.value != 0 or exponent > 0):
+            factors.coef *= node.value ** exponent
+        elif (isinstance(node, BinaryOp) and node.op == '^'
+              and isinstance(node.right, Number)):
+            power = node.right.value
+            if power == int(power):
+                self._collect(node.left, power * exponent, factors)
+            else:
+                # (x^0.5)^2 y x^(1/3)*x^(2/3) no valen x si x < 0: la potencia
+                # fraccionaria es una base más y sus exponentes no se suman
+                factors.add(node, exponent)
+        else:
+            factors.add(node, exponent)
+    
+    def _build_product(self, factors: '_Factors') -> Node:
+        coef = factors.coef
+        items = [(base, exp) for base, exp in factors.powers.items() if exp != 0]
+        if coef == 0 or not items:
+            return self.dag.number(coef)
+        
+        items.sort(key=lambda item: (_factor_rank(item[0]),) + self._order_key(item[0]))
+        numerator = [self._power(base, exp) for base, exp in items if exp > 0]
+        denominator = [self._power(base, -exp) for base, exp in items if exp < 0]
+        
+        result = self._chain(numerator) if numerator else None
+        if denominator:
+            result = self.dag.binary('/', result or self.dag.number(1),
+                                     self._chain(denominator))
+        
+        if result is None:
+            return self.dag.number(coef)
+        return self._scale(coef, result)
+    
+    def _chain(self, factors: List[Node]) -> Node:
+        """a*(b*(c*...)): el árbol anidado a derecha se imprime como a*b*c"""
+        result = factors[-1]
+        for factor in reversed(factors[:-1]):
+            result = self.dag.binary('*', factor, result)
+        return result
+    
+    def _power(self, base: Node, exponent: float) -> Node:
+        if exponent == 1:
+            return base
+        return self.dag.binary('^', base, self.dag.number(exponent))
+    
+    # Potencias, funciones y el resto de los operadores
+    
+    def _simplify_power(self, node: BinaryOp) -> Node:
+        base = self._simplify(node.left)
+        exponent = self._simplify(node.right)
+        
+        if _is_number(exponent, 0) or _is_number(base, 1):
+            return self.dag.number(1)
+        if _is_number(exponent, 1):
+            return base
+        
+        if isinstance(exponent, Number):
+            if isinstance(base, Number):
+                value = _fold(lambda: base.value ** exponent.value)
+                if value is not None:
+                    return self.dag.number(value)
+            if exponent.value == int(exponent.value):
+                factors = _Factors()
+                self._collect(base, exponent.value, factors)
+                return self._build_product(factors)
+        
+        return self.dag.binary('^', base, exponent)
+    
+    def _simplify_function(self, node: FunctionCall) -> Node:
+        arg = self._simplify(node.arg)
+        
+        if node.name == 'ln' and isinstance(arg, Constant) and arg.name == 'e':
+            return self.dag.number(1)
+        if node.name == 'ln' and isinstance(arg, FunctionCall) and arg.name == 'exp':
+            # ln(exp(u)) = u para todo u real (exp(ln(u)) solo vale si u > 0)
+            return arg.arg
+        if node.name == 'abs' and isinstance(arg, Number):
+            return self.dag.number(abs(arg.value))
+        if isinstance(arg, Number):
+            value = _fold(lambda: _FOLDABLE[node.name](arg.value))
+            # Solo se pliegan los resultados exactos (sqrt(4), exp(0), ln(1))
+            if value is not None and value == int(value):
+                return self.dag.number(value)
+        
+        return self.dag.call(node.name, arg)
+    
+    def _simplify_factorial(self, node: UnaryOp) -> Node:
+        operand = self._simplify(node.operand)
+        if (isinstance(operand, Number) and operand.value == int(operand.value)
+                and 0 <= operand.value <= 20):
+            return self.dag.number(math.factorial(int(operand.value)))
+        return self.dag.unary('!', operand)
+    
+    def _simplify_mod(self, node: BinaryOp) -> Node:
+        left = self._simplify(node.left)
+        right = self._simplify(node.right)
+        if isinstance(left, Number) and isinstance(right, Number) and right.value != 0:
+            return self.dag.number(left.value % right.value)
+        return self.dag.binary('%', left, right)
+    
+    def _order_key(self, node: Node) -> tuple:
+        """
+        Clave de orden canónico: (tamaño, texto)
+        
+        Los árboles grandes usan un resumen estructural en lugar del texto,
+        que en un DAG con subexpresiones compartidas puede ser enorme.
+        """
+        stack = [node]
+        while stack:
+            current = stack[-1]
+            if current in self._keys:
+                stack.pop()
+                continue
+            pending = [c for c in current.children if c not in self._keys]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            
+            children = [self._keys[c] for c in current.children]
+            size = 1 + sum(child[0] for child in children)
+            label = f"{type(current).__name__}:{_label(current)}"
+            digest = hashlib.md5(
+                '|'.join([label] + [child[2] for child in children]).encode()).hexdigest()
+            text = str(current) if size <= _TEXT_KEY_SIZE else digest
+            self._keys[current] = (size, text, digest)
+        
+        size, text, _ = self._keys[node]
+        return size, text
+
+
+class _Factors:
+    """Coeficiente numérico y exponente (entero) acumulado de cada base"""
+    
+    __slots__ = ('coef', 'powers')
+    
+    def __init__(self):
+        self.coef = 1.0
+        self.powers: Dict[Node, float] = {}
+    
+    def add(self, base: Node, exponent: float):
+        self.powers[base] = self.powers.get(base, 0.0) + exponent
+
+
+# Funciones que se pliegan sobre literales (en radianes; solo se aceptan
+# resultados enteros, que coinciden en ambos modos angulares)
+_FOLDABLE = {
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "asin": math.asin,
+    "acos": math.acos,
+    "atan": math.atan,
+    "sqrt": math.sqrt,
+    "cbrt": lambda v: math.copysign(abs(v) ** (1 / 3), v),
+    "abs": abs,
+    "exp": math.exp,
+    "log": math.log10,
+    "ln": math.log
+}
+
+
+# Términos como máximo al distribuir un producto de sumas
+_EXPAND_TERMS = 256
+
+
+# Tamaño máximo de un árbol para ordenarlo por su texto
+_TEXT_KEY_SIZE = 32
+
+
+def _label(node: Node) -> str:
+    """Dato propio del nodo (sin los hijos)"""
+    if isinstance(node, Number):
+        return repr(node.value)
+    if isinstance(node, (Variable, Constant, FunctionCall)):
+        return node.name
+    return node.op
+
+
+def _fold(compute) -> Optional[float]:
+    """Valor de una operación entre literales, o None si no es un real finito"""
+    try:
+        value = compute()
+    except (ValueError, ZeroDivisionError, OverflowError):
+        return None
+    if isinstance(value, complex) or not math.isfinite(value):
+        return None
+    return float(value)
+
+
+def _is_number(node: Node, value: float) -> bool:
+    return isinstance(node, Number) and node.value == value
+
+
+def _is_sum(node: Node) -> bool:
+    return (isinstance(node, BinaryOp) and node.op in ('+', '-')
+            or isinstance(node, UnaryOp) and node.op == '-')
+
+
+def _chain_factors(node: Node) -> List[Node]:
+    """Factores de una cadena de productos a*b*c"""
+    factors = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, BinaryOp) and current.op == '*':
+            stack.append(current.right)
+            stack.append(current.left)
+        else:
+            factors.append(current)
+    return factors
+
+
+def _factor_rank(node: Node) -> int:
+    """Orden de los factores: constantes, potencias de x, funciones y el resto"""
+    if isinstance(node, Constant):
+        return 0
+    if isinstance(node, Variable):
+        return 1
+    if isinstance(node, FunctionCall):
+        return 2
+    return 3
+
+
+def _leading_degree(node: Node) -> float:
+    """Grado en x del primer factor de un término (0 si no es una potencia de x)"""
+    while isinstance(node, BinaryOp) and node.op in ('*', '/'):
+        node = node.left
+    if isinstance(node, Variable):
+        return 1.0
+    if (isinstance(node, BinaryOp) and node.op == '^' and isinstance(node.left, Variable)
+            and isinstance(node.right, Number)):
+        return node.right.value
+    return 0.0
+
+
+def _dag_size(node: Node) -> int:
+    """Cantidad de nodos distintos alcanzables desde node"""
+    seen = set()
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        stack.extend(current.children)
+    return len(seen)
@@ -0,0 +1,171 @@
+"""
+Muestreo por tramos para vistas con zoom y desplazamiento
+El eje x se divide en tramos de ancho 2^nivel; cada tramo se muestrea una vez
+y queda en una caché LRU, así que al mover la vista solo se evalúa lo nuevo
+"""
+
+import math
+import numpy as np
+from typing import Any, Callable, Hashable, List, Sequence, Tuple
+
+from .cache import LRUCache
+from .sampling import AdaptiveSampler, visible_range
+
+
+class TileSampler:
+    """Muestreador de curvas por tramos alineados, con caché por intervalo"""
+    
+    def __init__(self, maxsize: int = 512, tile_pixels: int = 128):
+        """
+        Args:
+            maxsize: Máximo de tramos guardados
+            tile_pixels: Ancho aproximado de un tramo en pixeles (fija la densidad:
+                         hasta dos evaluaciones por pixel dentro de cada tramo)
+        """
+        if tile_pixels < 8:
+            raise ValueError("Un tramo debe ocupar al menos 8 pixeles")
+        
+        self.cache = LRUCache(maxsize)
+        self.tile_pixels = tile_pixels
+        self.sampler = AdaptiveSampler(initial_points=tile_pixels // 4 + 1,
+                                       max_points=2 * tile_pixels)
+        self.evaluations = 0
+        self.y_range = (-1.0, 1.0)
+    
+    def level(self, x_min: float, x_max: float, pixels: int) -> int:
+        """Nivel de los tramos: el mayor ancho 2^nivel que no pasa de tile_pixels pixeles"""
+        width = (x_max - x_min) * self.tile_pixels / max(pixels, 1)
+        return math.floor(math.log2(width))
+    
+    def sample(self, key: Hashable, func: Callable[[np.ndarray], np.ndarray],
+               x_min: float, x_max: float, pixels: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Muestrea func sobre los tramos que cubren [x_min, x_max]
+        
+        Args:
+            key: Identifica la curva (expresión, modo angular...) en la caché
+            func: Función vectorizada, como en AdaptiveSampler.sample
+            x_min, x_max: Vista actual
+            pixels: Ancho de la vista en pixeles
+        
+        Returns:
+            (x_values, y_values) de todos los tramos unidos (pueden pasarse un poco
+            de la vista). self.evaluations cuenta solo las evaluaciones nuevas y
+            self.y_range queda con el rango visible sugerido
+        """
+        return self.sample_many([key], [func], x_min, x_max, pixels)[0]
+    
+    def sample_many(self, keys: Sequence[Hashable], funcs: Sequence[Callable],
+                    x_min: float, x_max: float, pixels: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Muestrea varias curvas a la vez sobre la vista
+        
+        Las curvas a las que les falta un tramo se muestrean juntas, en una sola
+        pasada sobre una grilla x compartida; las que ya lo tienen no se evalúan.
+        
+        Returns:
+            Un (x_values, y_values) por curva, en el orden de keys
+        """
+        self.evaluations = 0
+        pieces: List[List[Tuple[np.ndarray, np.ndarray]]] = [[] for _ in keys]
+        for level, index, start, stop in self.tiles(x_min, x_max, pixels):
+            tiles = [self.cache.get((key, level, index)) for key in keys]
+            missing = [i for i, tile in enumerate(tiles) if tile is None]
+            if missing:
+                sampled = self._sample_tile([funcs[i] for i in missing], start, stop)
+                for i, tile in zip(missing, sampled):
+                    tiles[i] = tile
+                    self.cache.put((keys[i], level, index), tile)
+            
+            # Tramos vecinos comparten el extremo: se toma una sola vez
+            for piece, (x, y) in zip(pieces, tiles):
+                if piece:
+                    x, y = x[1:], y[..., 1:]
+                piece.append((x, y))
+        
+        results = []
+        ranges = []
+        for piece in pieces:
+            x = np.concatenate([x for x, _ in piece])
+            y = np.concatenate([y for _, y in piece], axis=-1)
+            results.append((x, y))
+            ranges.append(self._visible_range(x, y, x_min, x_max))
+        
+        self.y_range = (min(low for low, _ in ranges), max(high for _, high in ranges))
+        return results
+    
+    def tiles(self, x_min: float, x_max: float,
+              pixels: int) -> List[Tuple[int, int, float, float]]:
+        """
+        Tramos que cubren [x_min, x_max]
+        
+        Returns:
+            (nivel, índice, inicio, fin) de cada tramo, de izquierda a derecha
+        """
+        if not x_min < x_max:
+            raise ValueError("La vista debe tener ancho positivo")
+        
+        level = self.level(x_min, x_max, pixels)
+        width = 2.0 ** level
+        first, last = math.floor(x_min / width), math.ceil(x_max / width)
+        return [(level, index, index * width, (index + 1) * width)
+                for index in range(first, max(last, first + 1))]
+    
+    def map_tiles(self, key: Hashable, func: Callable[[float, float], Any],
+                  x_min: float, x_max: float, pixels: int) -> list:
+        """
+        Aplica func(inicio, fin) a cada tramo de la vista, con la misma caché
+        
+        Sirve para lo que se calcula por intervalo y no por punto (raíces,
+        extremos...): al mover la vista solo se calculan los tramos nuevos.
+        
+        Returns:
+            Resultado de func en cada tramo, de izquierda a derecha
+        """
+        results = []
+        for level, index, start, stop in self.tiles(x_min, x_max, pixels):
+            result = self.cache.get((key, level, index))
+            if result is None:
+                result = func(start, stop)
+                self.cache.put((key, level, index), result)
+            results.append(result)
+        return results
+    
+    def _sample_tile(self, funcs: List[Callable], x_min: float,
+                     x_max: float) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Muestrea un tramo de todas las funciones juntas y separa sus filas"""
+        shapes = []
+        
+        def joint(x):
+            rows = [np.asarray(func(x), dtype=float) for func in funcs]
+            shapes[:] = [row.shape for row in rows]
+            return np.vstack(rows)
+        
+        x, y = self.sampler.sample(joint, x_min, x_max)
+        self.evaluations += self.sampler.evaluations
+        
+        # Cada función recupera sus filas (una sola queda como vector, como en sample)
+        tiles = []
+        start = 0
+        y = np.atleast_2d(y)
+        for shape in shapes:
+            if len(shape) == 1:
+                tiles.append((x, y[start]))
+                start += 1
+            else:
+                tiles.append((x, y[start:start + shape[0]]))
+                start += shape[0]
+        return tiles
+    
+    @staticmethod
+    def _visible_range(x: np.ndarray, y: np.ndarray, x_min: float,
+                       x_max: float) -> Tuple[float, float]:
+        """
+        Rango visible medido sobre una grilla uniforme de la vista
+        
+        Los puntos refinados se concentran cerca de los polos e inflarían el rango.
+        """
+        index = np.searchsorted(x, np.linspace(x_min, x_max, 257))
+        index = np.clip(index, 0, len(x) - 1)
+        views = [visible_range(row[index]) for row in np.atleast_2d(y)]
+        return min(low for low, _ in views), max(high for _, high in views)
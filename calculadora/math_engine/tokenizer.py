@@ -0,0 +1,159 @@
+"""
+Tokenizador de expresiones matemáticas
+Recorre el texto una sola vez y produce tokens con su posición; los tokens
+de cada texto quedan en caché para el parser, el evaluador y las derivadas
+"""
+
+from typing import List, NamedTuple, Tuple
+
+from .nodes import FUNCTIONS, CONSTANTS
+from .cache import LRUCache
+
+
+# Tipos de token
+NUMBER = 'number'
+NAME = 'name'
+OP = 'op'
+LPAREN = '('
+RPAREN = ')'
+END = 'end'
+
+# Símbolos alternativos que se aceptan en la entrada
+_ALIASES = {
+    '×': '*',
+    '·': '*',
+    '÷': '/',
+    '−': '-',
+}
+
+_OPERATORS = set('+-*/^%!')
+
+# Identificadores reconocidos, los más largos primero para que 'asin' gane a 'sin'
+_IDENTIFIERS = sorted(set(FUNCTIONS) | set(CONSTANTS) | {'x'}, key=len, reverse=True)
+
+# Tokens ya calculados por texto de entrada
+_TOKENS = LRUCache(256)
+
+
+class Token(NamedTuple):
+    """Token con su tipo, texto y posición en la expresión original"""
+    kind: str
+    value: str
+    position: int
+
+
+def tokenize(text: str) -> Tuple[Token, ...]:
+    """
+    Divide una expresión en tokens (con caché por texto)
+    
+    Args:
+        text: Expresión (ej: "3x^2 + sin(2x)")
+    
+    Returns:
+        Tupla de tokens terminada en un token END
+    """
+    tokens = _TOKENS.get(text)
+    if tokens is None:
+        tokens = tuple(_scan(text))
+        _TOKENS.put(text, tokens)
+    return tokens
+
+
+def canonical_text(text: str) -> str:
+    """
+    Texto normalizado de una expresión, reconstruido desde sus tokens
+    
+    Espacios, alias (×, ÷, **), mayúsculas y π no cambian el resultado, así
+    que sirve como clave de caché. Solo se deja un espacio entre números y
+    nombres contiguos, donde pegarlos cambiaría el significado (2 e 3).
+    """
+    parts = []
+    previous = None
+    for token in tokenize(text)[:-1]:
+        if previous in (NUMBER, NAME) and token.kind in (NUMBER, NAME):
+            parts.append(' ')
+        parts.append(token.value)
+        previous = token.kind
+    return ''.join(parts)
+
+
+def _scan(text: str) -> List[Token]:
+    """Recorre el texto una vez y arma la lista de tokens"""
+    tokens = []
+    i = 0
+    n = len(text)
+    
+    while i < n:
+        char = _ALIASES.get(text[i], text[i])
+        
+        if char.isspace():
+            i += 1
+            continue
+        
+        # Números: 12, 3.5, .5, 1e-3
+        if char.isdigit() or (char == '.' and i + 1 < n and text[i + 1].isdigit()):
+            start = i
+            while i < n and text[i].isdigit():
+                i += 1
+            if i < n and text[i] == '.':
+                i += 1
+                while i < n and text[i].isdigit():
+                    i += 1
+            # Notación científica solo si sigue un dígito (2e^x es 2*e^x)
+            if i < n and text[i] in 'eE':
+                j = i + 1
+                if j < n and text[j] in '+-':
+                    j += 1
+                if j < n and text[j].isdigit():
+                    i = j
+                    while i < n and text[i].isdigit():
+                        i += 1
+            tokens.append(Token(NUMBER, text[start:i], start))
+            continue
+        
+        # Identificadores: funciones, constantes y la variable x
+        if char.isalpha() and char != 'π':
+            start = i
+            while i < n and text[i].isalpha() and text[i] != 'π':
+                i += 1
+            tokens.extend(_split_identifiers(text[start:i].lower(), start))
+            continue
+        
+        if char == 'π':
+            tokens.append(Token(NAME, 'pi', i))
+            i += 1
+            continue
+        
+        # '**' es sinónimo de '^'
+        if char == '*' and i + 1 < n and text[i + 1] == '*':
+            tokens.append(Token(OP, '^', i))
+            i += 2
+            continue
+        
+        if char in _OPERATORS:
+            tokens.append(Token(OP, char, i))
+        elif char == '(':
+            tokens.append(Token(LPAREN, char, i))
+        elif char == ')':
+            tokens.append(Token(RPAREN, char, i))
+        else:
+            raise ValueError(f"Carácter inválido '{text[i]}' en la posición {i + 1}")
+        i += 1
+    
+    tokens.append(Token(END, '', n))
+    return tokens
+
+
+def _split_identifiers(word: str, position: int) -> List[Token]:
+    """Separa una secuencia de letras en identificadores conocidos (2xsin -> x, sin)"""
+    tokens = []
+    i = 0
+    while i < len(word):
+        for name in _IDENTIFIERS:
+            if word.startswith(name, i):
+                tokens.append(Token(NAME, name, position + i))
+                i += len(name)
+                break
+        else:
+            raise ValueError(f"Símbolo desconocido '{word[i:]}' en la posición {position + i + 1}")
+    return tokens
@@ -0,0 +1,84 @@
+"""
+Pruebas del compilador de expresiones
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import math
+import numpy as np
+import pytest
+
+from math_engine import ExpressionEvaluator
+from math_engine.compiler import MATH_FUNCTIONS, build_function, to_python_source
+from math_engine.parser import parse_expression
+
+
+def test_precedencia_sin_parentesis_de_sobra():
+    assert to_python_source(parse_expression('-x^2')) == '-x ** 2.0'
+    assert to_python_source(parse_expression('(-2)^x')) == '(-2.0) ** x'
+    assert to_python_source(parse_expression('x - (x - 1)')) == 'x - (x - 1.0)'
+    assert to_python_source(parse_expression('x/(2*x)')) == 'x / (2.0 * x)'
+
+
+def test_mismo_resultado_que_python():
+    cases = {
+        '2^3^x': lambda x: 2 ** 3 ** x,
+        'x - (x - 1) - 3': lambda x: x - (x - 1) - 3,
+        'x/2*3': lambda x: x / 2 * 3,
+        '-(x + 1)*3 % 5': lambda x: (-(x + 1) * 3) % 5,
+    }
+    for expression, expected in cases.items():
+        f = build_function(parse_expression(expression), MATH_FUNCTIONS)
+        assert f(1.5) == expected(1.5)
+
+
+def test_suma_de_500_terminos():
+    evaluator = ExpressionEvaluator()
+    evaluator.set_angle_mode('rad')
+    compiled = evaluator.compile(' + '.join(['sin(x)'] * 500))
+    
+    expected = 0.0
+    for _ in range(500):
+        expected += math.sin(1.0)
+    assert compiled(1.0) == expected
+    assert compiled.evaluate_array(np.array([0.0, 1.0]))[1] == expected
+
+
+def test_resta_larga_respeta_el_orden():
+    f = build_function(parse_expression(' - '.join(['x'] * 500)), MATH_FUNCTIONS)
+    assert f(1.0) == -498.0
+
+
+def test_anidamiento_excesivo_es_value_error():
+    evaluator = ExpressionEvaluator()
+    with pytest.raises(ValueError):
+        evaluator.compile('(' * 1000 + 'x' + ')' * 1000)
+    with pytest.raises(ValueError):
+        evaluator.compile('/'.join(['x'] * 5000))(2.0)
+
+
+def test_compilacion_perezosa():
+    compiled = ExpressionEvaluator().compile('3x^2 + 2x + 1')
+    assert compiled.coefficients is not None
+    compiled.evaluate_array(np.linspace(0, 1, 5))
+    assert compiled._vector is None and compiled._scalar is None
+    assert compiled(2.0) == 17.0
+    assert compiled._scalar is not None
+
+
+def test_potencias_complejas_fuera_del_dominio():
+    evaluator = ExpressionEvaluator()
+    compiled = evaluator.compile('(-8)^(1/3)+x')
+    assert np.isnan(compiled.evaluate_array([1.0, 2.0])).all()
+    y_values, dy_values = compiled.evaluate_with_derivative(np.array([1.0, 2.0]))
+    assert np.isnan(y_values).all() and np.isnan(dy_values).all()
+    
+    root = evaluator.compile('(-1)^0.5')
+    assert np.isnan(root.evaluate_array([0.0])).all()
+    # El escalar da el mismo error de dominio en vez de un complejo
+    for expression, x_value in (('(-8)^(1/3)+x', 1.0), ('(-1)^0.5', None), ('x^0.5', -4.0)):
+        with pytest.raises(ValueError):
+            evaluator.compile(expression)(x_value)
+    assert evaluator.compile('x^0.5')(4.0) == 2.0
@@ -0,0 +1,60 @@
+"""
+Pruebas del motor de derivadas
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from math_engine import DerivativeEngine, ExpressionEvaluator, Simplifier
+from math_engine.parser import parse_expression
+
+
+def test_arboles_profundos_se_comparan_sin_recursion():
+    first = parse_expression('+'.join(['sin(x)'] * 2000))
+    second = parse_expression(' + '.join(['sin(x)'] * 2000))
+    assert first is not second
+    assert first == second
+    assert hash(first) == hash(second)
+    assert str(first) == str(second)
+
+
+def test_derivada_de_una_suma_de_500_terminos():
+    engine = DerivativeEngine()
+    assert engine.derive('+'.join(['sin(x)'] * 500)) == '500*cos(x)'
+    
+    terms = ' + '.join(f'x^{k}' for k in range(2, 502))
+    derivative = engine.derive(terms)
+    assert derivative.startswith('501*x^500 + 500*x^499')
+    assert derivative.endswith('3*x^2 + 2*x')
+
+
+def test_derivadas_sucesivas_crecen_polinomialmente():
+    engine = DerivativeEngine()
+    for expression in ('x/(x^2+1)', 'e^x/x', 'tan(x)', 'sqrt(1+x^2)', '1/(1+e^-x)'):
+        sizes = [len(text) for text in engine.derive_n(expression, 12)]
+        # Crecimiento a lo sumo cuadrático: exponencial daría cientos de miles
+        assert sizes[-1] < 40 * len(sizes) ** 2, (expression, sizes)
+
+
+def test_cociente_sobre_el_denominador_existente():
+    engine = DerivativeEngine()
+    tower = engine.derive_n('e^x/x', 6)
+    assert tower[6].endswith('/x^7')
+    assert 'x^32' not in tower[6]
+    assert engine.derive_n('x/(x^2+1)', 2)[2] == '(2*x^3 - 6*x)/(x^2 + 1)^3'
+
+
+def test_simplificar_conserva_el_dominio_de_las_potencias_fraccionarias():
+    simplifier = Simplifier()
+    evaluator = ExpressionEvaluator()
+    for expression in ('(x^0.5)^2', 'x^(1/3)*x^(2/3)', 'x^1.5*x^0.5'):
+        simplified = str(simplifier.simplify(parse_expression(expression)))
+        assert simplified not in ('x', 'x^2')
+        values = evaluator.compile(simplified).evaluate_array([-8.0, 8.0])
+        assert np.isnan(values[0]) and not np.isnan(values[1])
+    
+    # Con exponentes enteros sí se agrupa
+    assert str(simplifier.simplify(parse_expression('(x^2)^3*x'))) == 'x^7'
@@ -0,0 +1,74 @@
+"""
+Pruebas de los cálculos de la ventana de gráficas (sin abrir Tk)
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import math
+import numpy as np
+import pytest
+
+from math_engine import ExpressionEvaluator
+from ui.graph_window import GraphWindow
+from utils.constants import GRAPH_WINDOW_WIDTH
+
+
+def graph_window(angle_mode: str) -> GraphWindow:
+    """Ventana con sus motores pero sin widgets"""
+    window = GraphWindow.__new__(GraphWindow)
+    window.setup_engines(angle_mode)
+    window.pixels = GRAPH_WINDOW_WIDTH
+    window.layers = []
+    window.replot = None
+    return window
+
+
+def test_taylor_en_radianes():
+    window = graph_window('rad')
+    data = window.compute_taylor('sin(x)', 3)
+    assert data.result == pytest.approx([0.0, 1.0, 0.0, -1 / 6], abs=1e-12)
+
+
+def test_cambiar_el_modo_angular_llega_a_la_grafica():
+    window = graph_window('deg')
+    degrees = window.compute_taylor('sin(x)', 1).result
+    assert degrees[1] == pytest.approx(math.pi / 180)
+    
+    window.set_angle_mode('rad')
+    assert window.compute_taylor('sin(x)', 1).result[1] == pytest.approx(1.0)
+
+
+def test_integral_en_radianes():
+    window = graph_window('rad')
+    data = window.compute_integral('sin(x)', 0, math.pi)
+    assert data.result.value == pytest.approx(2.0, rel=1e-10)
+    
+    # La caché de integrales distingue el modo angular
+    window.set_angle_mode('deg')
+    assert window.compute_integral('sin(x)', 0, math.pi).result.value == pytest.approx(
+        (180 / math.pi) * (1 - math.cos(math.pi * math.pi / 180)), rel=1e-10)
+
+
+def test_raices_y_muestras_en_radianes():
+    window = graph_window('rad')
+    data = window.compute_function('sin(x)', False)
+    roots = data.markers[0].x
+    assert roots == pytest.approx([-3 * math.pi, -2 * math.pi, -math.pi, 0.0,
+                                   math.pi, 2 * math.pi, 3 * math.pi], abs=1e-9)
+    assert max(data.curves[0].y) == pytest.approx(1.0, abs=1e-3)
+
+
+def test_derivada_numerica_coincide_con_la_grafica():
+    # f'(0) del display (evaluador de la calculadora) y la curva f' de la gráfica
+    evaluator = ExpressionEvaluator()
+    evaluator.set_angle_mode('rad')
+    slope = evaluator.compile('sin(x)').numeric_derivative([0.0])[0]
+    
+    data = graph_window('rad').compute_function('sin(x)', True)
+    x_vals, y_vals_d = data.curves[1].x, data.curves[1].y
+    origin = np.argmin(np.abs(x_vals))
+    assert slope == pytest.approx(1.0, rel=1e-6)
+    assert y_vals_d[origin] == pytest.approx(math.cos(x_vals[origin]), rel=1e-10)
+    assert y_vals_d[origin] == pytest.approx(slope, abs=1e-3)
@@ -0,0 +1,53 @@
+"""
+Pruebas de la integración adaptativa
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import math
+import numpy as np
+import pytest
+
+from math_engine import Integrator
+
+
+@pytest.fixture
+def integrator():
+    integrator = Integrator()
+    integrator.evaluator.set_angle_mode('rad')
+    return integrator
+
+
+def test_integral_suave(integrator):
+    result = integrator.integrate('sin(x)', 0, math.pi)
+    assert result.value == pytest.approx(2.0, rel=1e-12)
+
+
+def test_singularidad_integrable_en_el_extremo(integrator):
+    assert integrator.integrate('1/sqrt(x)', 0, 1).value == pytest.approx(2.0, rel=1e-10)
+    assert integrator.integrate('x^-0.9', 0, 1).value == pytest.approx(10.0, rel=1e-9)
+
+
+def test_polo_dentro_del_intervalo_es_error(integrator):
+    with pytest.raises(ValueError):
+        integrator.integrate('1/x', -1, 2)
+    with pytest.raises(ValueError):
+        integrator.integrate('tan(x)', 0, 3)
+
+
+def test_presupuesto_agotado_es_error():
+    integrator = Integrator(max_intervals=20)
+    integrator.evaluator.set_angle_mode('rad')
+    with pytest.raises(ValueError):
+        integrator.integrate('sin(1/x)', 0.001, 1)
+
+
+def test_acumulada_es_nan_despues_del_polo(integrator):
+    x, F = integrator.cumulative('1/x', 1, -10, 12)
+    assert F[0] == 0.0
+    assert np.isnan(F[x <= 0]).all()
+    
+    x, F = integrator.cumulative('1/x', 1, 10, 10)
+    assert F[-1] == pytest.approx(math.log(10), rel=1e-10)
@@ -0,0 +1,34 @@
+"""
+Pruebas de las raíces de polinomios
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from math_engine import Polynomial
+
+
+def test_raices_de_un_polinomio_denso():
+    roots = Polynomial([6, -5, 1]).real_roots()
+    assert roots == pytest.approx([2.0, 3.0])
+
+
+def test_polinomio_disperso_de_grado_alto():
+    # x^100000 + x^5 = x^5·(y + 1) con y = x^99995
+    roots = Polynomial.from_terms({100000: 1.0, 5: 1.0}).roots()
+    assert len(roots) == 100000
+    assert np.count_nonzero(roots == 0) == 5
+    assert np.abs(roots[roots != 0] ** 99995 + 1).max() < 1e-9
+    assert Polynomial.from_terms({100000: 1.0, 5: 1.0}).real_roots() == pytest.approx([-1.0, 0.0])
+
+
+def test_raices_de_x_a_la_k_reducida():
+    roots = Polynomial.from_terms({6: 1.0, 3: -9.0, 0: 8.0}).real_roots()
+    assert roots == pytest.approx([1.0, 2.0])
+    
+    with pytest.raises(ValueError):
+        Polynomial.from_terms({4001: 1.0, 0: 1.0, 1: 1.0}).roots()
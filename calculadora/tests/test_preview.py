@@ -0,0 +1,45 @@
+"""
+Pruebas del hilo de vista previa
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+
+from ui.preview import PreviewWorker
+
+
+def wait_result(worker: PreviewWorker, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = worker.poll()
+        if result is not None:
+            return result
+        time.sleep(0.01)
+    raise AssertionError("El hilo de vista previa no respondió")
+
+
+def test_un_error_inesperado_no_mata_el_hilo():
+    worker = PreviewWorker()
+    compile_expression = worker.evaluator.compile
+    
+    def failing_compile(text):
+        if text == 'falla':
+            raise RuntimeError("error interno")
+        return compile_expression(text)
+    
+    worker.evaluator.compile = failing_compile
+    try:
+        worker.submit('falla', 'rad', 100, 40)
+        result = wait_result(worker)
+        assert result.error == "error interno"
+        
+        worker.submit('x^2', 'rad', 100, 40)
+        result = wait_result(worker)
+        assert result.error is None
+        assert list(result.probes) == [1.0, 0.0, 1.0]
+        assert worker._thread.is_alive()
+    finally:
+        worker.stop()
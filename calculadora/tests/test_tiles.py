@@ -0,0 +1,40 @@
+"""
+Pruebas del muestreo por tramos
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from math_engine import TileSampler
+
+
+def test_desplazar_la_vista_solo_muestrea_tramos_nuevos():
+    tiles = TileSampler()
+    tiles.sample('f', np.sin, -10.0, 10.0, 800)
+    first = tiles.evaluations
+    tiles.sample('f', np.sin, -10.0, 10.0, 800)
+    assert tiles.evaluations == 0
+    tiles.sample('f', np.sin, -5.0, 15.0, 800)
+    assert 0 < tiles.evaluations < first
+
+
+def test_map_tiles_calcula_cada_tramo_una_vez():
+    tiles = TileSampler()
+    calls = []
+    
+    def width(start, stop):
+        calls.append((start, stop))
+        return stop - start
+    
+    widths = tiles.map_tiles('roots', width, -10.0, 10.0, 800)
+    assert len(calls) == len(widths) == len(tiles.tiles(-10.0, 10.0, 800))
+    
+    calls.clear()
+    tiles.map_tiles('roots', width, -5.0, 15.0, 800)
+    seen = {(start, stop) for _, _, start, stop in tiles.tiles(-10.0, 10.0, 800)}
+    new = [(start, stop) for _, _, start, stop in tiles.tiles(-5.0, 15.0, 800)
+           if (start, stop) not in seen]
+    assert calls == new and len(new) > 0
@@ -3,7 +3,7 @@ Ventana principal de la calculadora científica
 """
 
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, simpledialog
 import math
 import sys
 import os
@@ -11,9 +11,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from ui.widgets import RoundedButton, FunctionInputPanel
 from ui.graph_window import GraphWindow
-from math_engine import DerivativeEngine, ExpressionParser, ExpressionEvaluator
-from utils import COLORS, PI, E, format_expression
-from utils.constants import WINDOW_WIDTH, WINDOW_HEIGHT
+from ui.tasks import TaskExecutor
+from math_engine import DerivativeEngine, ExpressionParser, ExpressionEvaluator, RootFinder
+from utils import COLORS, PI, E, format_expression, format_polynomial
+from utils.constants import WINDOW_WIDTH, WINDOW_HEIGHT, SOLVE_X_MIN, SOLVE_X_MAX
 
 
 class ScientificCalculator:
@@ -30,6 +31,7 @@ class ScientificCalculator:
         self.derivative_engine = DerivativeEngine()
         self.parser = ExpressionParser()
         self.evaluator = ExpressionEvaluator()
+        self.root_finder = RootFinder(self.evaluator, samples=20001)
         
         # Variables
         self.current_input = ""
@@ -39,7 +41,11 @@ class ScientificCalculator:
         self.memory = 0
         self.graph_window = None
         
+        # Derivadas y gráficas se calculan fuera del hilo de Tk
+        self.tasks = TaskExecutor(self.root, on_busy=self.set_busy)
+        
         self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
     
     def setup_ui(self):
         """Configura la interfaz de usuario"""
@@ -104,6 +110,15 @@ class ScientificCalculator:
         )
         self.angle_indicator.pack(side=tk.LEFT)
         
+        self.busy_indicator = tk.Label(
+            indicators,
+            text="",
+            font=("Consolas", 9, "bold"),
+            bg=COLORS['display_bg'],
+            fg=COLORS['accent_yellow']
+        )
+        self.busy_indicator.pack(side=tk.LEFT, padx=10)
+        
         # Display secundario
         self.history_display = tk.Label(
             display_frame,
@@ -249,7 +264,8 @@ class ScientificCalculator:
              ('!', COLORS['button_func'])],
             [('±', COLORS['button_func']), ('0', COLORS['button_num']), 
              ('.', COLORS['button_num']), ('+', COLORS['button_op']), 
-             ('=', COLORS['accent_green'])]
+             ('=', COLORS['accent_green'])],
+            [('x', COLORS['accent_yellow']), ('SOLVE', COLORS['accent_purple'])]
         ]
         
         for row in buttons:
@@ -278,7 +294,10 @@ class ScientificCalculator:
             self.keyboard_frame,
             on_derive_callback=self.derive_function,
             on_graph_callback=self.graph_function,
-            colors=COLORS
+            colors=COLORS,
+            on_taylor_callback=self.taylor_function,
+            on_integrate_callback=self.integrate_function,
+            angle_mode=self.angle_mode
         )
         self.function_panel.pack(fill=tk.BOTH, expand=True)
     
@@ -290,6 +309,8 @@ class ScientificCalculator:
             self.backspace()
         elif text == '=':
             self.calculate()
+        elif text == 'SOLVE':
+            self.solve()
         elif text == '±':
             self.toggle_sign()
         elif text == 'DEG':
@@ -328,15 +349,18 @@ class ScientificCalculator:
             self.append_to_input(text)
     
     def toggle_angle_mode(self):
-        """Cambia entre grados y radianes"""
+        """Cambia entre grados y radianes (también en la ventana de gráficas)"""
         if self.angle_mode.get() == 'deg':
             self.angle_mode.set('rad')
             self.angle_indicator.config(text='RAD')
-            self.evaluator.angle_mode = 'rad'
+            self.evaluator.set_angle_mode('rad')
         else:
             self.angle_mode.set('deg')
             self.angle_indicator.config(text='DEG')
-            self.evaluator.angle_mode = 'deg'
+            self.evaluator.set_angle_mode('deg')
+        
+        if self.graph_window is not None and self.graph_window.winfo_exists():
+            self.graph_window.set_angle_mode(self.angle_mode.get())
     
     def append_to_input(self, text):
         """Añade texto al input"""
@@ -400,16 +424,52 @@ class ScientificCalculator:
             messagebox.showerror("Error", f"Expresión inválida:\n{str(e)}")
             self.clear()
     
-    def derive_function(self):
-        """Deriva la función ingresada"""
+    def solve(self):
+        """Resuelve expresión = 0 para x (modo SOLVE)"""
+        if not self.current_input:
+            return
+        
         try:
-            function = self.function_panel.get_function()
-            if not function:
-                messagebox.showwarning("Advertencia", "Ingresa una función primero")
+            roots = self.root_finder.find_roots(self.current_input, SOLVE_X_MIN, SOLVE_X_MAX)
+            
+            self.history_display.config(text=f"{format_expression(self.current_input)} = 0")
+            if len(roots) == 0:
+                messagebox.showinfo("SOLVE", "No se encontraron raíces en "
+                                             f"[{SOLVE_X_MIN}, {SOLVE_X_MAX}]")
                 return
             
-            # Derivar
-            derivative = self.derivative_engine.derive(function)
+            values = [round(float(r), 10) for r in roots]
+            values = [int(v) if v.is_integer() else v for v in values]
+            self.current_input = str(values[0])
+            self.result_shown = True
+            self.main_display.config(text="x = " + "; ".join(str(v) for v in values[:4])
+                                     + (" …" if len(values) > 4 else ""))
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"No se pudo resolver:\n{str(e)}")
+    
+    def derive_function(self):
+        """Deriva la función ingresada (en segundo plano)"""
+        function = self.function_panel.get_function()
+        if not function:
+            messagebox.showwarning("Advertencia", "Ingresa una función primero")
+            return
+        
+        def work():
+            # Los errores de sintaxis se informan antes de intentar derivar
+            compiled = self.evaluator.compile(function)
+            
+            # Sin regla simbólica se recurre a la derivada numérica
+            try:
+                return self.derivative_engine.derive(function), None
+            except ValueError as e:
+                return None, (str(e), compiled.numeric_derivative([0.0])[0])
+        
+        def done(result):
+            derivative, numeric = result
+            if derivative is None:
+                self.show_numeric_derivative(function, *numeric)
+                return
             
             # Mostrar en display
             self.history_display.config(text=f"f(x) = {function}")
@@ -418,25 +478,114 @@ class ScientificCalculator:
             messagebox.showinfo("Derivada", 
                               f"Función original:\nf(x) = {function}\n\n"
                               f"Derivada:\nf'(x) = {derivative}")
-            
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        
+        self.tasks.submit('derive', work, on_done=done,
+                          on_error=lambda e: messagebox.showerror("Error", str(e)))
+    
+    def show_numeric_derivative(self, function: str, reason: str, slope: float):
+        """Muestra f'(x) numérica (gráfica y f'(0)) cuando no hay derivada simbólica"""
+        self.history_display.config(text=f"f(x) = {function}")
+        self.main_display.config(text=f"f'(0) ≈ {slope:.10g}")
+        
+        self.submit_plot(lambda window: window.compute_function(function, True))
+        
+        messagebox.showinfo("Derivada numérica",
+                            f"{reason}\n\nSe grafica f'(x) calculada numéricamente.")
     
     def graph_function(self):
         """Abre ventana de gráfica"""
-        try:
-            function = self.function_panel.get_function()
-            if not function:
-                messagebox.showwarning("Advertencia", "Ingresa una función primero")
-                return
-            
-            # Crear o actualizar ventana de gráfica
-            if self.graph_window is None or not self.graph_window.winfo_exists():
-                self.graph_window = GraphWindow(self.root)
-            
-            self.graph_window.plot_function(function, show_derivative=True)
-            self.graph_window.lift()
-            self.graph_window.focus()
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo graficar:\n{str(e)}")
+        function = self.function_panel.get_function()
+        if not function:
+            messagebox.showwarning("Advertencia", "Ingresa una función primero")
+            return
+        
+        self.submit_plot(lambda window: window.compute_function(function, True),
+                         error_title="No se pudo graficar")
+    
+    def taylor_function(self):
+        """Desarrolla la función en serie de Taylor y grafica el error"""
+        function = self.function_panel.get_function()
+        if not function:
+            messagebox.showwarning("Advertencia", "Ingresa una función primero")
+            return
+        
+        order = simpledialog.askinteger("Serie de Taylor", "Orden del polinomio:",
+                                        initialvalue=4, minvalue=0, maxvalue=30,
+                                        parent=self.root)
+        if order is None:
+            return
+        center = simpledialog.askfloat("Serie de Taylor", "Punto de desarrollo (a):",
+                                       initialvalue=0.0, parent=self.root)
+        if center is None:
+            return
+        
+        def show(data):
+            self.history_display.config(text=f"f(x) = {function}")
+            self.main_display.config(text=f"T{order}(x) = {format_polynomial(data.result)}")
+        
+        self.submit_plot(lambda window: window.compute_taylor(function, order, center), show)
+    
+    def integrate_function(self):
+        """Integral definida de la función y gráfica del área"""
+        function = self.function_panel.get_function()
+        if not function:
+            messagebox.showwarning("Advertencia", "Ingresa una función primero")
+            return
+        
+        a = simpledialog.askfloat("Integral definida", "Límite inferior (a):",
+                                  initialvalue=0.0, parent=self.root)
+        if a is None:
+            return
+        b = simpledialog.askfloat("Integral definida", "Límite superior (b):",
+                                  initialvalue=1.0, parent=self.root)
+        if b is None:
+            return
+        
+        def show(data):
+            result = data.result
+            self.history_display.config(text=f"∫ {function} dx  [{a:g}, {b:g}]")
+            self.main_display.config(text=f"∫ = {result.value:.10g} ± {result.error:.1e}")
+        
+        self.submit_plot(lambda window: window.compute_integral(function, a, b), show)
+    
+    def submit_plot(self, compute, on_done=None, error_title: str = None):
+        """
+        Calcula una gráfica en segundo plano y la dibuja al terminar
+        
+        Un pedido nuevo de gráfica descarta el anterior si todavía no terminó.
+        
+        Args:
+            compute: Función window -> PlotData (corre fuera del hilo de Tk)
+            on_done: Recibe el PlotData antes de dibujar (actualiza el display)
+            error_title: Prefijo del mensaje de error
+        """
+        window = self.get_graph_window()
+        
+        def done(data):
+            if on_done:
+                on_done(data)
+            target = self.get_graph_window()
+            target.draw(data)
+            target.lift()
+            target.focus()
+        
+        def failed(error):
+            message = f"{error_title}:\n{error}" if error_title else str(error)
+            messagebox.showerror("Error", message)
+        
+        self.tasks.submit('graph', compute, window, on_done=done, on_error=failed)
+    
+    def get_graph_window(self) -> GraphWindow:
+        """Ventana de gráficas (se crea de nuevo si el usuario la cerró)"""
+        if self.graph_window is None or not self.graph_window.winfo_exists():
+            self.graph_window = GraphWindow(self.root, self.tasks, self.angle_mode.get())
+        return self.graph_window
+    
+    def set_busy(self, busy: bool):
+        """Indicador de cálculo en curso"""
+        self.busy_indicator.config(text="⏳ CALC" if busy else "")
+    
+    def close(self):
+        """Cancela los cálculos pendientes y cierra la aplicación"""
+        self.tasks.shutdown()
+        self.root.destroy()
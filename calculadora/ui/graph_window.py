@@ -5,28 +5,133 @@ Ventana de gráficas separada
 import tkinter as tk
 from tkinter import Toplevel
 import numpy as np
+from functools import partial
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.ticker import MaxNLocator
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from math_engine import ExpressionEvaluator, DerivativeEngine
-from utils.constants import COLORS, GRAPH_WINDOW_WIDTH, GRAPH_WINDOW_HEIGHT
+from math_engine import ExpressionEvaluator, RootFinder, Integrator, TileSampler, horner
+from math_engine.cache import LRUCache
+from math_engine.sampling import visible_range
+from utils.constants import (COLORS, GRAPH_WINDOW_WIDTH, GRAPH_WINDOW_HEIGHT, GRAPH_X_RANGE,
+                             ZOOM_STEP, VIEW_DEBOUNCE_MS, TILE_PIXELS, TILE_CACHE_SIZE,
+                             INTEGRAL_CACHE_SIZE, LAYER_COLORS, LAYER_STYLES)
+
+
+class Curve(NamedTuple):
+    """Curva a dibujar"""
+    x: np.ndarray
+    y: np.ndarray
+    color: str
+    width: float
+    label: str
+    style: str
+
+
+class Markers(NamedTuple):
+    """Puntos destacados (ceros, centro de Taylor...)"""
+    x: np.ndarray
+    y: np.ndarray
+    symbol: str
+    color: str
+    label: Optional[str]
+
+
+class Fill(NamedTuple):
+    """Región sombreada entre y1 e y2"""
+    x: np.ndarray
+    y1: Any
+    y2: np.ndarray
+    where: np.ndarray
+    color: str
+    alpha: float
+    label: str
+
+
+class PlotData(NamedTuple):
+    """Todo lo que hace falta para dibujar una gráfica, calculado de antemano"""
+    title: str
+    x_range: Tuple[float, float]
+    y_range: Tuple[float, float]
+    curves: List[Curve]
+    markers: List[Markers]
+    fills: List[Fill]
+    result: Any
+    # Recalcula la misma gráfica para otra vista: replot(x_range=...) -> PlotData
+    replot: Optional[Callable[..., 'PlotData']] = None
+
+
+class Layer:
+    """Función agregada a la gráfica, con su estilo y las muestras de la última vista"""
+    
+    def __init__(self, compiled, color: str):
+        self.compiled = compiled
+        self.color = color
+        self.style = LAYER_STYLES[0]
+        self.visible = True
+        # Se conservan al ocultar la capa: mostrarla otra vez no evalúa nada
+        self.x = None
+        self.y = None
+        self.x_range = None
+    
+    @property
+    def expression(self) -> str:
+        return self.compiled.expression
+    
+    @property
+    def key(self) -> tuple:
+        """Clave de sus tramos (la misma que usa f en compute_function)"""
+        return (self.compiled.expression, self.compiled.angle_mode, 'evaluate_array')
+    
+    def curve(self) -> Curve:
+        return Curve(self.x, self.y, self.color, 2.5, self.expression, self.style)
+
+
+def nice_limits(y_min: float, y_max: float) -> Tuple[float, float]:
+    """
+    Agranda [y_min, y_max] hasta marcas redondas de la grilla
+    
+    Funciones de rango parecido comparten límites, y con ellos el fondo guardado.
+    """
+    ticks = MaxNLocator(nbins=8).tick_values(y_min, y_max)
+    return float(ticks[0]), float(ticks[-1])
 
 
 class GraphWindow(Toplevel):
     """Ventana separada para gráficas"""
     
-    def __init__(self, parent):
+    def __init__(self, parent, tasks=None, angle_mode: str = 'deg'):
+        """
+        Args:
+            parent: Ventana principal
+            tasks: TaskExecutor para recalcular al mover la vista (sin él se
+                   recalcula en el hilo de Tk)
+            angle_mode: Modo angular de la calculadora ('deg' o 'rad')
+        """
         super().__init__(parent)
         self.title("📊 Visualización de Funciones")
         self.geometry(f"{GRAPH_WINDOW_WIDTH}x{GRAPH_WINDOW_HEIGHT}")
         self.configure(bg=COLORS['bg_secondary'])
         
-        self.evaluator = ExpressionEvaluator()
-        self.derivative_engine = DerivativeEngine()
+        self.setup_engines(angle_mode)
+        
+        # Vista (zoom y desplazamiento con el mouse)
+        self.tasks = tasks
+        self.replot = None
+        self.pixels = GRAPH_WINDOW_WIDTH
+        self._drag = None
+        self._view_id = None
+        
+        # Capas: funciones extra que se muestran, ocultan y estilan por separado
+        self.layers: List[Layer] = []
+        self.layer_rows: Dict[Layer, tk.Frame] = {}
+        self.data = None
         
         self.setup_ui()
     
@@ -46,104 +151,588 @@ class GraphWindow(Toplevel):
         )
         title.pack(expand=True)
         
+        self.create_layer_panel()
+        
         # Frame para la gráfica
         graph_container = tk.Frame(self, bg=COLORS['bg_secondary'])
         graph_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
         
-        # Crear figura de matplotlib
+        # Crear figura de matplotlib; lo estático (grilla, ejes, marcas) se dibuja
+        # una vez y queda en el fondo guardado
         self.fig = Figure(figsize=(8, 6), facecolor=COLORS['bg_secondary'])
         self.ax = self.fig.add_subplot(111)
-        self.ax.set_facecolor(COLORS['display_bg'])
-        self.ax.grid(True, alpha=0.3, color=COLORS['text_secondary'], linestyle='--')
-        self.ax.set_xlabel('x', color=COLORS['text_primary'], fontsize=12, fontweight='bold')
-        self.ax.set_ylabel('y', color=COLORS['text_primary'], fontsize=12, fontweight='bold')
-        self.ax.tick_params(colors=COLORS['text_primary'], labelsize=10)
+        self._style_axes()
         
-        # Spines
-        for spine in self.ax.spines.values():
-            spine.set_color(COLORS['text_secondary'])
-            spine.set_linewidth(1.5)
+        # Artistas persistentes: se actualizan con set_data y se dibujan con blit
+        self.curve_lines: List[Line2D] = []
+        self.marker_lines: List[Line2D] = []
+        self.fills = []
+        self.legend = None
+        self.ax.title.set_animated(True)
+        self.message = self.ax.text(0.5, 0.5, 'Esperando función para graficar...',
+                                    ha='center', va='center', transform=self.ax.transAxes,
+                                    fontsize=14, color=COLORS['text_secondary'],
+                                    style='italic', animated=True)
         
         # Canvas
+        self.background = None
+        self._background_view = None
         self.canvas = FigureCanvasTkAgg(self.fig, graph_container)
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.canvas.mpl_connect('scroll_event', self._on_scroll)
+        self.canvas.mpl_connect('button_press_event', self._on_press)
+        self.canvas.mpl_connect('motion_notify_event', self._on_motion)
+        self.canvas.mpl_connect('button_release_event', self._on_release)
         self.canvas.draw()
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    
+    def create_layer_panel(self):
+        """Panel inferior: agregar capas y una ficha por capa"""
+        panel = tk.Frame(self, bg=COLORS['bg_secondary'])
+        panel.pack(side=tk.BOTTOM, fill=tk.X, padx=20, pady=(0, 15))
+        
+        input_row = tk.Frame(panel, bg=COLORS['bg_secondary'])
+        input_row.pack(fill=tk.X)
+        
+        label = tk.Label(
+            input_row,
+            text="Capa:",
+            font=("Segoe UI", 11, "bold"),
+            bg=COLORS['bg_secondary'],
+            fg=COLORS['text_primary']
+        )
+        label.pack(side=tk.LEFT, padx=(0, 10))
+        
+        self.layer_entry = tk.Entry(
+            input_row,
+            font=("Consolas", 12),
+            bg=COLORS['display_bg'],
+            fg=COLORS['text_primary'],
+            insertbackground=COLORS['accent_blue'],
+            relief=tk.FLAT,
+            bd=0
+        )
+        self.layer_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, ipady=5)
+        self.layer_entry.bind('<Return>', lambda event: self._on_add_layer())
+        
+        add_button = tk.Button(
+            input_row,
+            text="➕ Agregar",
+            command=self._on_add_layer,
+            font=("Segoe UI", 10, "bold"),
+            bg=COLORS['accent_blue'],
+            fg=COLORS['text_primary'],
+            relief=tk.FLAT
+        )
+        add_button.pack(side=tk.LEFT, padx=(10, 0))
+        
+        self.layer_list = tk.Frame(panel, bg=COLORS['bg_secondary'])
+        self.layer_list.pack(fill=tk.X, pady=(5, 0))
+    
+    def _on_add_layer(self):
+        expression = self.layer_entry.get().strip()
+        if not expression:
+            return
+        try:
+            self.add_layer(expression)
+        except ValueError as e:
+            from tkinter import messagebox
+            messagebox.showerror("Error", f"No se pudo agregar la capa:\n{str(e)}")
+            return
+        self.layer_entry.delete(0, tk.END)
+    
+    def _add_layer_row(self, layer: Layer):
+        """Ficha de una capa: mostrar/ocultar, color, estilo de línea y quitar"""
+        row = tk.Frame(self.layer_list, bg=COLORS['bg_tertiary'])
+        row.pack(side=tk.LEFT, padx=(0, 5))
+        self.layer_rows[layer] = row
+        
+        visible = tk.BooleanVar(value=layer.visible)
+        check = tk.Checkbutton(
+            row,
+            text=layer.expression,
+            variable=visible,
+            command=lambda: self.set_layer_visible(layer, visible.get()),
+            font=("Consolas", 10),
+            bg=COLORS['bg_tertiary'],
+            fg=COLORS['text_primary'],
+            selectcolor=COLORS['display_bg'],
+            activebackground=COLORS['bg_tertiary']
+        )
+        check.pack(side=tk.LEFT)
         
-        # Mensaje inicial
-        self.show_empty_message()
+        def button(text, command, **kwargs):
+            widget = tk.Button(row, text=text, command=command, relief=tk.FLAT,
+                               bg=COLORS['bg_tertiary'], font=("Segoe UI", 10, "bold"),
+                               **kwargs)
+            widget.pack(side=tk.LEFT)
+            return widget
+        
+        color = button("●", lambda: color.config(fg=self.cycle_layer_color(layer)),
+                       fg=layer.color)
+        style = button(layer.style, lambda: style.config(text=self.cycle_layer_style(layer)),
+                       fg=COLORS['text_primary'])
+        button("✕", lambda: self.remove_layer(layer), fg=COLORS['text_secondary'])
+    
+    def add_layer(self, expression: str) -> Layer:
+        """
+        Agrega una función como capa; solo se evalúa la capa nueva
+        
+        Raises:
+            ValueError: Si la expresión no es válida
+        """
+        compiled = self.evaluator.compile(expression)
+        layer = Layer(compiled, COLORS[LAYER_COLORS[len(self.layers) % len(LAYER_COLORS)]])
+        self.layers.append(layer)
+        self._add_layer_row(layer)
+        self.redraw()
+        return layer
+    
+    def remove_layer(self, layer: Layer):
+        self.layers.remove(layer)
+        self.layer_rows.pop(layer).destroy()
+        self.redraw()
+    
+    def set_layer_visible(self, layer: Layer, visible: bool):
+        """Muestra u oculta una capa (las muestras que tenía se conservan)"""
+        layer.visible = visible
+        self.redraw()
+    
+    def cycle_layer_color(self, layer: Layer) -> str:
+        """Pasa la capa al siguiente color de la paleta y retorna el color nuevo"""
+        palette = [COLORS[name] for name in LAYER_COLORS]
+        index = palette.index(layer.color) if layer.color in palette else -1
+        layer.color = palette[(index + 1) % len(palette)]
+        self.redraw()
+        return layer.color
+    
+    def cycle_layer_style(self, layer: Layer) -> str:
+        """Pasa la capa al siguiente estilo de línea y retorna el estilo nuevo"""
+        index = LAYER_STYLES.index(layer.style)
+        layer.style = LAYER_STYLES[(index + 1) % len(LAYER_STYLES)]
+        self.redraw()
+        return layer.style
+    
+    def compute_layers(self, layers: List[Layer], x_range: Tuple[float, float]) -> list:
+        """
+        Muestras de varias capas en una sola pasada sobre una grilla x compartida
+        
+        No toca Tk: puede correr en un hilo de trabajo.
+        
+        Returns:
+            Un (x_values, y_values) por capa
+        """
+        return self.tiles.sample_many([layer.key for layer in layers],
+                                      [layer.compiled.evaluate_array for layer in layers],
+                                      *x_range, self.pixels)
+    
+    def _sample_layers(self):
+        """Muestrea las capas visibles cuyas muestras no son de la vista actual"""
+        x_range = tuple(self.ax.get_xlim())
+        stale = [layer for layer in self.layers
+                 if layer.visible and layer.x_range != x_range]
+        if not stale:
+            return
+        
+        compute = partial(self.compute_layers, stale, x_range)
+        done = partial(self._layers_done, stale, x_range)
+        if self.tasks is None:
+            done(compute())
+            return
+        # Como en la vista, un error deja las capas sin dibujar
+        self.tasks.submit('layers', compute, on_done=done)
+    
+    def _layers_done(self, layers: List[Layer], x_range: Tuple[float, float], samples: list):
+        for layer, (x, y) in zip(layers, samples):
+            layer.x, layer.y, layer.x_range = x, y, x_range
+        self.redraw()
+    
+    def redraw(self):
+        """Vuelve a dibujar la gráfica actual y las capas sin recalcular"""
+        if self.data is not None:
+            self.draw(self.data, keep_view=True)
+            return
+        
+        sampled = [layer for layer in self.layers if layer.visible and layer.x is not None]
+        if not sampled:
+            self.show_empty_message()
+            self._sample_layers()
+            return
+        
+        # Solo capas: la primera vez la vista se ajusta a ellas
+        ranges = [visible_range(layer.y) for layer in sampled]
+        y_range = (min(low for low, _ in ranges), max(high for _, high in ranges))
+        self.draw(PlotData('Capas', tuple(self.ax.get_xlim()), y_range, [], [], [], None),
+                  keep_view=False)
     
     def show_empty_message(self):
         """Muestra mensaje cuando no hay gráfica"""
-        self.ax.clear()
-        self.ax.set_facecolor(COLORS['display_bg'])
-        self.ax.grid(True, alpha=0.3, color=COLORS['text_secondary'], linestyle='--')
-        self.ax.text(0.5, 0.5, 'Esperando función para graficar...',
-                    ha='center', va='center', transform=self.ax.transAxes,
-                    fontsize=14, color=COLORS['text_secondary'],
-                    style='italic')
-        self.canvas.draw()
+        for artist in self.curve_lines + self.marker_lines:
+            artist.set_visible(False)
+        self._set_fills([])
+        self._set_legend([])
+        self.ax.title.set_text('')
+        self.message.set_visible(True)
+        self._blit()
     
     def plot_function(self, expression: str, show_derivative: bool = True):
         """Grafica una función y opcionalmente su derivada"""
         try:
-            # Limpiar gráfica
-            self.ax.clear()
-            self.ax.set_facecolor(COLORS['display_bg'])
-            self.ax.grid(True, alpha=0.3, color=COLORS['text_secondary'], 
-                        linestyle='--', linewidth=0.8)
-            
-            # Ejes
-            self.ax.axhline(y=0, color=COLORS['text_secondary'], 
-                           linewidth=1.5, alpha=0.5)
-            self.ax.axvline(x=0, color=COLORS['text_secondary'], 
-                           linewidth=1.5, alpha=0.5)
-            
-            # Evaluar función original
-            x_vals, y_vals = self.evaluator.evaluate_range(expression, -10, 10)
-            
-            # Graficar función original
-            self.ax.plot(x_vals, y_vals, color=COLORS['accent_blue'], 
-                        linewidth=3, label='f(x)', alpha=0.9)
-            
-            # Derivar y graficar derivada si se solicita
-            if show_derivative:
-                try:
-                    derivative_expr = self.derivative_engine.derive(expression)
-                    x_vals_d, y_vals_d = self.evaluator.evaluate_range(derivative_expr, -10, 10)
-                    
-                    self.ax.plot(x_vals_d, y_vals_d, color=COLORS['accent_pink'], 
-                                linewidth=3, label="f'(x)", linestyle='--', alpha=0.9)
-                except Exception as e:
-                    print(f"No se pudo graficar la derivada: {e}")
-            
-            # Etiquetas y título
-            self.ax.set_xlabel('x', color=COLORS['text_primary'], 
-                             fontsize=12, fontweight='bold')
-            self.ax.set_ylabel('y', color=COLORS['text_primary'], 
-                             fontsize=12, fontweight='bold')
-            self.ax.set_title(f'f(x) = {expression}', 
-                            color=COLORS['accent_blue'], 
-                            fontsize=14, fontweight='bold', pad=15)
-            self.ax.tick_params(colors=COLORS['text_primary'], labelsize=10)
-            
-            # Leyenda
-            legend = self.ax.legend(
-                facecolor=COLORS['bg_tertiary'], 
+            self.draw(self.compute_function(expression, show_derivative))
+        except Exception as e:
+            from tkinter import messagebox
+            messagebox.showerror("Error", f"No se pudo graficar:\n{str(e)}")
+    
+    def plot_taylor(self, expression: str, order: int, center: float = 0.0):
+        """Grafica f, su polinomio de Taylor y la banda de error entre ambos"""
+        try:
+            self.draw(self.compute_taylor(expression, order, center))
+        except Exception as e:
+            from tkinter import messagebox
+            messagebox.showerror("Error", f"No se pudo graficar:\n{str(e)}")
+    
+    def plot_integral(self, expression: str, a: float, b: float):
+        """Grafica f con el área entre a y b sombreada y la primitiva F(x) = ∫ f desde a"""
+        try:
+            self.draw(self.compute_integral(expression, a, b))
+        except Exception as e:
+            from tkinter import messagebox
+            messagebox.showerror("Error", f"No se pudo graficar:\n{str(e)}")
+    
+    def setup_engines(self, angle_mode: str = 'deg'):
+        """Motores de cálculo de la ventana (no tocan Tk)"""
+        self.evaluator = ExpressionEvaluator()
+        self.evaluator.set_angle_mode(angle_mode)
+        # Las raíces se buscan por tramo: unas cuatro muestras por pixel
+        self.root_finder = RootFinder(self.evaluator, samples=4 * TILE_PIXELS + 1)
+        self.integrator = Integrator(self.evaluator)
+        self.integrals = LRUCache(INTEGRAL_CACHE_SIZE)
+        self.tiles = TileSampler(TILE_CACHE_SIZE, TILE_PIXELS)
+    
+    def set_angle_mode(self, angle_mode: str):
+        """
+        Sigue el modo angular de la calculadora y recalcula lo que está a la vista
+        
+        Las cachés de tramos e integrales incluyen el modo en la clave: al volver
+        al modo anterior los tramos ya vistos no se evalúan otra vez.
+        """
+        if angle_mode == self.evaluator.angle_mode:
+            return
+        self.evaluator.set_angle_mode(angle_mode)
+        for layer in self.layers:
+            layer.compiled = self.evaluator.compile(layer.expression)
+            layer.x = layer.y = layer.x_range = None
+        if self.replot is not None or self.layers:
+            self._refresh_view()
+    
+    # Los compute_* no tocan Tk ni matplotlib: pueden correr en un hilo de trabajo
+    
+    def compute_function(self, expression: str, show_derivative: bool = True,
+                         x_range: Tuple[float, float] = GRAPH_X_RANGE) -> PlotData:
+        """Datos de la gráfica de f (y f' por diferenciación automática)"""
+        compiled = self.evaluator.compile(expression)
+        if show_derivative:
+            x_vals, (y_vals, y_vals_d) = self._sample(
+                compiled, compiled.evaluate_with_derivative, x_range)
+        else:
+            x_vals, y_vals = self._sample(compiled, compiled.evaluate_array, x_range)
+        
+        curves = [Curve(x_vals, y_vals, COLORS['accent_blue'], 3, 'f(x)', '-')]
+        # Derivada sobre los mismos puntos
+        if show_derivative:
+            curves.append(Curve(x_vals, y_vals_d, COLORS['accent_pink'], 3, "f'(x)", '--'))
+        
+        # Ceros de f
+        markers = []
+        if compiled.has_variable:
+            roots = self._roots(compiled, x_range)
+            if len(roots):
+                markers.append(Markers(roots, np.zeros(len(roots)), 'o',
+                                       COLORS['accent_yellow'], 'ceros'))
+        
+        return PlotData(f'f(x) = {expression}', x_range, self.tiles.y_range, curves, markers,
+                        [], None, partial(self.compute_function, expression, show_derivative))
+    
+    def compute_taylor(self, expression: str, order: int, center: float = 0.0,
+                       x_range: Tuple[float, float] = GRAPH_X_RANGE) -> PlotData:
+        """Datos de f, su polinomio de Taylor y la banda de error (result = coeficientes)"""
+        compiled = self.evaluator.compile(expression)
+        x_vals, y_vals = self._sample(compiled, compiled.evaluate_array, x_range)
+        y_range = self.tiles.y_range
+        
+        # Una sola evaluación vectorizada del polinomio sobre los mismos x
+        coefficients = compiled.taylor_coefficients(order, center)
+        with np.errstate(all='ignore'):
+            y_taylor = horner(coefficients, x_vals)
+        
+        curves = [Curve(x_vals, y_vals, COLORS['accent_blue'], 3, 'f(x)', '-'),
+                  Curve(x_vals, y_taylor, COLORS['accent_green'], 2.5, f'T{order}(x)', '--')]
+        
+        # Banda de error |f - T|
+        valid = np.isfinite(y_vals) & np.isfinite(y_taylor)
+        fills = [Fill(x_vals, y_vals, y_taylor, valid, COLORS['accent_orange'], 0.25, 'error')]
+        
+        markers = []
+        y_center = compiled.evaluate_array(np.array([center]))[0]
+        if np.isfinite(y_center):
+            markers.append(Markers(np.array([center]), np.array([y_center]), 'o',
+                                   COLORS['accent_yellow'], None))
+        
+        return PlotData(f'Taylor de orden {order} en x = {center:g}: {expression}',
+                        x_range, y_range, curves, markers, fills, coefficients,
+                        partial(self.compute_taylor, expression, order, center))
+    
+    def compute_integral(self, expression: str, a: float, b: float,
+                         x_range: Tuple[float, float] = GRAPH_X_RANGE) -> PlotData:
+        """Datos de f, el área entre a y b y la primitiva (result = IntegrationResult)"""
+        compiled = self.evaluator.compile(expression)
+        x_vals, y_vals = self._sample(compiled, compiled.evaluate_array, x_range)
+        y_range = self.tiles.y_range
+        
+        # La integral no depende de la vista: al moverla no se vuelve a calcular
+        key = (expression, compiled.angle_mode, a, b)
+        result = self.integrals.get(key)
+        if result is None:
+            result = self.integrator.integrate(expression, a, b)
+            self.integrals.put(key, result)
+        
+        # Primitiva sobre toda la vista, anclada en a (F(a) = 0)
+        x_left, F_left = self.integrator.cumulative(expression, a, min(x_range[0], a))
+        x_right, F_right = self.integrator.cumulative(expression, a, max(x_range[1], a))
+        x_prim = np.concatenate((x_left[::-1], x_right[1:]))
+        F_prim = np.concatenate((F_left[::-1], F_right[1:]))
+        
+        curves = [Curve(x_vals, y_vals, COLORS['accent_blue'], 3, 'f(x)', '-'),
+                  Curve(x_prim, F_prim, COLORS['accent_green'], 2.5,
+                        f'F(x) = ∫ f desde {a:g}', '--')]
+        
+        # Área entre a y b
+        x_area = np.linspace(min(a, b), max(a, b), 400)
+        y_area = compiled.evaluate_array(x_area)
+        fills = [Fill(x_area, 0, y_area, np.isfinite(y_area), COLORS['accent_purple'], 0.3,
+                      f'∫ = {result.value:.6g}')]
+        
+        return PlotData(f'∫ de {a:g} a {b:g} de {expression}', x_range, y_range, curves, [],
+                        fills, result, partial(self.compute_integral, expression, a, b))
+    
+    def _sample(self, compiled, func, x_range: Tuple[float, float]):
+        """Muestrea por tramos a la densidad de la vista (los tramos ya vistos no se evalúan)"""
+        key = (compiled.expression, compiled.angle_mode, func.__name__)
+        return self.tiles.sample(key, func, *x_range, self.pixels)
+    
+    def _roots(self, compiled, x_range: Tuple[float, float]) -> np.ndarray:
+        """Ceros de f en la vista, buscados por tramo (los tramos ya vistos no se buscan)"""
+        key = (compiled.expression, compiled.angle_mode, 'roots')
+        find = partial(self.root_finder.find_roots, compiled.expression)
+        roots = np.concatenate(self.tiles.map_tiles(key, find, *x_range, self.pixels))
+        roots = roots[(roots >= x_range[0]) & (roots <= x_range[1])]
+        
+        # Una raíz en el borde compartido de dos tramos aparece en ambos
+        if len(roots) < 2:
+            return roots
+        gap = np.diff(roots) > 1e-9 * (1 + np.abs(roots[1:]))
+        return roots[np.concatenate(([True], gap))]
+    
+    def draw(self, data: PlotData, keep_view: bool = False):
+        """
+        Dibuja datos ya calculados (solo en el hilo de Tk)
+        
+        Solo se repintan las curvas sobre el fondo guardado; el redibujado
+        completo queda para cuando cambian los límites (y con ellos las marcas).
+        
+        Args:
+            data: Gráfica calculada
+            keep_view: Mantener la vista del usuario (si no, se ajusta a data)
+        """
+        self.message.set_visible(False)
+        self.replot = data.replot
+        self.data = data
+        
+        # Las capas se dibujan con sus últimas muestras; las viejas se piden abajo
+        all_curves = data.curves + [layer.curve() for layer in self.layers
+                                    if layer.visible and layer.x is not None]
+        curves = self._pool(self.curve_lines, len(all_curves))
+        for line, curve in zip(curves, all_curves):
+            line.set_data(curve.x, curve.y)
+            line.set(color=curve.color, linewidth=curve.width, linestyle=curve.style,
+                     label=curve.label, visible=True)
+        
+        markers = self._pool(self.marker_lines, len(data.markers))
+        for line, marker in zip(markers, data.markers):
+            line.set_data(marker.x, marker.y)
+            line.set(marker=marker.symbol, linestyle='none', markersize=8, zorder=5,
+                     color=marker.color, label=marker.label, visible=True)
+        
+        self._set_fills(data.fills)
+        self._set_legend(curves + self.fills + markers)
+        self.ax.title.set_text(data.title)
+        
+        if not keep_view:
+            # Una gráfica nueva descarta los recálculos de la vista anterior
+            if self.tasks is not None:
+                self.tasks.cancel('view')
+            # Limitar y a la zona visible (los polos no aplastan la curva)
+            self.ax.set_xlim(data.x_range)
+            self.ax.set_ylim(nice_limits(*data.y_range))
+        
+        if self.background is None or self._view() != self._background_view:
+            self.canvas.draw()
+        else:
+            self._blit()
+        
+        self._sample_layers()
+    
+    def _pool(self, lines: List[Line2D], count: int) -> List[Line2D]:
+        """Primeras count líneas del pool (crea las que falten y oculta el resto)"""
+        while len(lines) < count:
+            line, = self.ax.plot([], [], alpha=0.9, animated=True)
+            lines.append(line)
+        for line in lines[count:]:
+            line.set_visible(False)
+        return lines[:count]
+    
+    def _set_fills(self, fills: List[Fill]):
+        """Reemplaza las regiones sombreadas (fill_between no admite set_data)"""
+        for collection in self.fills:
+            collection.remove()
+        self.fills = [self.ax.fill_between(fill.x, fill.y1, fill.y2, where=fill.where,
+                                           color=fill.color, alpha=fill.alpha,
+                                           label=fill.label, animated=True)
+                      for fill in fills]
+    
+    def _set_legend(self, handles: list):
+        """Leyenda de los artistas con etiqueta"""
+        if self.legend is not None:
+            self.legend.remove()
+            self.legend = None
+        
+        handles = [artist for artist in handles if artist.get_label()]
+        if handles:
+            self.legend = self.ax.legend(
+                handles=handles,
+                facecolor=COLORS['bg_tertiary'],
                 edgecolor=COLORS['accent_blue'],
                 labelcolor=COLORS['text_primary'],
                 fontsize=11,
                 framealpha=0.9,
                 shadow=True
             )
-            
-            # Spines
-            for spine in self.ax.spines.values():
-                spine.set_color(COLORS['text_secondary'])
-                spine.set_linewidth(1.5)
-            
-            # Actualizar
+            self.legend.set_animated(True)
+    
+    def _style_axes(self):
+        """Grilla, ejes, etiquetas y spines: la parte estática de la gráfica"""
+        self.ax.set_facecolor(COLORS['display_bg'])
+        self.ax.grid(True, alpha=0.3, color=COLORS['text_secondary'],
+                    linestyle='--', linewidth=0.8)
+        
+        # Ejes
+        self.ax.axhline(y=0, color=COLORS['text_secondary'],
+                       linewidth=1.5, alpha=0.5)
+        self.ax.axvline(x=0, color=COLORS['text_secondary'],
+                       linewidth=1.5, alpha=0.5)
+        self.ax.set_xlim(-10, 10)
+        
+        # Etiquetas y título
+        self.ax.set_xlabel('x', color=COLORS['text_primary'],
+                         fontsize=12, fontweight='bold')
+        self.ax.set_ylabel('y', color=COLORS['text_primary'],
+                         fontsize=12, fontweight='bold')
+        self.ax.set_title('',
+                        color=COLORS['accent_blue'],
+                        fontsize=14, fontweight='bold', pad=15)
+        self.ax.tick_params(colors=COLORS['text_primary'], labelsize=10)
+        
+        # Spines
+        for spine in self.ax.spines.values():
+            spine.set_color(COLORS['text_secondary'])
+            spine.set_linewidth(1.5)
+    
+    def _animated(self) -> list:
+        """Artistas que no forman parte del fondo, en orden de dibujo"""
+        artists = self.fills + self.curve_lines + self.marker_lines
+        artists += [self.ax.title, self.message]
+        if self.legend is not None:
+            artists.append(self.legend)
+        return artists
+    
+    def _on_draw(self, event):
+        """Tras un redibujado completo: guarda el fondo y pinta encima los artistas"""
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._background_view = self._view()
+        self.pixels = max(int(self.ax.bbox.width), 1)
+        for artist in self._animated():
+            self.fig.draw_artist(artist)
+    
+    def _blit(self):
+        """Repinta solo los artistas animados sobre el fondo guardado"""
+        if self.background is None:
             self.canvas.draw()
-            
-        except Exception as e:
-            from tkinter import messagebox
-            messagebox.showerror("Error", f"No se pudo graficar:\n{str(e)}")
+            return
+        
+        self.canvas.restore_region(self.background)
+        for artist in self._animated():
+            self.fig.draw_artist(artist)
+        self.canvas.blit(self.fig.bbox)
+    
+    def _view(self) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+        return self.ax.get_xlim(), self.ax.get_ylim()
+    
+    def _on_scroll(self, event):
+        """Rueda del mouse: zoom centrado en el cursor"""
+        if event.inaxes is not self.ax:
+            return
+        factor = 1 / ZOOM_STEP if event.button == 'up' else ZOOM_STEP
+        (x0, x1), (y0, y1) = self._view()
+        x, y = event.xdata, event.ydata
+        self.set_view((x + (x0 - x) * factor, x + (x1 - x) * factor),
+                      (y + (y0 - y) * factor, y + (y1 - y) * factor))
+    
+    def _on_press(self, event):
+        """Botón izquierdo: empieza a arrastrar la vista"""
+        if event.button == 1 and event.inaxes is self.ax:
+            self._drag = (event.x, event.y) + self._view()
+    
+    def _on_motion(self, event):
+        if self._drag is None:
+            return
+        # En pixeles: las coordenadas de datos cambian mientras se arrastra
+        px, py, (x0, x1), (y0, y1) = self._drag
+        dx = (event.x - px) * (x1 - x0) / self.ax.bbox.width
+        dy = (event.y - py) * (y1 - y0) / self.ax.bbox.height
+        self.set_view((x0 - dx, x1 - dx), (y0 - dy, y1 - dy))
+    
+    def _on_release(self, event):
+        self._drag = None
+    
+    def set_view(self, x_range: Tuple[float, float], y_range: Tuple[float, float]):
+        """
+        Mueve la vista y programa el remuestreo de la zona nueva
+        
+        El redibujado es inmediato con las curvas que ya hay; el remuestreo
+        espera a que la vista se quede quieta VIEW_DEBOUNCE_MS.
+        """
+        # Ni tan cerca que los tramos se pierdan en el redondeo, ni tan lejos
+        center = (x_range[0] + x_range[1]) / 2
+        width = min(max(x_range[1] - x_range[0], 1e-9 * max(1.0, abs(center))), 1e9)
+        self.ax.set_xlim(center - width / 2, center + width / 2)
+        if y_range[1] - y_range[0] > 1e-12 * max(1.0, abs(y_range[0])):
+            self.ax.set_ylim(y_range)
+        self.canvas.draw_idle()
+        
+        if self._view_id is not None:
+            self.after_cancel(self._view_id)
+        self._view_id = self.after(VIEW_DEBOUNCE_MS, self._refresh_view)
+    
+    def _refresh_view(self):
+        """Recalcula la gráfica actual sobre la vista nueva"""
+        self._view_id = None
+        if self.replot is None:
+            self._sample_layers()
+            return
+        
+        compute = partial(self.replot, x_range=tuple(self.ax.get_xlim()))
+        if self.tasks is None:
+            self.draw(compute(), keep_view=True)
+            return
+        # Un error al mover la vista deja las curvas anteriores, sin aviso
+        self.tasks.submit('view', compute, on_done=lambda data: self.draw(data, keep_view=True))
@@ -0,0 +1,135 @@
+"""
+Vista previa en vivo del editor de funciones
+Un hilo de trabajo valida, compila y evalúa la función; la interfaz solo
+recoge el último resultado
+"""
+
+import queue
+import threading
+import numpy as np
+from typing import List, NamedTuple, Optional
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from math_engine import ExpressionEvaluator
+from math_engine.sampling import visible_range
+from utils.constants import PREVIEW_PROBES, SPARKLINE_POINTS
+
+
+class PreviewResult(NamedTuple):
+    """Resultado de una vista previa (error es None si la función es válida)"""
+    generation: int
+    probes: Optional[np.ndarray]
+    lines: List[List[float]]
+    error: Optional[str]
+
+
+class PreviewWorker:
+    """Hilo que calcula vistas previas; solo importa el pedido más reciente"""
+    
+    def __init__(self):
+        # Evaluador propio: solo lo usa el hilo de trabajo
+        self.evaluator = ExpressionEvaluator()
+        self.generation = 0
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def submit(self, text: str, angle_mode: str, width: int, height: int) -> int:
+        """
+        Pide la vista previa de text; los pedidos anteriores quedan obsoletos
+        
+        Returns:
+            Número de generación del pedido
+        """
+        self.generation += 1
+        self._requests.put((self.generation, text, angle_mode, width, height))
+        return self.generation
+    
+    def poll(self) -> Optional[PreviewResult]:
+        """Último resultado de la generación actual (None si todavía no hay)"""
+        result = None
+        while True:
+            try:
+                candidate = self._results.get_nowait()
+            except queue.Empty:
+                return result
+            if candidate.generation == self.generation:
+                result = candidate
+    
+    def cancel(self):
+        """Deja obsoletos los pedidos pendientes sin pedir uno nuevo"""
+        self.generation += 1
+    
+    def stop(self):
+        """Termina el hilo cuando acabe el cálculo en curso"""
+        self.generation += 1
+        self._requests.put(None)
+    
+    def _run(self):
+        while True:
+            request = self._requests.get()
+            # Los pedidos acumulados mientras se calculaba ya son viejos
+            while request is not None and not self._requests.empty():
+                request = self._requests.get_nowait()
+            if request is None:
+                return
+            
+            try:
+                result = self._compute(*request)
+            except Exception as e:
+                # Un error inesperado se informa como cualquier otro: el hilo sigue vivo
+                result = PreviewResult(request[0], None, [], str(e) or type(e).__name__)
+            if result is not None:
+                self._results.put(result)
+    
+    def _stale(self, generation: int) -> bool:
+        return generation != self.generation
+    
+    def _compute(self, generation: int, text: str, angle_mode: str,
+                 width: int, height: int) -> Optional[PreviewResult]:
+        """Valida, compila y evalúa; abandona entre etapas si llegó otro pedido"""
+        try:
+            self.evaluator.set_angle_mode(angle_mode)
+            compiled = self.evaluator.compile(text)
+        except ValueError as e:
+            return PreviewResult(generation, None, [], str(e))
+        
+        if self._stale(generation):
+            return None
+        probes = compiled.evaluate_array(np.array(PREVIEW_PROBES))
+        
+        if self._stale(generation):
+            return None
+        x = np.linspace(-10, 10, SPARKLINE_POINTS)
+        lines = sparkline(compiled.evaluate_array(x), width, height)
+        
+        return PreviewResult(generation, probes, lines, None)
+
+
+def sparkline(y: np.ndarray, width: int, height: int) -> List[List[float]]:
+    """
+    Coordenadas de canvas de una mini gráfica de y
+    
+    Returns:
+        Una lista plana [x0, y0, x1, y1, ...] por tramo continuo (NaN corta el trazo)
+    """
+    if width < 2 or height < 2:
+        return []
+    
+    y_min, y_max = visible_range(y)
+    px = np.linspace(1, width - 1, len(y))
+    with np.errstate(invalid='ignore'):
+        py = (height - 1) - (y - y_min) / (y_max - y_min) * (height - 2)
+    
+    # Lejos del canvas (polos) también se corta el trazo
+    lines = []
+    with np.errstate(invalid='ignore'):
+        valid = np.isfinite(py) & (py > -height) & (py < 2 * height)
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], valid, [False])).astype(int)))
+    for start, stop in zip(edges[::2], edges[1::2]):
+        if stop - start >= 2:
+            lines.append(np.column_stack((px[start:stop], py[start:stop])).ravel().tolist())
+    return lines
@@ -0,0 +1,97 @@
+"""
+Ejecutor de tareas de la interfaz
+Los cálculos corren fuera del hilo de Tk y los resultados se entregan con after()
+"""
+
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.constants import TASK_POLL_MS
+
+
+class TaskExecutor:
+    """
+    Manda trabajo a un pool y devuelve el resultado en el hilo de Tk
+    
+    Cada tarea tiene una clave ('derive', 'graph', ...): una tarea nueva con
+    la misma clave cancela la anterior. Si la anterior ya estaba corriendo no
+    se la puede interrumpir, pero su resultado se descarta.
+    """
+    
+    def __init__(self, root, pool: Executor = None,
+                 on_busy: Optional[Callable[[bool], None]] = None):
+        """
+        Args:
+            root: Widget de Tk desde el que se programan los after()
+            pool: Executor de concurrent.futures (por defecto un hilo; con un
+                  ProcessPoolExecutor las funciones deben poder serializarse)
+            on_busy: Se llama con True al empezar a haber tareas y False al terminar
+        """
+        self.root = root
+        # Un solo hilo: las tareas usan los mismos motores y se ejecutan en orden
+        self.pool = pool or ThreadPoolExecutor(max_workers=1, thread_name_prefix='calculo')
+        self.on_busy = on_busy
+        self._tasks: Dict[str, Tuple[Future, Callable, Callable]] = {}
+        self._poll_id = None
+    
+    def submit(self, key: str, func: Callable, *args,
+               on_done: Callable = None, on_error: Callable = None) -> Future:
+        """
+        Ejecuta func(*args) en el pool, cancelando la tarea anterior de la misma clave
+        
+        Args:
+            key: Clave de la tarea
+            on_done: Recibe el resultado (en el hilo de Tk)
+            on_error: Recibe la excepción (en el hilo de Tk)
+        """
+        self.cancel(key)
+        future = self.pool.submit(func, *args)
+        self._tasks[key] = (future, on_done, on_error)
+        
+        if self._poll_id is None:
+            if self.on_busy:
+                self.on_busy(True)
+            self._poll_id = self.root.after(TASK_POLL_MS, self._poll)
+        return future
+    
+    def cancel(self, key: str):
+        """Cancela la tarea de esa clave (su resultado ya no se entrega)"""
+        task = self._tasks.pop(key, None)
+        if task is not None:
+            task[0].cancel()
+    
+    def busy(self) -> bool:
+        return bool(self._tasks)
+    
+    def shutdown(self):
+        """Cancela todo y libera el pool sin esperar a la tarea en curso"""
+        for key in list(self._tasks):
+            self.cancel(key)
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self.pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _poll(self):
+        """Entrega los resultados listos; nunca espera a una tarea"""
+        for key, (future, on_done, on_error) in list(self._tasks.items()):
+            if not future.done():
+                continue
+            del self._tasks[key]
+            
+            error = future.exception()
+            if error is not None:
+                if on_error:
+                    on_error(error)
+            elif on_done:
+                on_done(future.result())
+        
+        if self._tasks:
+            self._poll_id = self.root.after(TASK_POLL_MS, self._poll)
+        else:
+            self._poll_id = None
+            if self.on_busy:
+                self.on_busy(False)
@@ -7,7 +7,9 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.constants import COLORS, BUTTON_RADIUS
+from utils.constants import (COLORS, BUTTON_RADIUS, PREVIEW_DEBOUNCE_MS, PREVIEW_POLL_MS,
+                             PREVIEW_PROBES, SPARKLINE_HEIGHT)
+from ui.preview import PreviewWorker
 
 
 class RoundedButton(tk.Canvas):
@@ -92,11 +94,24 @@ class RoundedButton(tk.Canvas):
 class FunctionInputPanel(tk.Frame):
     """Panel de entrada intuitivo para funciones (estilo GeoGebra)"""
     
-    def __init__(self, parent, on_derive_callback, on_graph_callback, colors):
+    def __init__(self, parent, on_derive_callback, on_graph_callback, colors,
+                 on_taylor_callback=None, on_integrate_callback=None, angle_mode=None):
         super().__init__(parent, bg=colors['bg_secondary'])
         self.colors = colors
         self.on_derive = on_derive_callback
         self.on_graph = on_graph_callback
+        self.on_taylor = on_taylor_callback
+        self.on_integrate = on_integrate_callback
+        
+        # Vista previa en vivo: se calcula en otro hilo tras una pausa al escribir
+        self.angle_mode = angle_mode
+        self.preview_worker = PreviewWorker()
+        self._debounce_id = None
+        self._poll_id = None
+        self._angle_trace = None
+        if angle_mode is not None:
+            self._angle_trace = angle_mode.trace_add('write', self.update_preview)
+        self.bind('<Destroy>', self._on_destroy)
         
         self.setup_ui()
     
@@ -214,7 +229,27 @@ class FunctionInputPanel(tk.Frame):
             anchor=tk.W,
             wraplength=500
         )
-        self.preview_display.pack(fill=tk.X, padx=10, pady=(0, 5))
+        self.preview_display.pack(fill=tk.X, padx=10, pady=(0, 2))
+        
+        # Valores en puntos de prueba (o el error) y mini gráfica en [-10, 10]
+        self.preview_values = tk.Label(
+            preview_frame,
+            text="",
+            font=("Consolas", 10),
+            bg=self.colors['bg_tertiary'],
+            fg=self.colors['text_secondary'],
+            anchor=tk.W,
+            wraplength=500
+        )
+        self.preview_values.pack(fill=tk.X, padx=10)
+        
+        self.sparkline = tk.Canvas(
+            preview_frame,
+            height=SPARKLINE_HEIGHT,
+            bg=self.colors['display_bg'],
+            highlightthickness=0
+        )
+        self.sparkline.pack(fill=tk.X, padx=10, pady=(2, 8))
         
         # Bind para actualizar preview
         self.function_entry.bind('<KeyRelease>', self.update_preview)
@@ -244,6 +279,32 @@ class FunctionInputPanel(tk.Frame):
                 height=55
             )
             btn.pack(fill=tk.X)
+        
+        # Herramientas de análisis (solo las que tienen callback)
+        tools = [
+            ("Tₙ TAYLOR", self.colors['accent_green'], self.on_taylor),
+            ("∫ INTEGRAR", self.colors['accent_purple'], self.on_integrate)
+        ]
+        tools = [tool for tool in tools if tool[2] is not None]
+        if tools:
+            tools_frame = tk.Frame(self, bg=self.colors['bg_secondary'])
+            tools_frame.pack(fill=tk.X, padx=20, pady=(0, 15))
+            
+            for text, color, cmd in tools:
+                btn_container = tk.Frame(tools_frame, bg=self.colors['bg_secondary'])
+                btn_container.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=2)
+                
+                btn = RoundedButton(
+                    btn_container,
+                    text=text,
+                    command=cmd,
+                    bg_color=color,
+                    hover_color=self.colors['accent_orange'],
+                    font=("Segoe UI", 11, "bold"),
+                    width=160,
+                    height=40
+                )
+                btn.pack(fill=tk.X)
     
     def insert_function(self, text):
         """Inserta una función en la posición del cursor"""
@@ -252,15 +313,69 @@ class FunctionInputPanel(tk.Frame):
         self.function_entry.focus()
         self.update_preview()
     
-    def update_preview(self, event=None):
-        """Actualiza la vista previa de la función"""
+    def update_preview(self, *event):
+        """Actualiza la vista previa; la evaluación se pide tras una pausa al escribir"""
         text = self.function_entry.get()
-        if text:
+        if self._debounce_id is not None:
+            self.after_cancel(self._debounce_id)
+            self._debounce_id = None
+        
+        if text.strip():
             # Formatear para mostrar
             preview = text.replace('^', '⁽ˣ⁾').replace('*', '·')
             self.preview_display.config(text=f"f(x) = {preview}")
+            self._debounce_id = self.after(PREVIEW_DEBOUNCE_MS, self._request_preview)
         else:
-            self.preview_display.config(text="")
+            self._clear_preview()
+    
+    def _request_preview(self):
+        """Manda la función al hilo de trabajo y empieza a esperar el resultado"""
+        self._debounce_id = None
+        angle_mode = self.angle_mode.get() if self.angle_mode is not None else 'deg'
+        self.preview_worker.submit(self.function_entry.get(), angle_mode,
+                                   self.sparkline.winfo_width(), SPARKLINE_HEIGHT)
+        if self._poll_id is None:
+            self._poll_id = self.after(PREVIEW_POLL_MS, self._poll_preview)
+    
+    def _poll_preview(self):
+        """Revisa (sin bloquear) si llegó el resultado del último pedido"""
+        result = self.preview_worker.poll()
+        if result is None:
+            self._poll_id = self.after(PREVIEW_POLL_MS, self._poll_preview)
+            return
+        
+        self._poll_id = None
+        self.sparkline.delete('all')
+        if result.error is not None:
+            self.preview_values.config(text=result.error, fg=self.colors['accent_pink'])
+            return
+        
+        values = [f"f({x:g}) = {y:.6g}" if y == y else f"f({x:g}) = indefinido"
+                  for x, y in zip(PREVIEW_PROBES, result.probes)]
+        self.preview_values.config(text="   ".join(values), fg=self.colors['text_secondary'])
+        for line in result.lines:
+            self.sparkline.create_line(*line, fill=self.colors['accent_green'], width=2)
+    
+    def _clear_preview(self):
+        """Borra la vista previa y descarta los cálculos pendientes"""
+        self.preview_worker.cancel()
+        if self._poll_id is not None:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+        self.preview_display.config(text="")
+        self.preview_values.config(text="")
+        self.sparkline.delete('all')
+    
+    def _on_destroy(self, event):
+        """Detiene el hilo de la vista previa al destruir el panel"""
+        if event.widget is not self:
+            return
+        for after_id in (self._debounce_id, self._poll_id):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        if self._angle_trace is not None:
+            self.angle_mode.trace_remove('write', self._angle_trace)
+        self.preview_worker.stop()
     
     def get_function(self):
         """Obtiene la función ingresada"""
@@ -269,4 +384,7 @@ class FunctionInputPanel(tk.Frame):
     def clear(self):
         """Limpia el input"""
         self.function_entry.delete(0, tk.END)
-        self.preview_display.config(text="")
+        if self._debounce_id is not None:
+            self.after_cancel(self._debounce_id)
+            self._debounce_id = None
+        self._clear_preview()
@@ -1,5 +1,6 @@
 """Utils package"""
 from .constants import COLORS, PI, E
-from .formatter import to_superscript, format_expression, format_coefficient
+from .formatter import to_superscript, format_expression, format_coefficient, format_polynomial
 
-__all__ = ['COLORS', 'PI', 'E', 'to_superscript', 'format_expression', 'format_coefficient']
+__all__ = ['COLORS', 'PI', 'E', 'to_superscript', 'format_expression', 'format_coefficient',
+           'format_polynomial']
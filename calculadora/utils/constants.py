@@ -36,3 +36,30 @@ GRAPH_WINDOW_HEIGHT = 600
 BUTTON_RADIUS = 15
 BUTTON_WIDTH = 100
 BUTTON_HEIGHT = 50
+
+# Intervalo donde busca raíces el modo SOLVE
+SOLVE_X_MIN = -100
+SOLVE_X_MAX = 100
+
+# Vista previa en vivo del editor de funciones
+PREVIEW_DEBOUNCE_MS = 150
+PREVIEW_POLL_MS = 16
+PREVIEW_PROBES = (-1.0, 0.0, 1.0)
+SPARKLINE_POINTS = 160
+SPARKLINE_HEIGHT = 40
+
+# Tareas en segundo plano: cada cuánto revisa la interfaz si terminaron (un cuadro)
+TASK_POLL_MS = 16
+
+# Vista de la gráfica: zoom con la rueda y desplazamiento arrastrando
+GRAPH_X_RANGE = (-10.0, 10.0)
+ZOOM_STEP = 1.25
+VIEW_DEBOUNCE_MS = 80
+TILE_PIXELS = 128
+TILE_CACHE_SIZE = 512
+# Integrales definidas (expresión, modo, a, b) que se recuerdan al mover la vista
+INTEGRAL_CACHE_SIZE = 32
+
+# Capas de la gráfica: paleta (claves de COLORS) y estilos de línea que se alternan
+LAYER_COLORS = ('accent_green', 'accent_orange', 'accent_purple', 'accent_yellow', 'accent_pink')
+LAYER_STYLES = ('-', '--', ':', '-.')
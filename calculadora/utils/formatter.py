@@ -23,3 +23,27 @@ def format_coefficient(coef):
         return str(int(coef))
     else:
         return f"{coef:.2f}"
+
+
+def format_polynomial(coefficients):
+    """Formatea un polinomio dado por sus coeficientes [c0, c1, c2, ...]"""
+    terms = []
+    for i in range(len(coefficients) - 1, -1, -1):
+        coef = coefficients[i]
+        if coef == 0:
+            continue
+        
+        if terms:
+            sign = " + " if coef > 0 else " - "
+        else:
+            sign = "" if coef > 0 else "-"
+        coef = abs(coef)
+        
+        # Los coeficientes de Taylor pueden ser muy chicos (1/5040)
+        coef_str = str(int(coef)) if coef == int(coef) else f"{coef:.4g}"
+        power = "" if i == 0 else ("x" if i == 1 else f"x{to_superscript(i)}")
+        if coef == 1 and i > 0:
+            coef_str = ""
+        terms.append(f"{sign}{coef_str}{power}")
+    
+    return "".join(terms) if terms else "0"
@@ -1,11 +1,15 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, Toplevel
 import math
-import re
+import sys
+import os
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'calculadora'))
+
+from math_engine import ExpressionEvaluator, ExpressionParser
 
 
 class RoundedButton(tk.Canvas):
@@ -150,21 +154,16 @@ class GraphWindow(Toplevel):
                     style='italic')
         self.canvas.draw()
     
-    def plot_polynomial(self, coefficients, derivative):
-        """Grafica polinomio y su derivada"""
+    def plot_polynomial(self, polynomial, derivative):
+        """Grafica polinomio y su derivada (objetos Polynomial)"""
         try:
             # Crear rango de x
             x = np.linspace(-10, 10, 500)
             
-            # Calcular y para función original
-            y_original = np.zeros_like(x)
-            for i, coef in enumerate(coefficients):
-                y_original += coef * (x ** i)
-            
-            # Calcular y para derivada
-            y_derivative = np.zeros_like(x)
-            for i, coef in enumerate(derivative):
-                y_derivative += coef * (x ** i)
+            # f y f' en una evaluación vectorizada cada uno
+            with np.errstate(over='ignore', invalid='ignore'):
+                y_original = polynomial(x)
+                y_derivative = derivative(x)
             
             # Limpiar gráfica
             self.ax.clear()
@@ -184,6 +183,18 @@ class GraphWindow(Toplevel):
             self.ax.plot(x, y_derivative, color=self.colors['accent_pink'], 
                         linewidth=3, label="f'(x)", linestyle='--', alpha=0.9)
             
+            # Raíces, puntos críticos (f' = 0) y de inflexión (f'' = 0) sobre f
+            points = [
+                (polynomial, 'raíces', 'o', self.colors['accent_yellow']),
+                (derivative, 'críticos', 's', self.colors['accent_green']),
+                (derivative.derivative(), 'inflexión', 'D', self.colors['accent_orange'])
+            ]
+            for poly, label, marker, color in points:
+                x_points = self.visible_roots(poly)
+                if len(x_points):
+                    self.ax.plot(x_points, polynomial(x_points), marker, color=color,
+                                markersize=8, label=label, zorder=5)
+            
             # Etiquetas y título
             self.ax.set_xlabel('x', color=self.colors['text_primary'], 
                              fontsize=12, fontweight='bold')
@@ -214,6 +225,16 @@ class GraphWindow(Toplevel):
             
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo graficar:\n{str(e)}")
+    
+    def visible_roots(self, polynomial, x_min=-10, x_max=10):
+        """Raíces reales dentro del rango graficado (vacío si no se pueden calcular)"""
+        if polynomial.degree < 1:
+            return np.array([])
+        try:
+            roots = polynomial.real_roots()
+        except ValueError:
+            return np.array([])
+        return roots[(roots >= x_min) & (roots <= x_max)]
 
 
 class ScientificCalculator:
@@ -233,6 +254,8 @@ class ScientificCalculator:
         self.angle_mode = tk.StringVar(value="deg")
         self.memory = 0
         self.graph_window = None
+        self.evaluator = ExpressionEvaluator()
+        self.parser = ExpressionParser()
         
         # Colores del tema
         self.colors = {
@@ -518,6 +541,7 @@ class ScientificCalculator:
         buttons = [
             ("📐 DERIVAR", self.colors['accent_purple'], self.derive_polynomial),
             ("📊 GRAFICAR", self.colors['accent_blue'], self.graph_polynomial),
+            ("🎯 RAÍCES", self.colors['accent_green'], self.roots_polynomial),
             ("🗑️ LIMPIAR", self.colors['accent_pink'], self.clear_polynomial)
         ]
         
@@ -587,9 +611,11 @@ class ScientificCalculator:
         if self.angle_mode.get() == 'deg':
             self.angle_mode.set('rad')
             self.angle_indicator.config(text='RAD')
+            self.evaluator.set_angle_mode('rad')
         else:
             self.angle_mode.set('deg')
             self.angle_indicator.config(text='DEG')
+            self.evaluator.set_angle_mode('deg')
     
     def append_to_input(self, text):
         """Añade texto al input"""
@@ -637,39 +663,7 @@ class ScientificCalculator:
         
         try:
             expression = self.current_input
-            eval_expr = expression.replace('^', '**')
-            
-            # Reemplazar funciones
-            eval_expr = eval_expr.replace('sqrt', 'math.sqrt')
-            eval_expr = eval_expr.replace('cbrt', 'lambda x: x**(1/3)')
-            eval_expr = eval_expr.replace('exp', 'math.exp')
-            
-            # Funciones trigonométricas
-            if self.angle_mode.get() == 'deg':
-                eval_expr = eval_expr.replace('sin(', 'math.sin(math.radians(')
-                eval_expr = eval_expr.replace('cos(', 'math.cos(math.radians(')
-                eval_expr = eval_expr.replace('tan(', 'math.tan(math.radians(')
-                eval_expr = eval_expr.replace('asin(', 'math.degrees(math.asin(')
-                eval_expr = eval_expr.replace('acos(', 'math.degrees(math.acos(')
-                eval_expr = eval_expr.replace('atan(', 'math.degrees(math.atan(')
-                # Añadir paréntesis de cierre extra
-                eval_expr = eval_expr.replace('radians(', 'radians(') + ')' * eval_expr.count('radians(')
-            else:
-                eval_expr = eval_expr.replace('sin', 'math.sin')
-                eval_expr = eval_expr.replace('cos', 'math.cos')
-                eval_expr = eval_expr.replace('tan', 'math.tan')
-                eval_expr = eval_expr.replace('asin', 'math.asin')
-                eval_expr = eval_expr.replace('acos', 'math.acos')
-                eval_expr = eval_expr.replace('atan', 'math.atan')
-            
-            eval_expr = eval_expr.replace('log', 'math.log10')
-            eval_expr = eval_expr.replace('ln', 'math.log')
-            
-            # Factorial
-            if '!' in eval_expr:
-                eval_expr = self.handle_factorial(eval_expr)
-            
-            result = eval(eval_expr)
+            result = self.evaluator.evaluate(expression)
             
             if isinstance(result, float):
                 if result.is_integer():
@@ -686,86 +680,11 @@ class ScientificCalculator:
             messagebox.showerror("Error", f"Expresión inválida:\n{str(e)}")
             self.clear()
     
-    def handle_factorial(self, expr):
-        """Maneja factoriales"""
-        import re
-        pattern = r'(\d+)!'
-        matches = re.findall(pattern, expr)
-        for match in matches:
-            factorial_val = math.factorial(int(match))
-            expr = expr.replace(f'{match}!', str(factorial_val))
-        return expr
-    
-    def parse_polynomial(self, poly_str):
-        """Parsea polinomio"""
-        try:
-            poly_str = poly_str.replace(' ', '').lower()
-            max_degree = 0
-            matches = re.findall(r'x\^(\d+)', poly_str)
-            if matches:
-                max_degree = max(int(m) for m in matches)
-            if 'x' in poly_str and max_degree == 0:
-                max_degree = 1
-            
-            coefficients = [0] * (max_degree + 1)
-            
-            if poly_str[0] not in ['+', '-']:
-                poly_str = '+' + poly_str
-            
-            terms = re.findall(r'[+-][^+-]+', poly_str)
-            
-            for term in terms:
-                term = term.strip()
-                
-                match = re.match(r'([+-]?\d*\.?\d*)x\^(\d+)', term)
-                if match:
-                    coef = match.group(1)
-                    if coef in ['', '+']:
-                        coef = 1
-                    elif coef == '-':
-                        coef = -1
-                    else:
-                        coef = float(coef)
-                    degree = int(match.group(2))
-                    coefficients[degree] = coef
-                    continue
-                
-                match = re.match(r'([+-]?\d*\.?\d*)x', term)
-                if match:
-                    coef = match.group(1)
-                    if coef in ['', '+']:
-                        coef = 1
-                    elif coef == '-':
-                        coef = -1
-                    else:
-                        coef = float(coef)
-                    coefficients[1] = coef
-                    continue
-                
-                match = re.match(r'([+-]?\d+\.?\d*)', term)
-                if match:
-                    coef = float(match.group(1))
-                    coefficients[0] = coef
-            
-            return coefficients
-            
-        except Exception as e:
-            raise ValueError(f"No se pudo parsear el polinomio: {str(e)}")
-    
-    def format_polynomial(self, coefficients):
-        """Formatea polinomio"""
-        if not coefficients or all(c == 0 for c in coefficients):
-            return "0"
-        
+    def format_polynomial(self, polynomial):
+        """Formatea polinomio (solo recorre los términos no nulos)"""
         terms = []
-        degree = len(coefficients) - 1
         
-        for i in range(degree, -1, -1):
-            coef = coefficients[i]
-            
-            if coef == 0:
-                continue
-            
+        for i, coef in reversed(polynomial.terms()):
             if terms:
                 sign = " + " if coef > 0 else " - "
                 coef = abs(coef)
@@ -804,16 +723,10 @@ class ScientificCalculator:
                 messagebox.showwarning("Advertencia", "Ingresa un polinomio primero")
                 return
             
-            coefficients = self.parse_polynomial(poly_str)
-            
-            if len(coefficients) <= 1:
-                derivative = [0]
-            else:
-                derivative = []
-                for i in range(1, len(coefficients)):
-                    derivative.append(coefficients[i] * i)
+            polynomial = self.parser.parse_polynomial(poly_str)
+            derivative = polynomial.derivative()
             
-            original = self.format_polynomial(coefficients)
+            original = self.format_polynomial(polynomial)
             derived = self.format_polynomial(derivative)
             
             self.history_display.config(text=f"f(x) = {original}")
@@ -826,6 +739,45 @@ class ScientificCalculator:
         except Exception as e:
             messagebox.showerror("Error", str(e))
     
+    def roots_polynomial(self):
+        """Calcula todas las raíces del polinomio (reales y complejas)"""
+        try:
+            poly_str = self.poly_input.get().strip()
+            if not poly_str:
+                messagebox.showwarning("Advertencia", "Ingresa un polinomio primero")
+                return
+            
+            polynomial = self.parser.parse_polynomial(poly_str)
+            if polynomial.degree < 1:
+                messagebox.showinfo("Raíces", "Un polinomio constante no tiene raíces aisladas")
+                return
+            
+            roots = polynomial.roots()
+            real = polynomial.real_roots()
+            complex_roots = roots[np.abs(roots.imag) > 1e-8 * (1 + np.abs(roots.real))]
+            # Un representante por par conjugado
+            complex_roots = complex_roots[complex_roots.imag > 0]
+            
+            lines = [f"x = {self.format_number(r)}" for r in real]
+            lines += [f"x = {self.format_number(r.real)} ± {self.format_number(r.imag)}i"
+                      for r in complex_roots]
+            
+            self.history_display.config(text=f"f(x) = {self.format_polynomial(polynomial)}")
+            self.main_display.config(text="; ".join(self.format_number(r) for r in real[:4])
+                                     or "sin raíces reales")
+            
+            messagebox.showinfo("Raíces", "\n".join(lines) or "Sin raíces")
+            
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+    
+    def format_number(self, value):
+        """Formatea un número real para mostrar raíces"""
+        value = float(value)
+        if abs(value) < 5e-13:
+            value = 0.0
+        return f"{value:.10g}"
+    
     def graph_polynomial(self):
         """Abre ventana de gráfica"""
         try:
@@ -834,20 +786,14 @@ class ScientificCalculator:
                 messagebox.showwarning("Advertencia", "Ingresa un polinomio primero")
                 return
             
-            coefficients = self.parse_polynomial(poly_str)
-            
-            if len(coefficients) <= 1:
-                derivative = [0]
-            else:
-                derivative = []
-                for i in range(1, len(coefficients)):
-                    derivative.append(coefficients[i] * i)
+            polynomial = self.parser.parse_polynomial(poly_str)
+            derivative = polynomial.derivative()
             
             # Crear o actualizar ventana de gráfica
             if self.graph_window is None or not self.graph_window.winfo_exists():
                 self.graph_window = GraphWindow(self.root, self.colors)
             
-            self.graph_window.plot_polynomial(coefficients, derivative)
+            self.graph_window.plot_polynomial(polynomial, derivative)
             self.graph_window.lift()
             self.graph_window.focus()
             